@@ -2,27 +2,17 @@ import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 
+from http_client import fetch, enable_cache
+from movie_parser import parse_movie_page_basic
+
 BASE_URL = "https://ww8.cuevana3.to"
 
 def extract_data(page_url):
-    response = requests.get(page_url)
-    response.raise_for_status()
-
-    soup = BeautifulSoup(response.text, 'html.parser')
-
-    img_tag = soup.find('img', class_='lazy')
-    img_url = urljoin(page_url, img_tag.get('data-src')) if img_tag else None
-
-    iframe_tag = soup.find('iframe', class_='no-you')
-    iframe_url = iframe_tag.get('data-src') if iframe_tag else None
-
-    title_from_url = page_url.strip('/').split('/')[-1].replace('-', ' ').title()
-
-    return img_url, iframe_url, title_from_url
+    response = fetch(page_url)
+    return parse_movie_page_basic(response.text, page_url)
 
 def extract_links_from_category(category_url):
-    response = requests.get(category_url.strip())
-    response.raise_for_status()
+    response = fetch(category_url.strip())
 
     soup = BeautifulSoup(response.text, 'html.parser')
     movie_links = []
@@ -57,6 +47,8 @@ def save_html_block(html_block, filename):
         file.write(html_block)
 
 def main():
+    enable_cache()
+
     while True:
         print("Seleccione una opción:")
         print("1. Ejecutar la herramienta con URLs de películas")
@@ -2,27 +2,18 @@ import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 
+from http_client import fetch, enable_cache
+from movie_parser import parse_movie_page_basic
+from pagination import discover_category_urls
+
 BASE_URL = "https://ww8.cuevana3.to"
 
 def extract_data(page_url):
-    response = requests.get(page_url)
-    response.raise_for_status()
-
-    soup = BeautifulSoup(response.text, 'html.parser')
-
-    img_tag = soup.find('img', class_='lazy')
-    img_url = urljoin(page_url, img_tag.get('data-src')) if img_tag else None
-
-    iframe_tag = soup.find('iframe', class_='no-you')
-    iframe_url = iframe_tag.get('data-src') if iframe_tag else None
-
-    title_from_url = page_url.strip('/').split('/')[-1].replace('-', ' ').title()
-
-    return img_url, iframe_url, title_from_url
+    response = fetch(page_url)
+    return parse_movie_page_basic(response.text, page_url)
 
 def extract_links_from_category(category_url):
-    response = requests.get(category_url.strip())
-    response.raise_for_status()
+    response = fetch(category_url.strip())
 
     soup = BeautifulSoup(response.text, 'html.parser')
     movie_links = []
@@ -65,6 +56,8 @@ def generate_category_urls(base_url, category_name, page_count):
     return urls
 
 def main():
+    enable_cache()
+
     while True:
         print("Seleccione una opción:")
         print("1. Ejecutar la herramienta con URLs de películas")
@@ -155,10 +148,13 @@ def main():
         elif choice == "3":
             base_url = input("Ingrese la URL base de la categoría (ejemplo: https://ww8.cuevana3.to/category): ").strip()
             category_name = input("Ingrese el nombre de la categoría (ejemplo: guerra): ").strip()
-            page_count = int(input("Ingrese el número de páginas a generar: ").strip())
+            page_count = input("Ingrese el número de páginas a generar (Enter = detectar automáticamente): ").strip()
 
             # Generar las URLs
-            generated_urls = generate_category_urls(base_url, category_name, page_count)
+            if page_count:
+                generated_urls = generate_category_urls(base_url, category_name, int(page_count))
+            else:
+                generated_urls = discover_category_urls(base_url, category_name)
             formatted_urls = ", ".join(generated_urls)
 
             # Guardar las URLs en un archivo
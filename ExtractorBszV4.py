@@ -1,67 +1,65 @@
 import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
-import time
+import asyncio
+import os
+
+from category_sweep import DEFAULT_CATEGORY_WORKERS, DEFAULT_ORDER, sweep_categories
+from crawl_journal import CrawlJournal, journal_path
+from frontier import Frontier
+from http_client import fetch, enable_cache, get_cache_stats, get_limiter_stats, get_stats, is_from_cache, get_record, save_record
+from movie_grid import MovieGridWriter
+from record_store import RecordStore
+from records import Movie
+from movie_parser import parse_movie_page
+from profiling import stage, timed, write_report
 
 BASE_URL = "https://ww9.cuevana3.to"
 
-def extract_data(page_url):
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    }
-    
+# Máximo de páginas de película descargándose a la vez en la opción 2
+MAX_IN_FLIGHT = 8
+
+@timed('extract_data')
+def extract_data(page_url, raise_errors=False):
+    """``(img_url, iframe_url, title)``; si la descarga falla, ``(None, None, None)``
+    (o la excepción, con ``raise_errors``)"""
     try:
-        response = requests.get(page_url, headers=headers, timeout=10)
-        response.raise_for_status()
+        response = fetch(page_url)
     except requests.exceptions.RequestException as e:
+        if raise_errors:
+            raise
         print(f"Error al acceder a {page_url}: {e}")
         return None, None, None
 
-    soup = BeautifulSoup(response.text, 'html.parser')
+    # Página sin cambios desde la última corrida: reutilizar lo ya extraído
+    if is_from_cache(response):
+        record = get_record(page_url, 'movie')
+        if record:
+            return tuple(record)
 
-    # Buscar imagen
-    img_tag = soup.find('img', class_='lazy')
-    if not img_tag:
-        img_tag = soup.find('img', {'loading': 'lazy'})
-    if not img_tag:
-        img_tag = soup.find('img', {'data-src': True})
-    
-    img_url = urljoin(page_url, img_tag.get('data-src')) if img_tag and img_tag.get('data-src') else None
-    if not img_url and img_tag:
-        img_url = urljoin(page_url, img_tag.get('src')) if img_tag.get('src') else None
-
-    # Buscar iframe
-    iframe_tag = soup.find('iframe', class_='no-you')
-    if not iframe_tag:
-        iframe_tag = soup.find('iframe', {'data-src': True})
-    
-    iframe_url = iframe_tag.get('data-src') if iframe_tag and iframe_tag.get('data-src') else None
-    if not iframe_url and iframe_tag:
-        iframe_url = iframe_tag.get('src') if iframe_tag.get('src') else None
-
-    # Extraer título
-    title = None
-    title_tag = soup.find('h1')
-    if title_tag:
-        title = title_tag.get_text(strip=True)
-    
-    if not title:
-        title = page_url.strip('/').split('/')[-1].replace('-', ' ').title()
-    
+    with stage('parse.movie'):
+        img_url, iframe_url, title = parse_movie_page(response.text, page_url)
+
+    save_record(page_url, 'movie', [img_url, iframe_url, title])
     return img_url, iframe_url, title
 
-def extract_links_from_category(category_url):
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    }
-    
+@timed('extract_links_from_category')
+def extract_links_from_category(category_url, raise_errors=False):
+    """URLs de las películas de la página; si la descarga falla, ``[]``
+    (o la excepción, con ``raise_errors``)"""
     try:
-        response = requests.get(category_url.strip(), headers=headers, timeout=10)
-        response.raise_for_status()
+        response = fetch(category_url.strip())
     except requests.exceptions.RequestException as e:
+        if raise_errors:
+            raise
         print(f"Error al acceder a la URL: {category_url}. {e}")
         return []
 
+    if is_from_cache(response):
+        record = get_record(category_url, 'category')
+        if record:
+            return record
+
     soup = BeautifulSoup(response.text, 'html.parser')
     movie_links = []
 
@@ -85,12 +83,14 @@ def extract_links_from_category(category_url):
     
     if not movie_tags:
         # Buscar todos los enlaces dentro del contenedor
-        all_links = movie_list_container.find_all('a', href=True)
-        for link in all_links:
-            href = link.get('href')
-            if href and ('/pelicula/' in href or '/serie/' in href):
-                full_link = urljoin(BASE_URL, href)
-                movie_links.append(full_link)
+        with stage('parse.category_fallback'):
+            all_links = movie_list_container.find_all('a', href=True)
+            for link in all_links:
+                href = link.get('href')
+                if href and ('/pelicula/' in href or '/serie/' in href):
+                    full_link = urljoin(BASE_URL, href)
+                    movie_links.append(full_link)
+        save_record(category_url, 'category', movie_links)
         return movie_links
     
     for tag in movie_tags:
@@ -101,8 +101,10 @@ def extract_links_from_category(category_url):
                 full_link = urljoin(BASE_URL, href)
                 movie_links.append(full_link)
 
+    save_record(category_url, 'category', movie_links)
     return movie_links
 
+@timed('html.movie_block')
 def create_movie_block(data):
     if not data['iframe_url'] or not data['image_url']:
         return ""
@@ -137,7 +139,162 @@ def parse_urls_input(urls_input):
     
     return urls
 
+def process_movie_result(writer, index, total, result, movie_url=None, store=None, ndjson=None):
+    """Agrega al writer el resultado de extract_data de una película de categoría
+
+    Con ``store`` la película también se guarda en el almacén, en la lista
+    del archivo del writer (así ``render_movie_grid`` lo puede regenerar).
+    Con ``ndjson`` se escribe además como una línea JSON en el momento.
+    """
+    img_url, iframe_url, title = result
+    show = index % 10 == 0 or index == 1 or index == total
+
+    if not (img_url and iframe_url and title):
+        if show:
+            print(f"    ✗ Datos incompletos, se omite")
+        return
+
+    data = Movie(img_url, iframe_url, title)
+
+    movie_block = create_movie_block(data)
+    if movie_block:
+        movie_count = writer.add(movie_block)
+        if store is not None:
+            store.put_movie(movie_url, data)
+            store.add_to_listing(writer.filename, 0, 'movie', movie_url)
+        if ndjson is not None:
+            ndjson.write({'url': movie_url, **data})
+        if show:
+            print(f"    ✓ Película {movie_count} agregada: {title[:40]}...")
+    elif show:
+        print(f"    ✗ No se pudo crear bloque para: {title[:40]}...")
+
+def render_movie_grid(store, listing, filename, incremental=True, images=None):
+    """Vuelve a generar ``filename`` con las películas de la lista ``listing`` del almacén
+
+    En modo incremental solo se escriben los bloques que cambiaron desde la
+    última vez (``writer.output.stats``). ``images`` reemplaza URLs de pósters
+    por sus copias locales (``ImageMirror.links``).
+    """
+    images = images or {}
+    if not incremental:
+        open(filename, 'w', encoding='utf-8').close()
+    writer = MovieGridWriter(filename, incremental=incremental)
+    for movie in store.listed_movies(listing):
+        movie['image_url'] = images.get(movie['image_url'], movie['image_url'])
+        movie_block = create_movie_block(movie)
+        if movie_block:
+            writer.add(movie_block)
+    writer.close()
+    return writer
+
+def open_grid_journal(urls_list, filename='code.txt', order=DEFAULT_ORDER):
+    """Journal de la opción 2 y writer listo para seguir agregando a ``filename``"""
+    # El orden forma parte de la corrida: las películas ya guardadas dependen de él
+    journal = CrawlJournal(journal_path(filename), {'categories': urls_list, 'order': order})
+
+    def on_flush(writer):
+        journal.put('grid', filename, {'movies': writer.movie_count, 'size': writer.size})
+
+    flushed = journal.get('grid', filename)
+    if flushed and os.path.exists(filename) and os.path.getsize(filename) >= flushed['size']:
+        # Descartar lo escrito después del último bloque registrado
+        os.truncate(filename, flushed['size'])
+        written = flushed['movies']
+    else:
+        # Sin vaciar el archivo: solo se reescriben los bloques que cambiaron
+        written = 0
+
+    return journal, MovieGridWriter(filename, written=written, on_flush=on_flush, incremental=True)
+
+async def process_categories(urls_list, writer, max_in_flight=MAX_IN_FLIGHT, journal=None, frontier=None, store=None,
+                             order=DEFAULT_ORDER, category_workers=DEFAULT_CATEGORY_WORKERS):
+    """Recorre las categorías en paralelo y descarga sus películas, entregándolas en un solo orden
+
+    Las páginas de categoría y las películas de varias categorías se descargan a
+    la vez; el writer las recibe en el orden ``order`` (ver ``category_sweep``)
+    y numera los bloques ``linea-N`` de forma global. Con ``frontier`` cada
+    categoría y cada película se procesa una sola vez en toda la corrida,
+    aunque aparezca en varias categorías o espejos del sitio.
+    """
+    categories = urls_list
+    if frontier is not None:
+        categories = [url for url in urls_list if frontier.add(url)]
+        if len(categories) < len(urls_list):
+            print(f"  {len(urls_list) - len(categories)} categorías repetidas, se omiten")
+
+    total_movies_found = 0
+    sizes = {}
+    done = {}
+
+    def links_or_resume(category_url):
+        movie_links = journal.get('category', category_url) if journal else None
+        if movie_links is None:
+            movie_links = extract_links_from_category(category_url)
+            if journal:
+                journal.put('category', category_url, movie_links)
+        return movie_links
+
+    def extract_or_resume(movie_url):
+        record = journal.get('movie', movie_url) if journal else None
+        return tuple(record) if record is not None else extract_data(movie_url)
+
+    def on_category(index, category_url, movie_links):
+        nonlocal total_movies_found
+        print(f"\n{'='*60}")
+        print(f"[CATEGORÍA {index + 1}/{len(categories)}]")
+        print(f"URL: {category_url}")
+        print('='*60)
+        print(f"\nPelículas encontradas en esta categoría: {len(movie_links)}")
+
+        if frontier is not None:
+            new_links = list(frontier.filter(movie_links))
+            if len(new_links) < len(movie_links):
+                print(f"  {len(movie_links) - len(new_links)} ya vistas en esta corrida, se omiten")
+            movie_links = new_links
+        total_movies_found += len(movie_links)
+        sizes[index] = len(movie_links)
+        done[index] = 0
+
+        if not movie_links:
+            print("  No se encontraron películas, se salta esta categoría")
+        return movie_links
+
+    print(f"\nDescargando {min(category_workers, len(categories))} categorías y {max_in_flight} películas "
+          f"en paralelo (orden: {order})...")
+
+    async for index, movie_url, result in sweep_categories(categories, links_or_resume, extract_or_resume, order,
+                                                           category_workers, max_in_flight, on_category):
+        done[index] += 1
+        i, total = done[index], sizes[index]
+        if journal and not journal.done('movie', movie_url):
+            journal.put('movie', movie_url, list(result))
+        if i % 10 == 0 or i == 1 or i == total:
+            print(f"  [{i}/{total}] Procesando película de la categoría {index + 1}...")
+        process_movie_result(writer, i, total, result, movie_url, store)
+
+        if i == total:
+            print(f"\nCategoría {index + 1} completada: {total} películas procesadas")
+
+    return total_movies_found
+
+def print_cache_summary():
+    stats = get_cache_stats()
+    if stats:
+        print(f"Caché: {stats['hits']} aciertos, {stats['evictions']} desalojos")
+        print(f"Páginas revalidadas (304): {stats['revalidated']} | descargadas de nuevo: {stats['misses']}")
+
+    limiter = get_limiter_stats()
+    print(f"Espera del limitador: {limiter['wait_seconds']:.1f}s | respuestas 429/503: {limiter['throttled']}")
+    write_report(http=get_stats(), cache=stats, rate_limit=limiter)
+
+def print_output_summary(writer):
+    stats = writer.output.stats
+    print(f"Bloques de code.txt sin cambios: {stats['unchanged']} | reescritos: {stats['written']}")
+
 def main():
+    enable_cache()
+
     print("=" * 60)
     print("EXTRACTOR DE PELÍCULAS CUEVANA")
     print("=" * 60)
@@ -176,12 +333,10 @@ def main():
                 print("No se encontraron URLs válidas.")
                 continue
             
-            # Limpiar archivo de salida
-            open('code.txt', 'w', encoding='utf-8').close()
-            
-            movie_count = 0
-            block_number = 1
-            html_block = f'<div id="linea-{block_number}" class="movies-grid">\n'
+            # Solo se reescriben los bloques de code.txt que cambiaron
+            writer = MovieGridWriter('code.txt', incremental=True)
+            store = RecordStore()
+            store.clear_listing('code.txt')
             
             print(f"\nProcesando {len(urls_list)} URLs...")
             
@@ -195,39 +350,29 @@ def main():
                 print(f"  Título: {title[:50]}{'...' if len(title) > 50 else ''}")
 
                 if img_url and iframe_url and title:
-                    movie_count += 1
-                    data = {
-                        'image_url': img_url,
-                        'iframe_url': iframe_url,
-                        'title': title
-                    }
+                    data = Movie(img_url, iframe_url, title)
 
                     movie_block = create_movie_block(data)
                     if movie_block:
-                        html_block += movie_block
-
-                        if movie_count % 15 == 0:
-                            html_block += '\n</div>\n'
-                            save_html_block(html_block, 'code.txt')
-                            block_number += 1
-                            html_block = f'<div id="linea-{block_number}" class="movies-grid">\n'
-                        
+                        movie_count = writer.add(movie_block)
+                        store.put_movie(page_url, data)
+                        store.add_to_listing('code.txt', 0, 'movie', page_url)
                         print(f"  ✓ Película {movie_count} agregada")
                     else:
                         print(f"  ✗ No se pudo crear bloque")
                 else:
                     print(f"  ✗ Datos incompletos, se omite")
-                
-                time.sleep(0.5)
 
-            if movie_count > 0 and movie_count % 15 != 0:
-                html_block += '\n</div>\n'
-                save_html_block(html_block, 'code.txt')
+            writer.close()
+            store.close()
+            movie_count = writer.movie_count
 
             print(f"\n{'='*40}")
             print(f"PROCESO COMPLETADO")
             print(f"Películas procesadas exitosamente: {movie_count}/{len(urls_list)}")
-            print("Datos guardados en 'code.txt'")
+            print_output_summary(writer)
+            print_cache_summary()
+            print(f"Datos guardados en 'code.txt' y en '{store.path}'")
 
         elif choice == "2":
             print("\n" + "=" * 40)
@@ -267,84 +412,42 @@ def main():
                 print("No se encontraron URLs válidas.")
                 continue
             
-            # Limpiar archivo de salida
-            open('code.txt', 'w', encoding='utf-8').close()
-            
-            movie_count = 0
-            block_number = 1
-            total_movies_found = 0
-            html_block = f'<div id="linea-{block_number}" class="movies-grid">\n'
-            
+            # Reanudar una corrida interrumpida con las mismas categorías o empezar de cero
+            journal, writer = open_grid_journal(urls_list)
+            if journal.resumed:
+                print(f"\nReanudando corrida anterior: {journal.count('category')} categorías y "
+                      f"{journal.count('movie')} películas ya procesadas, {writer.written} ya guardadas")
+
             print(f"\nProcesando {len(urls_list)} categorías...")
-            
-            for cat_index, category_url in enumerate(urls_list, 1):
-                print(f"\n{'='*60}")
-                print(f"[CATEGORÍA {cat_index}/{len(urls_list)}]")
-                print(f"URL: {category_url}")
-                print('='*60)
-
-                movie_links = extract_links_from_category(category_url)
-                print(f"\nPelículas encontradas en esta categoría: {len(movie_links)}")
-                total_movies_found += len(movie_links)
-                
-                if not movie_links:
-                    print("  No se encontraron películas, se salta esta categoría")
-                    continue
-                
-                print(f"\nProcesando {len(movie_links)} películas de esta categoría...")
-                
-                for i, movie_url in enumerate(movie_links, 1):
-                    if i % 10 == 0 or i == 1 or i == len(movie_links):
-                        print(f"  [{i}/{len(movie_links)}] Procesando película...")
-                    
-                    img_url, iframe_url, title = extract_data(movie_url)
-
-                    if img_url and iframe_url and title:
-                        movie_count += 1
-                        data = {
-                            'image_url': img_url,
-                            'iframe_url': iframe_url,
-                            'title': title
-                        }
-
-                        movie_block = create_movie_block(data)
-                        if movie_block:
-                            html_block += movie_block
-
-                            if movie_count % 15 == 0:
-                                html_block += '\n</div>\n'
-                                save_html_block(html_block, 'code.txt')
-                                block_number += 1
-                                html_block = f'<div id="linea-{block_number}" class="movies-grid">\n'
-                            
-                            if i % 10 == 0 or i == 1 or i == len(movie_links):
-                                print(f"    ✓ Película {movie_count} agregada: {title[:40]}...")
-                        else:
-                            if i % 10 == 0 or i == 1 or i == len(movie_links):
-                                print(f"    ✗ No se pudo crear bloque para: {title[:40]}...")
-                    else:
-                        if i % 10 == 0 or i == 1 or i == len(movie_links):
-                            print(f"    ✗ Datos incompletos, se omite")
-                    
-                    time.sleep(0.3)
-                
-                print(f"\nCategoría {cat_index} completada: {len(movie_links)} películas procesadas")
-                time.sleep(1)
 
-            if movie_count > 0 and movie_count % 15 != 0:
-                html_block += '\n</div>\n'
-                save_html_block(html_block, 'code.txt')
+            # La corrida (o su reanudación) vuelve a recorrer todas las películas: la lista empieza vacía
+            store = RecordStore()
+            store.clear_listing('code.txt')
+
+            frontier = Frontier()
+            total_movies_found = asyncio.run(process_categories(
+                urls_list, writer, journal=journal, frontier=frontier, store=store
+            ))
+            writer.close()
+            store.close()
+            journal.finish()
+
+            movie_count = writer.movie_count
+            block_number = writer.block_number
 
             print(f"\n{'='*60}")
             print(f"RESUMEN FINAL")
             print('='*60)
             print(f"Categorías procesadas: {len(urls_list)}")
             print(f"Enlaces de películas encontrados: {total_movies_found}")
+            print(f"Descargas ahorradas por deduplicación: {frontier.saved}")
             print(f"Películas procesadas exitosamente: {movie_count}")
             print(f"Películas no procesadas: {total_movies_found - movie_count}")
             print(f"Bloques creados: {block_number}")
+            print_output_summary(writer)
+            print_cache_summary()
             print("="*60)
-            print("Datos guardados en 'code.txt'")
+            print(f"Datos guardados en 'code.txt' y en '{store.path}'")
 
         elif choice == "3":
             print("\n" + "=" * 40)
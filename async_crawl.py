@@ -0,0 +1,65 @@
+"""Motor asyncio para descargar muchas páginas a la vez sin perder el orden.
+
+Las funciones de extracción siguen siendo síncronas (usan la sesión de
+``http_client``); el motor las ejecuta en hilos con un máximo de peticiones en
+vuelo y entrega los resultados en el mismo orden en que se descubrieron.
+"""
+import asyncio
+from collections import deque
+
+DEFAULT_MAX_IN_FLIGHT = 8
+# Tareas creadas por adelantado por cada petición en vuelo, para que una página
+# lenta al frente de la cola no deje a los demás hilos sin trabajo
+WINDOW_FACTOR = 4
+
+_END = object()
+
+
+async def _run_bounded(semaphore, func, item):
+    async with semaphore:
+        return await asyncio.to_thread(func, item)
+
+
+async def _iterate(items):
+    if hasattr(items, '__aiter__'):
+        async for item in items:
+            yield item
+    elif isinstance(items, (list, tuple)):
+        for item in items:
+            yield item
+    else:
+        # Un iterable cualquiera puede bloquear (stdin, un archivo, un generador que los
+        # lee): cada elemento se pide en un hilo para no frenar el event loop
+        iterator = iter(items)
+        while True:
+            item = await asyncio.to_thread(next, iterator, _END)
+            if item is _END:
+                return
+            yield item
+
+
+async def map_in_order(func, items, max_in_flight=DEFAULT_MAX_IN_FLIGHT):
+    """Ejecuta ``func(item)`` de forma concurrente y produce ``(item, resultado)`` en orden
+
+    ``items`` puede ser cualquier iterable (por ejemplo un archivo de URLs o
+    stdin, que se leen en un hilo) o un iterable asíncrono (por ejemplo otro
+    ``map_in_order``): se consume de a poco y nunca hay más de
+    ``max_in_flight * WINDOW_FACTOR`` tareas creadas a la vez.
+    """
+    semaphore = asyncio.Semaphore(max_in_flight)
+    window = max_in_flight * WINDOW_FACTOR
+    pending = deque()
+
+    try:
+        async for item in _iterate(items):
+            pending.append((item, asyncio.ensure_future(_run_bounded(semaphore, func, item))))
+            if len(pending) >= window:
+                item, task = pending.popleft()
+                yield item, await task
+
+        while pending:
+            item, task = pending.popleft()
+            yield item, await task
+    finally:
+        for _, task in pending:
+            task.cancel()
@@ -0,0 +1,71 @@
+"""Benchmark: handshakes por crawl con requests.get suelto vs. la sesión compartida.
+
+Uso:
+    python benchmarks/bench_connections.py --pages 300 --latency 0.002
+"""
+import argparse
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import http_client
+from local_server import LocalServer
+
+MOVIE_PAGE = """<!DOCTYPE html>
+<html><body>
+<h1>Pelicula {n}</h1>
+<img class="lazy" data-src="/poster/{n}.jpg">
+<iframe class="no-you" data-src="https://player.example/{n}"></iframe>
+</body></html>
+"""
+
+
+def movie_page(path):
+    number = path.strip('/').split('/')[-1]
+    return MOVIE_PAGE.format(n=number).encode('utf-8')
+
+
+def run(label, get, server, urls):
+    server.reset_counters()
+    start = time.perf_counter()
+    for url in urls:
+        get(url)
+    elapsed = time.perf_counter() - start
+
+    print(f"{label:<22} peticiones: {server.requests:>5}  conexiones (handshakes): {server.connections:>5}  "
+          f"tiempo: {elapsed:.2f}s  ({len(urls) / elapsed:.0f} pág/s)")
+    return server.connections
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=300, help='páginas a descargar por corrida')
+    parser.add_argument('--latency', type=float, default=0.0, help='latencia artificial del servidor en segundos')
+    parser.add_argument('--rate', type=float, help='peticiones/s por host del limitador (por defecto sin límite)')
+    args = parser.parse_args()
+
+    # Sin --rate se miden las conexiones y no el limitador por host
+    limit = args.rate or 1e6
+    http_client.configure_rate_limit(rate=limit, burst=max(1, int(limit)), max_rate=limit)
+
+    with LocalServer(movie_page, latency=args.latency) as server:
+        urls = [f"{server.url}/pelicula/{n}" for n in range(args.pages)]
+
+        def bare_get(url):
+            response = requests.get(url, headers=http_client.DEFAULT_HEADERS, timeout=http_client.DEFAULT_TIMEOUT)
+            response.raise_for_status()
+
+        before = run('requests.get (antes)', bare_get, server, urls)
+        http_client.close()
+        after = run('http_client (después)', http_client.fetch, server, urls)
+        http_client.close()
+
+    print(f"\nHandshakes ahorrados: {before - after} de {before}")
+
+
+if __name__ == '__main__':
+    main()
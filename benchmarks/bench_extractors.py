@@ -0,0 +1,247 @@
+"""Benchmark de las funciones de extracción de todas las versiones contra el sitio de fixtures.
+
+Para cada función mide:
+
+- pág/s: llamadas reales contra ``fixture_site`` (con la latencia indicada).
+- ms de parseo por página: la misma función con las descargas respondidas
+  desde memoria, es decir, solo el trabajo de parseo/extracción.
+- pico de RSS: cada función corre en un proceso propio recién creado.
+
+Los resultados se guardan en benchmarks/results/<fecha>-<commit>.json para
+comparar entre commits con ``--compare``.
+
+Uso:
+    python benchmarks/bench_extractors.py --pages 60 --latency 0.01
+    python benchmarks/bench_extractors.py --only V4 --compare benchmarks/results/anterior.json
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+sys.path.insert(0, ROOT_DIR)
+
+from fixture_site import FixtureSite, load_corpus, pick
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# nombre -> (módulo, función, tipo de página)
+TARGETS = {
+    'ExtractorBsz.extract_data': ('ExtractorBsz', 'extract_data', 'pelicula'),
+    'ExtractorBszV2.extract_data': ('ExtractorBszV2', 'extract_data', 'pelicula'),
+    'ExtractorBszV3.extract_data': ('ExtractorBszV3', 'extract_data', 'pelicula'),
+    'ExtractorBszV4.extract_data': ('ExtractorBszV4', 'extract_data', 'pelicula'),
+    'ExtractorBszV2.extract_links_from_category': ('ExtractorBszV2', 'extract_links_from_category', 'category'),
+    'ExtractorBszV3.extract_links_from_category': ('ExtractorBszV3', 'extract_links_from_category', 'category'),
+    'ExtractorBszV4.extract_links_from_category': ('ExtractorBszV4', 'extract_links_from_category', 'category'),
+    'BszPelisPlusV1.extract_series_data': ('series.BszPelisPlusV1', 'extract_series_data', 'serie'),
+    'BszPelisPlusV2.extract_series_data': ('series.BszPelisPlusV2', 'extract_series_data', 'serie'),
+    'BszPelisPlusV1.extract_episodes_from_ul': ('series.BszPelisPlusV1', 'extract_episodes_from_ul', 'serie'),
+    'series_parsing.extract_episodes_from_ul': ('series_parsing', 'extract_episodes_from_ul', 'serie'),
+    'BszPelisPlusV2.extract_video_sources': ('series.BszPelisPlusV2', 'extract_video_sources', 'episodio'),
+}
+
+# Nombres de página que recorre cada tipo; se repiten hasta llegar a --pages
+PAGE_NAMES = {
+    'pelicula': 'movies',
+    'category': 'categories',
+    'serie': 'series',
+    'episodio': 'episodes',
+}
+
+
+def import_target(module_name):
+    if module_name.startswith('series.'):
+        sys.path.insert(0, os.path.join(ROOT_DIR, 'series'))
+        module_name = module_name.split('.', 1)[1]
+    return importlib.import_module(module_name)
+
+
+def page_urls(base_url, kind, pages):
+    names = sorted(load_corpus()[PAGE_NAMES[kind]])
+    return [f"{base_url}/{kind}/{names[n % len(names)]}-{n}" for n in range(pages)]
+
+
+def episode_lists(func):
+    """Adapta extract_episodes_from_ul (recibe una <ul>) a una función que recibe la URL de la serie"""
+    from series_parsing import make_soup
+    import http_client
+
+    def run(series_url):
+        response = http_client.fetch(series_url)
+        soup = make_soup(response.content, response.encoding)
+        return [func(ul, series_url) for ul in soup.find_all('ul', class_='all-episodes')]
+
+    return run
+
+
+@contextlib.contextmanager
+def replayed_fetch(module, corpus):
+    """Reemplaza la descarga por respuestas en memoria para medir solo el parseo"""
+    import requests
+    import http_client
+    import parse_pool
+
+    def fetch(url, *args, **kwargs):
+        path = url.split('://', 1)[1].split('/', 1)[1]
+        kind, _, name = path.partition('/')
+        body = pick(corpus[PAGE_NAMES[kind]], name)
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = body
+        response.encoding = 'utf-8'
+        return response
+
+    patched = [(m, 'fetch') for m in (module, http_client, parse_pool) if hasattr(m, 'fetch')]
+    originals = [(m, name, getattr(m, name)) for m, name in patched]
+    for m, name in patched:
+        setattr(m, name, fetch)
+    try:
+        yield
+    finally:
+        for m, name, original in originals:
+            setattr(m, name, original)
+
+
+def run_target(name, base_url, pages, parse_repeat, rate=None):
+    """Corre en un proceso propio: devuelve pág/s, ms de parseo por página y pico de RSS"""
+    module_name, func_name, kind = TARGETS[name]
+    module = import_target(module_name)
+
+    import http_client
+    import parse_pool
+
+    # Parseo en el mismo proceso: el RSS medido es el de la función
+    parse_pool.configure_parse_pool(0)
+
+    # Sin --rate se mide la función y no el limitador por host
+    limit = rate or 1e6
+    http_client.configure_rate_limit(rate=limit, burst=max(1, int(limit)), max_rate=limit)
+
+    func = getattr(module, func_name)
+    if func_name == 'extract_episodes_from_ul':
+        func = episode_lists(func)
+
+    urls = page_urls(base_url, kind, pages)
+    corpus = load_corpus()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for url in urls:
+            func(url)
+        fetch_elapsed = time.perf_counter() - start
+
+        with replayed_fetch(module, corpus):
+            start = time.perf_counter()
+            for _ in range(parse_repeat):
+                for url in urls:
+                    func(url)
+            parse_elapsed = time.perf_counter() - start
+
+    http_client.close()
+
+    peak_rss_mb = None
+    if resource is not None:
+        # ru_maxrss está en KB en Linux y en bytes en macOS
+        divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+        peak_rss_mb = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / divisor, 1)
+
+    return {
+        'pages': len(urls),
+        'pages_per_sec': round(len(urls) / fetch_elapsed, 1),
+        'parse_ms_per_page': round(parse_elapsed / (parse_repeat * len(urls)) * 1000, 3),
+        'peak_rss_mb': peak_rss_mb,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'sin-git'
+
+
+def print_results(results, previous=None):
+    print(f"\n{'función':<44} {'pág/s':>8} {'ms parseo':>10} {'RSS MB':>8}")
+    for name, result in results.items():
+        line = (f"{name:<44} {result['pages_per_sec']:>8} {result['parse_ms_per_page']:>10} "
+                f"{result['peak_rss_mb'] if result['peak_rss_mb'] is not None else '-':>8}")
+        before = (previous or {}).get(name)
+        if before:
+            change = (result['parse_ms_per_page'] - before['parse_ms_per_page']) / before['parse_ms_per_page'] * 100
+            line += f"   parseo {change:+.1f}% vs. {previous['__commit__']}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=60, help='páginas por función')
+    parser.add_argument('--latency', type=float, default=0.0, help='latencia artificial del sitio en segundos')
+    parser.add_argument('--parse-repeat', type=int, default=3, help='repeticiones de la medición de parseo')
+    parser.add_argument('--rate', type=float, help='peticiones/s por host del limitador (por defecto sin límite)')
+    parser.add_argument('--only', default='', help='solo las funciones cuyo nombre contenga este texto')
+    parser.add_argument('--output', help='archivo JSON de resultados (por defecto benchmarks/results/<fecha>-<commit>.json)')
+    parser.add_argument('--compare', help='JSON de una corrida anterior para mostrar la diferencia')
+    args = parser.parse_args()
+
+    names = [name for name in TARGETS if args.only in name]
+    commit = git_commit()
+    results = {}
+
+    # spawn: cada función arranca en un proceso limpio y su pico de RSS es solo suyo
+    context = multiprocessing.get_context('spawn')
+    with FixtureSite(latency=args.latency) as site:
+        for name in names:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                results[name] = executor.submit(run_target, name, site.url, args.pages, args.parse_repeat, args.rate).result()
+            print(f"✓ {name}")
+
+    report = {
+        'commit': commit,
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'pages': args.pages,
+        'latency': args.latency,
+        'rate': args.rate,
+        'results': results,
+    }
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{commit}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=4)
+
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            data = json.load(file)
+        previous = {**data['results'], '__commit__': data.get('commit', '?')}
+
+    print_results(results, previous)
+    print(f"\nResultados guardados en {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark: throughput del parseo de series en el mismo proceso vs. el pool de procesos.
+
+Sirve las páginas de benchmarks/fixtures/series y fixtures/episodes desde el
+servidor local y las descarga con ``parse_pool.fetch_and_parse_many``,
+variando la cantidad de procesos de parseo.
+
+Uso:
+    python benchmarks/bench_parse_pool.py --pages 400 --workers 0 2 4
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import http_client
+import parse_pool
+from local_server import LocalServer
+from series_parsing import parse_series_page, parse_video_page
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_pages(kind):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, kind, '*.html'))):
+        with open(path, 'rb') as file:
+            pages.append(file.read())
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=400, help='páginas de cada tipo por corrida')
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 2, os.cpu_count() or 1],
+                        help='cantidades de procesos a comparar (0 = sin pool)')
+    parser.add_argument('--queue-depth', type=int, default=None, help='páginas máximas esperando parseo')
+    parser.add_argument('--fetch-workers', type=int, default=parse_pool.DEFAULT_FETCH_WORKERS)
+    parser.add_argument('--rate', type=float, help='peticiones/s por host del limitador (por defecto sin límite)')
+    args = parser.parse_args()
+
+    # Sin --rate se mide el parseo y no el limitador por host
+    limit = args.rate or 1e6
+
+    series_pages = load_pages('series')
+    episode_pages = load_pages('episodes')
+
+    def page(path):
+        kind, _, number = path.strip('/').partition('/')
+        pages = series_pages if kind == 'serie' else episode_pages
+        return pages[int(number) % len(pages)]
+
+    with LocalServer(page) as server:
+        series_urls = [f"{server.url}/serie/{n}" for n in range(args.pages)]
+        episode_urls = [f"{server.url}/episodio/{n}" for n in range(args.pages)]
+
+        for workers in args.workers:
+            parse_pool.configure_parse_pool(workers, args.queue_depth)
+            parse_pool.get_parse_pool()
+            http_client.configure_rate_limit(rate=limit, burst=max(1, int(limit)), max_rate=limit)
+
+            start = time.perf_counter()
+            for _ in parse_pool.fetch_and_parse_many(series_urls, parse_series_page, True,
+                                                     fetch_workers=args.fetch_workers):
+                pass
+            for _ in parse_pool.fetch_and_parse_many(episode_urls, parse_video_page,
+                                                     fetch_workers=args.fetch_workers):
+                pass
+            elapsed = time.perf_counter() - start
+
+            total = len(series_urls) + len(episode_urls)
+            label = 'sin pool' if workers == 0 else f"{workers} procesos"
+            print(f"{label:<12} {total} páginas en {elapsed:.2f}s  ->  {total / elapsed:.0f} pág/s")
+
+        parse_pool.shutdown_parse_pool()
+
+
+if __name__ == '__main__':
+    main()
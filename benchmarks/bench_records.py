@@ -0,0 +1,143 @@
+"""Benchmark: memoria de series con episodios y fuentes de video como dicts vs. ``records``.
+
+Arma el mismo catálogo sintético tres veces (textos nuevos por registro, como
+salen del parser) y mide con ``tracemalloc`` cuánta memoria queda ocupada:
+como dicts, como registros armados en el proceso y como registros armados en
+los procesos de ``parse_pool`` y recibidos por pickle, que es el camino de V2.
+También verifica que las tres versiones serialicen al mismo JSON.
+
+Uso:
+    python benchmarks/bench_records.py --series 2000 --seasons 3 --episodes 10 --sources 4
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parse_pool import ParsePool
+from records import Episode, Series, VideoSource, to_json
+
+SERVICES = ['streamtape', 'doodstream', 'filemoon', 'voe']
+GENRES = ['Drama', 'Acción', 'Comedia', 'Crimen', 'Misterio']
+
+
+def fresh(text):
+    """Copia nueva del texto, como la que devuelve BeautifulSoup en cada página"""
+    return ''.join(list(text))
+
+
+def series_fields(n):
+    return (fresh(f"Serie {n}"), fresh(str(1990 + n % 35)), fresh(f"{5 + n % 5}.{n % 10}"),
+            fresh(f"Descripción de la serie {n}"), [fresh(GENRES[(n + k) % len(GENRES)]) for k in range(3)],
+            fresh(f"https://img.example/serie/{n}.jpg"), fresh(f"https://ww9.cuevana3.to/serie/s{n}"))
+
+
+def episode_fields(n, season, number):
+    return (fresh(f"Episodio {season}x{number}"), fresh(f"{season}x{number}"),
+            fresh(f"https://ww9.cuevana3.to/episodio/s{n}-{season}x{number}"),
+            fresh(f"https://img.example/ep/{n}-{season}x{number}.jpg"))
+
+
+def source_fields(n, season, number, k):
+    service = SERVICES[k % len(SERVICES)]
+    return (fresh(service), fresh(f"https://{service}.com/e/{n}{season}{number}{k}"), fresh(f"{service}.com"))
+
+
+def build_dicts(args):
+    catalog = []
+    for n in range(args.series):
+        title, year, rating, description, genre, image_url, url = series_fields(n)
+        series = {'title': title, 'year': year, 'rating': rating, 'description': description,
+                  'genre': genre, 'image_url': image_url, 'url': url}
+        series['episodes'] = {}
+        for season in range(1, args.seasons + 1):
+            episodes = []
+            for number in range(1, args.episodes + 1):
+                title, episode_number, url, image_url = episode_fields(n, season, number)
+                episode = {'title': title, 'episode_number': episode_number, 'url': url, 'image_url': image_url}
+                episode['video_sources'] = [
+                    dict(zip(('service', 'url', 'domain'), source_fields(n, season, number, k)))
+                    for k in range(args.sources)
+                ]
+                episodes.append(episode)
+            series['episodes'][f"season-{season}"] = episodes
+        catalog.append(series)
+    return catalog
+
+
+def build_series(n, seasons, episodes_per_season, sources):
+    series = Series(*series_fields(n))
+    series['episodes'] = {}
+    for season in range(1, seasons + 1):
+        episodes = []
+        for number in range(1, episodes_per_season + 1):
+            episode = Episode(*episode_fields(n, season, number))
+            episode['video_sources'] = [VideoSource(*source_fields(n, season, number, k))
+                                        for k in range(sources)]
+            episodes.append(episode)
+        series['episodes'][f"season-{season}"] = episodes
+    return series
+
+
+def build_records(args):
+    return [build_series(n, args.seasons, args.episodes, args.sources) for n in range(args.series)]
+
+
+def build_pooled(args):
+    """Cada serie se arma en un proceso del pool y llega por pickle, como en V2"""
+    with ParsePool(workers=args.workers) as pool:
+        futures = [pool.submit(build_series, n, args.seasons, args.episodes, args.sources)
+                   for n in range(args.series)]
+        return [future.result() for future in futures]
+
+
+def measure(build, args):
+    gc.collect()
+    tracemalloc.start()
+    catalog = build(args)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return catalog, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--series', type=int, default=2000)
+    parser.add_argument('--seasons', type=int, default=3)
+    parser.add_argument('--episodes', type=int, default=10, help='episodios por temporada')
+    parser.add_argument('--sources', type=int, default=4, help='fuentes de video por episodio')
+    parser.add_argument('--workers', type=int, default=2, help='procesos del pool para los registros recibidos por pickle')
+    args = parser.parse_args()
+
+    episodes = args.series * args.seasons * args.episodes
+    sources = episodes * args.sources
+    records = args.series + episodes + sources
+    print(f"{args.series} series, {episodes} episodios, {sources} fuentes de video ({records} registros)")
+
+    dicts, dict_size = measure(build_dicts, args)
+    dict_json = json.dumps(dicts, ensure_ascii=False)
+    del dicts
+
+    slotted, record_size = measure(build_records, args)
+    same_json = json.dumps(slotted, ensure_ascii=False, default=to_json) == dict_json
+    del slotted
+
+    pooled, pooled_size = measure(build_pooled, args)
+    same_json = same_json and json.dumps(pooled, ensure_ascii=False, default=to_json) == dict_json
+    del pooled
+
+    for label, size in (('dicts', dict_size), ('records', record_size), ('pool', pooled_size)):
+        print(f"{label:<8} {size / 2**20:8.1f} MiB  ->  {size / records:6.0f} bytes/registro")
+    for label, size in (('records', record_size), ('pool', pooled_size)):
+        print(f"ahorro {label}: {(dict_size - size) / records:.0f} bytes/registro "
+              f"({100 * (1 - size / dict_size):.0f}%)")
+    print(f"mismo JSON: {'sí' if same_json else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
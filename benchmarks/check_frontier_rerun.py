@@ -0,0 +1,76 @@
+"""Verifica que volver a correr con ``--frontier`` nunca achique la salida.
+
+Corre ``bsz_cli.py movies`` contra el sitio de fixtures con un mismo
+``--frontier`` y ``--store``: primero con algunas URLs y después con esas
+mismas más otras nuevas. Las ya terminadas se omiten en la segunda corrida,
+así que ``code.txt`` y la lista del almacén tienen que conservar las de la
+primera y agregar las nuevas (cada película una sola vez; las páginas de
+fixtures sin reproductor se omiten en las dos).
+
+Uso:
+    python benchmarks/check_frontier_rerun.py [--first 3] [--added 2]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fixture_site import FixtureSite
+from movie_grid import MOVIE_MARK
+from record_store import RecordStore
+
+
+def run_movies(urls, folder):
+    """Una corrida de ``movies``; devuelve (películas en code.txt, películas en la lista del almacén)"""
+    output = os.path.join(folder, 'code.txt')
+    subprocess.run(
+        [sys.executable, os.path.join(ROOT, 'bsz_cli.py'), 'movies', *urls, '-o', output, '--quiet', '--no-cache',
+         '--frontier', os.path.join(folder, 'frontier.txt'), '--store', os.path.join(folder, 'catalog.sqlite')],
+        check=True,
+    )
+    with open(output, encoding='utf-8') as file:
+        written = file.read().count(MOVIE_MARK)
+    store = RecordStore(os.path.join(folder, 'catalog.sqlite'))
+    try:
+        listed = [movie['url'] for movie in store.listed_movies(output)]
+    finally:
+        store.close()
+    return written, listed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--first', type=int, default=3, help='películas de la primera corrida')
+    parser.add_argument('--added', type=int, default=2, help='películas nuevas de la segunda corrida')
+    args = parser.parse_args()
+
+    failures = 0
+    with FixtureSite() as site, tempfile.TemporaryDirectory() as folder:
+        urls = [f"{site.url}/pelicula/rerun-{n}" for n in range(args.first + args.added)]
+        previous_written, previous_listed = 0, []
+        for label, run_urls in (('primera', urls[:args.first]), ('segunda', urls)):
+            written, listed = run_movies(run_urls, folder)
+            print(f"{label} corrida: {len(run_urls)} URLs -> {written} en code.txt, {len(listed)} en el almacén")
+            if written < previous_written:
+                print(f"  ✗ code.txt bajó de {previous_written} a {written} películas")
+                failures += 1
+            if listed[:len(previous_listed)] != previous_listed:
+                print("  ✗ la lista del almacén perdió películas de la corrida anterior")
+                failures += 1
+            if len(set(listed)) != len(listed) or written != len(listed):
+                print("  ✗ películas repetidas o distintas entre code.txt y el almacén")
+                failures += 1
+            previous_written, previous_listed = written, listed
+
+    if failures:
+        print(f"\n{failures} problemas encontrados")
+        sys.exit(1)
+    print("✓ La segunda corrida conserva las películas de la primera")
+
+
+if __name__ == '__main__':
+    main()
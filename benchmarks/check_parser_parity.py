@@ -0,0 +1,98 @@
+"""Verifica que todos los backends de movie_parser den exactamente la misma tupla.
+
+Compara ``(img_url, iframe_url, title)`` de cada backend contra el backend
+``full`` (el BeautifulSoup completo original) en cada página guardada de
+benchmarks/fixtures/movies y en los casos límite de ``EDGE_CASES`` (cuerpo
+vacío, código dentro del título, texto dentro del iframe), tanto con la lógica
+de V4 como con la de V1-V3.
+También mide el tiempo medio de parseo por página de cada backend.
+
+Uso:
+    python benchmarks/check_parser_parity.py [--repeat 200]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import movie_parser
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'movies')
+PAGE_URL = 'https://ww9.cuevana3.to/pelicula/{name}'
+
+# Páginas que no vienen del sitio pero que una respuesta rara puede traer
+EDGE_CASES = {
+    'cuerpo-vacio': '',
+    'solo-espacios': '  \n\t\n',
+    'script-en-h1': ('<html><body><h1>El <script>var x = 1;</script>Último'
+                     '<style>.a { color: red; }</style> Guerrero</h1></body></html>'),
+    'iframe-con-texto': ('<html><body><h1 class="Title">Con <!-- aviso -->Reproductor</h1>'
+                         '<iframe class="no-you" data-src="https://streamtape.com/e/x1">'
+                         'Tu navegador no soporta iframes</iframe></body></html>'),
+    'iframe-en-h1': ('<html><body><h1>Título <iframe src="https://voe.sx/e/y2">texto del iframe'
+                     '</iframe>final</h1></body></html>'),
+}
+
+
+def load_fixtures():
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.html'))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        with open(path, encoding='utf-8') as file:
+            fixtures.append((name, PAGE_URL.format(name=name), file.read()))
+    for name, html in EDGE_CASES.items():
+        fixtures.append((name, PAGE_URL.format(name=name), html))
+    return fixtures
+
+
+def available_backends():
+    return [b for b in movie_parser.BACKENDS if b != 'lxml' or movie_parser.lxml is not None]
+
+
+def check_parity(fixtures, backends):
+    failures = 0
+    for parse in (movie_parser.parse_movie_page, movie_parser.parse_movie_page_basic):
+        for name, url, html in fixtures:
+            expected = parse(html, url, backend='full')
+            for backend in backends:
+                result = parse(html, url, backend=backend)
+                if result != expected:
+                    failures += 1
+                    print(f"✗ {parse.__name__} [{backend}] {name}:\n    esperado {expected}\n    obtenido {result}")
+    return failures
+
+
+def time_backends(fixtures, backends, repeat):
+    for backend in backends:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for name, url, html in fixtures:
+                movie_parser.parse_movie_page(html, url, backend=backend)
+        elapsed = time.perf_counter() - start
+        per_page = elapsed / (repeat * len(fixtures)) * 1000
+        print(f"  {backend:<9} {per_page:.3f} ms/página")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=200, help='repeticiones para medir tiempo de parseo')
+    args = parser.parse_args()
+
+    fixtures = load_fixtures()
+    backends = available_backends()
+    print(f"Páginas: {len(fixtures)} | backends: {', '.join(backends)}")
+
+    failures = check_parity(fixtures, backends)
+    if failures:
+        print(f"\n{failures} diferencias encontradas")
+        sys.exit(1)
+
+    print("✓ Todos los backends devuelven las mismas tuplas\n")
+    time_backends(fixtures, backends, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""Réplica local del sitio armada con las páginas guardadas en benchmarks/fixtures.
+
+Rutas (como en el sitio real):
+
+    /pelicula/<nombre>          fixtures/movies
+    /category/<nombre>[/page/N] fixtures/categories (404 después de la última página)
+    /serie/ y /serie/page/N     fixtures/listings/serie.html
+    /serie/<nombre>             fixtures/series
+    /episodio/<nombre>          fixtures/episodes
+
+``<nombre>-N`` sirve el fixture ``<nombre>``; si no es un fixture se elige uno
+de forma determinista, así cualquier cantidad de URLs distintas tiene página.
+Los enlaces absolutos a ww8/ww9.cuevana3.to se reescriben para apuntar a este
+servidor.
+
+Uso (deja el sitio levantado para correr los extractores contra él):
+    python benchmarks/fixture_site.py --port 8765 --latency 0.05
+"""
+import argparse
+import glob
+import os
+import re
+import time
+import zlib
+
+from local_server import LocalServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+SITE_HOSTS = (b'https://ww9.cuevana3.to', b'https://ww8.cuevana3.to')
+
+ROUTES = {
+    'pelicula': 'movies',
+    'category': 'categories',
+    'serie': 'series',
+    'episodio': 'episodes',
+}
+
+
+def load_corpus():
+    """{tipo: {nombre: bytes}} con todas las páginas guardadas"""
+    corpus = {}
+    for kind in set(ROUTES.values()) | {'listings'}:
+        pages = {}
+        for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, kind, '*.html'))):
+            with open(path, 'rb') as file:
+                pages[os.path.splitext(os.path.basename(path))[0]] = file.read()
+        corpus[kind] = pages
+    return corpus
+
+
+def pick(pages, name):
+    """La página ``name`` o, si no existe, una elegida de forma estable a partir del nombre"""
+    if name in pages:
+        return pages[name]
+    base_name = re.sub(r'-\d+$', '', name)
+    if base_name in pages:
+        return pages[base_name]
+    names = sorted(pages)
+    return pages[names[zlib.crc32(name.encode('utf-8')) % len(names)]]
+
+
+def last_page(body):
+    """Mayor ``/page/N`` enlazado desde la página (1 si no tiene paginación)"""
+    return max((int(n) for n in re.findall(rb'/page/(\d+)', body)), default=1)
+
+
+class FixtureSite(LocalServer):
+    """``LocalServer`` que sirve el corpus de fixtures con la latencia indicada"""
+
+    def __init__(self, latency=0.0, port=0):
+        super().__init__(self.page, latency=latency, port=port)
+        self.corpus = load_corpus()
+
+    def page(self, path):
+        parts = [part for part in path.split('?')[0].split('/') if part]
+        if not parts or parts[0] not in ROUTES:
+            return None
+
+        if parts[0] == 'serie' and (len(parts) == 1 or parts[1] == 'page'):
+            body = self.corpus['listings']['serie']
+        elif parts[0] == 'category':
+            body = pick(self.corpus['categories'], parts[1] if len(parts) > 1 else '')
+            # Como el sitio real: más allá de la última página enlazada, 404
+            if len(parts) > 3 and parts[2] == 'page' and int(parts[3]) > last_page(body):
+                return None
+        else:
+            body = pick(self.corpus[ROUTES[parts[0]]], parts[-1])
+
+        for host in SITE_HOSTS:
+            body = body.replace(host, self.url.encode('ascii'))
+        return body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='latencia artificial por página en segundos')
+    args = parser.parse_args()
+
+    with FixtureSite(latency=args.latency, port=args.port) as site:
+        print(f"Sitio de fixtures en {site.url} (latencia {args.latency}s)")
+        print(f"  {site.url}/category/accion")
+        print(f"  {site.url}/pelicula/estandar")
+        print(f"  {site.url}/serie/")
+        print("Ctrl+C para terminar")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Servidor HTTP local que sustituye al sitio real durante los benchmarks.
+
+Sirve páginas en memoria con HTTP/1.1 keep-alive y cuenta cuántas conexiones
+TCP se abrieron (cada una equivale a un handshake en el sitio real). Cada
+página lleva un ETag y responde 304 a un If-None-Match que coincide.
+"""
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        body = server.get_page(self.path)
+        if body is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if self.headers.get('If-None-Match') == etag:
+            with server.lock:
+                server.not_modified += 1
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalServer(ThreadingHTTPServer):
+    """Servidor de páginas fijas; ``pages`` es un dict ruta -> bytes o una función ruta -> bytes"""
+
+    daemon_threads = True
+
+    def __init__(self, pages, latency=0.0, port=0):
+        super().__init__(('127.0.0.1', port), _Handler)
+        self.pages = pages
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.not_modified = 0
+        self._thread = None
+
+    def get_request(self):
+        request = super().get_request()
+        with self.lock:
+            self.connections += 1
+        return request
+
+    def get_page(self, path):
+        if callable(self.pages):
+            return self.pages(path)
+        return self.pages.get(path)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_counters(self):
+        with self.lock:
+            self.connections = 0
+            self.requests = 0
+            self.not_modified = 0
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
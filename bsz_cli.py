@@ -0,0 +1,482 @@
+"""Línea de comandos no interactiva para los extractores (cron, shards, tuberías).
+
+Las URLs se pasan como argumentos, en archivos (una o varias por línea,
+separadas por comas) o por stdin con ``-``; se leen de a una, sin juntar la
+lista completa en memoria. El progreso va a stderr y los datos al archivo de
+``-o`` (o a stdout en los comandos de series, como JSON Lines).
+
+Ejemplos:
+    python bsz_cli.py movies urls.txt -o code.txt
+    cat categorias.txt | python bsz_cli.py categories -
+    python bsz_cli.py generate-pages https://ww8.cuevana3.to/category guerra | python bsz_cli.py categories
+    python bsz_cli.py series --listing https://ww9.cuevana3.to/serie/ -o series.jsonl
+    python bsz_cli.py series-with-episodes series.txt > series.jsonl
+    python bsz_cli.py video-sources --listing https://ww9.cuevana3.to/serie/ -o series.jsonl.gz
+    python bsz_cli.py categories paginas.txt --ndjson peliculas.jsonl -o code.txt
+    python bsz_cli.py video-sources https://ww9.cuevana3.to/serie/wonder-man
+    python bsz_cli.py coordinator cola.sqlite --base-url https://ww8.cuevana3.to/category --category guerra --workers 4
+    python bsz_cli.py worker cola.sqlite
+    python bsz_cli.py categories paginas.txt --store catalog.sqlite -o code.txt
+    python bsz_cli.py render catalog.sqlite code.txt -o code.txt
+    python bsz_cli.py render catalog.sqlite series_catalog.html --images imagenes
+    python bsz_cli.py render catalog.sqlite series_catalog.html --lazy
+    python bsz_cli.py categories paginas.txt --profile perfil.json -o code.txt
+    python bsz_cli.py categories paginas.txt --order intercalado --category-workers 8 -o code.txt
+"""
+import argparse
+import asyncio
+import contextlib
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'series'))
+
+import http_client
+import movie_parser
+import parse_pool
+import profiling
+import rate_limit
+import distributed_crawl
+from async_crawl import map_in_order
+from category_sweep import DEFAULT_CATEGORY_WORKERS, DEFAULT_ORDER, ORDERS, sweep_categories
+from frontier import Frontier
+from movie_grid import MovieGridWriter
+from ExtractorBszV3 import generate_category_urls
+from ExtractorBszV4 import MAX_IN_FLIGHT, extract_data, extract_links_from_category, process_movie_result, render_movie_grid
+from BszPelisPlusV2 import extract_series_from_listing_page, extract_series_with_episodes, render_series_catalog
+from series_parsing import parse_series_page
+from pagination import discover_category_urls
+from image_mirror import ImageMirror
+from record_store import RecordStore
+from ndjson_output import COMPRESSIONS, NdjsonWriter, open_ndjson
+from work_queue import WorkQueue
+
+
+def _urls_in_lines(lines):
+    for line in lines:
+        for url in line.split(','):
+            url = url.strip()
+            if url.startswith('http'):
+                yield url
+
+
+def iter_urls(sources):
+    """URLs de los argumentos: URLs sueltas, archivos o ``-`` para stdin, en orden"""
+    for source in sources or ['-']:
+        if source == '-':
+            yield from _urls_in_lines(sys.stdin)
+        elif source.startswith(('http://', 'https://')):
+            yield from _urls_in_lines([source])
+        else:
+            with open(source, encoding='utf-8') as file:
+                yield from _urls_in_lines(file)
+
+
+def listing_name(args):
+    """Nombre de la lista del almacén que corresponde a la salida del comando"""
+    return args.output or args.command
+
+
+def open_grid(args):
+    if args.append:
+        # Sigue la numeración linea-N del archivo y completa su último bloque
+        return MovieGridWriter(args.output, append=True)
+
+    if args.records:
+        args.records.clear_listing(listing_name(args))
+    if args.full_rewrite:
+        # Limpiar archivo de salida
+        open(args.output, 'w', encoding='utf-8').close()
+    # Si no, solo se reescriben los bloques que cambiaron desde la corrida anterior
+    return MovieGridWriter(args.output, incremental=not args.full_rewrite)
+
+
+def open_records(args, stdout):
+    """Salida JSON Lines: un registro por línea, escrito y vaciado apenas se extrae"""
+    if args.output:
+        return open_ndjson(args.output, args.append, args.compress)
+    return NdjsonWriter(stdout.buffer, args.compress, close_file=False)
+
+
+def open_movie_records(args):
+    """NDJSON de ``--ndjson`` con cada película guardada, o None"""
+    if not args.ndjson:
+        return contextlib.nullcontext()
+    return open_ndjson(args.ndjson, args.append, args.compress)
+
+
+# ---------- Películas ----------
+
+async def crawl_movies(movie_urls, writer, max_in_flight, frontier, store=None, ndjson=None):
+    index = 0
+    async for movie_url, result in map_in_order(extract_data, frontier.filter(movie_urls), max_in_flight):
+        index += 1
+        process_movie_result(writer, index, None, result, movie_url, store, ndjson)
+        if all(result):
+            frontier.complete(movie_url)
+    return index
+
+
+async def crawl_categories(category_urls, writer, max_in_flight, frontier, store=None, ndjson=None,
+                           order=DEFAULT_ORDER, category_workers=DEFAULT_CATEGORY_WORKERS):
+    total_movies_found = 0
+    sizes = {}
+    done = {}
+
+    def on_category(index, category_url, movie_links):
+        nonlocal total_movies_found
+        new_links = list(frontier.filter(movie_links))
+        print(f"{category_url}: {len(movie_links)} películas ({len(movie_links) - len(new_links)} ya vistas)")
+        total_movies_found += len(new_links)
+        sizes[index] = len(new_links)
+        done[index] = 0
+        return new_links
+
+    # Las páginas de categoría cambian entre corridas: se deduplican solo dentro de esta
+    async for index, movie_url, result in sweep_categories(Frontier().filter(category_urls), extract_links_from_category,
+                                                           extract_data, order, category_workers, max_in_flight,
+                                                           on_category):
+        done[index] += 1
+        process_movie_result(writer, done[index], sizes[index], result, movie_url, store, ndjson)
+        if all(result):
+            frontier.complete(movie_url)
+    return total_movies_found
+
+
+def cmd_movies(args, stdout):
+    writer = open_grid(args)
+    with open_movie_records(args) as ndjson:
+        found = asyncio.run(crawl_movies(iter_urls(args.inputs), writer, args.concurrency, args.seen,
+                                         args.records, ndjson))
+    writer.close()
+    print(f"Películas: {writer.movie_count}/{found} guardadas en {args.output} ({writer.block_number} bloques)")
+
+
+def cmd_categories(args, stdout):
+    writer = open_grid(args)
+    with open_movie_records(args) as ndjson:
+        found = asyncio.run(crawl_categories(iter_urls(args.inputs), writer, args.concurrency, args.seen,
+                                             args.records, ndjson, args.order, args.category_workers))
+    writer.close()
+    print(f"Películas: {writer.movie_count}/{found} guardadas en {args.output} ({writer.block_number} bloques)")
+
+
+def category_pages(args):
+    """Páginas de la categoría: las ``--pages`` indicadas o las que tiene realmente"""
+    if args.pages:
+        return generate_category_urls(args.base_url, args.category, args.pages)
+    return discover_category_urls(args.base_url, args.category)
+
+
+def cmd_generate_pages(args, stdout):
+    urls = category_pages(args)
+    with open_records(args, stdout) as output:
+        for url in urls:
+            output.write_line(url)
+    print(f"{len(urls)} URLs generadas")
+
+
+# ---------- Series ----------
+
+def iter_series(args, extract_episodes, extract_videos):
+    """``(origen, serie)`` de las URLs de entrada, ya sea como páginas de listado o como series sueltas
+
+    El origen es la página de listado de la que salió la serie, o None si la
+    URL de la serie se pasó directamente.
+    """
+    urls = iter_urls(args.inputs)
+
+    if args.listing:
+        # Los listados cambian entre corridas: se deduplican solo dentro de esta
+        for page_url in Frontier().filter(urls):
+            for series_data in extract_series_from_listing_page(
+                    page_url, extract_episodes, extract_videos, frontier=args.seen):
+                yield page_url, series_data
+        return
+
+    urls = args.seen.filter(urls)
+    if extract_episodes:
+        for series_url in urls:
+            series_data = extract_series_with_episodes(series_url, extract_videos)
+            if series_data:
+                yield None, series_data
+
+    else:
+        # Solo datos básicos: descargar en tandas paralelas sin leer todo el archivo
+        while True:
+            batch = list(itertools.islice(urls, args.concurrency * 4))
+            if not batch:
+                break
+            for series_url, series_data in parse_pool.fetch_and_parse_many(
+                    batch, parse_series_page, fetch_workers=args.concurrency):
+                if isinstance(series_data, Exception):
+                    print(f"Error extrayendo datos de {series_url}: {series_data}")
+                else:
+                    yield None, series_data
+
+
+def store_series(store, name, sections, source_url, series_data):
+    """Guarda la serie en el almacén, en una sección por página de listado de origen"""
+    if not sections or sections[-1] != source_url:
+        sections.append(source_url)
+        store.add_section(name, len(sections), source_url)
+    store.put_series(series_data)
+    store.add_to_listing(name, len(sections), 'series', series_data['url'])
+
+
+def series_command(extract_episodes, extract_videos):
+    def command(args, stdout):
+        count = 0
+        sections = []
+        if args.records and not args.append:
+            args.records.clear_listing(listing_name(args))
+
+        with open_records(args, stdout) as output:
+            for source_url, series_data in iter_series(args, extract_episodes, extract_videos):
+                output.write(series_data)
+                args.seen.complete(series_data['url'])
+                if args.records:
+                    store_series(args.records, listing_name(args), sections, source_url, series_data)
+                count += 1
+        print(f"{count} series extraídas")
+    return command
+
+
+def mirror_images(args, store, output):
+    """Descarga las imágenes de la lista y devuelve ``{url: ruta local}`` relativa a ``output``"""
+    with ImageMirror(args.images, args.image_workers, thumbnails=not args.no_thumbnails) as mirror:
+        image_urls = store.listing_image_urls(args.name)
+        stats = mirror.mirror(image_urls)
+        print(f"Imágenes: {stats['downloaded']} descargadas, {stats['duplicates']} repetidas por contenido, "
+              f"{stats['reused']} ya estaban, {stats['failed']} con error")
+        return mirror.links(image_urls, os.path.dirname(output))
+
+
+def cmd_render(args, stdout):
+    store = RecordStore(args.database)
+    try:
+        kind = store.listing_kind(args.name)
+        if kind is None:
+            sys.exit(f"La lista '{args.name}' no existe o está vacía en {args.database}")
+
+        output = args.output or ('code.txt' if kind == 'movie' else 'series_catalog.html')
+        images = mirror_images(args, store, output) if args.images else None
+
+        if kind == 'movie':
+            writer = render_movie_grid(store, args.name, output, not args.full_rewrite, images)
+            print(f"Películas: {writer.movie_count} guardadas en {output} ({writer.block_number} bloques)")
+        else:
+            individual_files, series_count = render_series_catalog(
+                store, output, args.name, not args.full_rewrite, images, args.lazy
+            )
+            print(f"{series_count} series en {len(individual_files)} archivos JSON")
+    finally:
+        store.close()
+
+
+# ---------- Modo distribuido ----------
+
+def worker_args(args):
+    """Opciones que heredan los workers lanzados por el coordinador"""
+    extra = []
+    if args.no_cache:
+        extra.append('--no-cache')
+    if args.rate:
+        extra += ['--rate', str(args.rate)]
+    if args.max_rate:
+        extra += ['--max-rate', str(args.max_rate)]
+    if args.parser:
+        extra += ['--parser', args.parser]
+    if args.quiet:
+        extra.append('--quiet')
+    return extra
+
+
+def cmd_coordinator(args, stdout):
+    if bool(args.base_url) != bool(args.category) or (args.pages and not args.base_url):
+        sys.exit("--base-url y --category van juntos (y --pages los requiere)")
+
+    if args.base_url:
+        category_urls = category_pages(args)
+    else:
+        category_urls = iter_urls(args.inputs)
+
+    queue = WorkQueue(args.queue)
+    distributed_crawl.seed_categories(queue, category_urls)
+    print(f"Cola {args.queue}: {queue.counts()}")
+
+    workers = distributed_crawl.start_workers(args.queue, args.workers, worker_args(args))
+    try:
+        while queue.unfinished():
+            if all(worker.poll() is not None for worker in workers):
+                # Volver a contar: el último worker pudo terminar la última tarea antes de salir
+                unfinished = queue.unfinished()
+                if unfinished:
+                    codes = ', '.join(str(worker.returncode) for worker in workers)
+                    sys.exit(f"Los workers terminaron (códigos de salida: {codes}) "
+                             f"con {unfinished} tareas sin terminar en {args.queue}")
+                break
+            time.sleep(1)
+    finally:
+        for worker in workers:
+            worker.wait()
+        queue.close()
+
+    cmd_merge(args, stdout)
+
+
+def cmd_worker(args, stdout):
+    done = distributed_crawl.run_worker(args.queue)
+    print(f"Worker terminado: {done} tareas")
+
+
+def cmd_merge(args, stdout):
+    writer, counts = distributed_crawl.merge_results(args.queue, args.output)
+    duplicates = counts.pop('duplicates')
+    print(f"Tareas: {counts}")
+    print(f"Descargas ahorradas por deduplicación: {duplicates}")
+    print(f"Películas: {writer.movie_count} guardadas en {args.output} ({writer.block_number} bloques)")
+
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--concurrency', type=int, default=MAX_IN_FLIGHT, help='descargas simultáneas')
+    common.add_argument('--rate', type=float, help='peticiones/s iniciales por host del limitador')
+    common.add_argument('--max-rate', type=float,
+                        help=f"techo de peticiones/s por host (por defecto {rate_limit.MAX_RATE:g})")
+    common.add_argument('--no-cache', action='store_true', help='no usar la caché HTTP en disco')
+    common.add_argument('--cache-path', default=http_client.DEFAULT_CACHE_PATH)
+    common.add_argument('--parser', choices=movie_parser.BACKENDS, help='backend de parseo de películas')
+    common.add_argument('--parse-workers', type=int, default=parse_pool.DEFAULT_WORKERS,
+                        help='procesos de parseo de series (0 = en el mismo proceso)')
+    common.add_argument('--frontier', metavar='ARCHIVO',
+                        help='guardar las URLs ya descargadas y omitirlas en las corridas siguientes '
+                             '(que agregan a la salida en lugar de reemplazarla)')
+    common.add_argument('--store', metavar='ARCHIVO',
+                        help='guardar también los registros en este almacén SQLite (ver el comando render)')
+    common.add_argument('--full-rewrite', action='store_true',
+                        help='reescribir toda la salida en lugar de solo los bloques que cambiaron')
+    common.add_argument('--profile', metavar='ARCHIVO',
+                        help='medir el tiempo de cada etapa y guardar el reporte JSON (p50/p95/p99)')
+    common.add_argument('--compress', choices=COMPRESSIONS,
+                        help='comprimir la salida JSON Lines (por defecto según la extensión: .gz, .zst)')
+    common.add_argument('--append', action='store_true', help='agregar a la salida en lugar de reemplazarla')
+    common.add_argument('-q', '--quiet', action='store_true', help='sin mensajes de progreso')
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_command(name, func, help_text, output_default=None):
+        command = commands.add_parser(name, parents=[common], help=help_text)
+        command.set_defaults(func=func)
+        command.add_argument('-o', '--output', default=output_default,
+                             help=f"archivo de salida (por defecto {output_default or 'stdout'})")
+        return command
+
+    for name, func, help_text in (
+        ('movies', cmd_movies, 'URLs de películas -> bloques movies-grid'),
+        ('categories', cmd_categories, 'URLs de categorías -> bloques movies-grid de todas sus películas'),
+    ):
+        command = add_command(name, func, help_text, output_default='code.txt')
+        command.add_argument('inputs', nargs='*', help='URLs, archivos con URLs o - para stdin (por defecto stdin)')
+        command.add_argument('--ndjson', metavar='ARCHIVO',
+                             help='escribir también cada película en este archivo JSON Lines apenas se extrae')
+        if name == 'categories':
+            command.add_argument('--order', choices=ORDERS, default=DEFAULT_ORDER,
+                                 help='películas de cada categoría seguidas o intercaladas entre categorías')
+            command.add_argument('--category-workers', type=int, default=DEFAULT_CATEGORY_WORKERS,
+                                 help='páginas de categoría descargándose a la vez')
+
+    command = add_command('generate-pages', cmd_generate_pages, 'URLs de las páginas de una categoría, una por línea')
+    command.add_argument('base_url', help='ej: https://ww8.cuevana3.to/category')
+    command.add_argument('category', help='ej: guerra')
+    command.add_argument('pages', type=int, nargs='?',
+                         help='cantidad de páginas (por defecto se detecta desde la paginación del sitio)')
+
+    for name, extract_episodes, extract_videos, help_text in (
+        ('series', False, False, 'datos básicos de series -> JSON Lines'),
+        ('series-with-episodes', True, False, 'series con sus episodios -> JSON Lines'),
+        ('video-sources', True, True, 'series con episodios y fuentes de video -> JSON Lines'),
+    ):
+        command = add_command(name, series_command(extract_episodes, extract_videos), help_text)
+        command.add_argument('inputs', nargs='*', help='URLs, archivos con URLs o - para stdin (por defecto stdin)')
+        command.add_argument('--listing', action='store_true',
+                             help='las URLs son páginas de listado (ej: /serie/page/2)')
+
+    command = add_command('render', cmd_render,
+                          'vuelve a generar code.txt o el catálogo de series (HTML + JSON) desde un almacén')
+    command.add_argument('database', metavar='ALMACEN', help='archivo SQLite de --store')
+    command.add_argument('name', metavar='LISTA',
+                         help='salida con la que se guardó la lista (el -o del comando, o su nombre)')
+    command.add_argument('--images', metavar='CARPETA',
+                         help='descargar pósters y miniaturas a esta carpeta y usar las copias locales')
+    command.add_argument('--image-workers', type=int, default=8, help='descargas de imágenes simultáneas')
+    command.add_argument('--no-thumbnails', action='store_true', help='no generar miniaturas (requieren Pillow)')
+    command.add_argument('--lazy', action='store_true',
+                         help='catálogo de series liviano: las tarjetas y episodios se cargan por bloques al navegar')
+
+    command = add_command('coordinator', cmd_coordinator,
+                          'reparte páginas de categoría y películas entre workers y combina el resultado',
+                          output_default='code.txt')
+    command.add_argument('queue', help='archivo SQLite de la cola de trabajo')
+    command.add_argument('inputs', nargs='*', help='URLs de categorías, archivos o - (si no se usa --base-url)')
+    command.add_argument('--base-url', help='ej: https://ww8.cuevana3.to/category')
+    command.add_argument('--category', help='ej: guerra')
+    command.add_argument('--pages', type=int,
+                         help='cantidad de páginas de la categoría (por defecto se detecta desde el sitio)')
+    command.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                         help='workers locales a lanzar (0 = solo esperar a workers externos)')
+
+    command = add_command('worker', cmd_worker, 'procesa tareas de una cola hasta vaciarla')
+    command.add_argument('queue', help='archivo SQLite de la cola de trabajo')
+
+    command = add_command('merge', cmd_merge, 'vuelve a combinar las películas terminadas de una cola',
+                          output_default='code.txt')
+    command.add_argument('queue', help='archivo SQLite de la cola de trabajo')
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if not args.no_cache:
+        http_client.enable_cache(args.cache_path)
+    if args.rate or args.max_rate:
+        limits = {'rate': args.rate, 'max_rate': args.max_rate}
+        http_client.configure_rate_limit(**{name: value for name, value in limits.items() if value})
+    if args.parser:
+        movie_parser.set_parser_backend(args.parser)
+    parse_pool.configure_parse_pool(args.parse_workers)
+    if args.profile:
+        profiling.enable(args.profile)
+    # URLs de películas y series ya vistas (en esta corrida, o también en las anteriores con --frontier)
+    args.seen = Frontier(args.frontier)
+    if len(args.seen) and not args.append:
+        # Lo terminado en corridas anteriores se omite, así que la salida (y la lista de --store)
+        # se continúa: reemplazarla dejaría solo lo nuevo de esta corrida
+        args.append = True
+    args.records = RecordStore(args.store) if args.store else None
+
+    # Los datos van a stdout; los mensajes de los extractores, a stderr
+    stdout = sys.stdout
+    progress = open(os.devnull, 'w') if args.quiet else sys.stderr
+    try:
+        with contextlib.redirect_stdout(progress):
+            args.func(args, stdout)
+            if args.seen.saved:
+                print(f"Descargas ahorradas por deduplicación: {args.seen.saved}")
+            profiling.write_report(http=http_client.get_stats(), cache=http_client.get_cache_stats(),
+                                   rate_limit=http_client.get_limiter_stats())
+    finally:
+        args.seen.close()
+        if args.records:
+            args.records.close()
+        parse_pool.shutdown_parse_pool()
+        http_client.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Escritura incremental de ``series_catalog.html``.
+
+En lugar de armar todo el catálogo en un único string y guardarlo al final,
+cada ``url-section`` y ``series-card`` se escribe al archivo apenas se arma;
+en memoria solo queda el buffer del archivo y la tarjeta en curso.
+
+Con ``incremental`` cada tarjeta (lo escrito hasta ``end_part``) es una parte
+de ``incremental_output``: solo se escriben las que cambiaron desde la
+corrida anterior, y con ``skip_part`` una tarjeta cuyos datos no cambiaron
+ni siquiera se arma.
+"""
+from incremental_output import IncrementalFile
+from profiling import timed
+
+
+class CatalogWriter:
+    """Abre el catálogo con ``header``, recibe fragmentos con ``write`` y lo cierra con ``footer``"""
+
+    def __init__(self, filename, header, footer, incremental=False):
+        self.filename = filename
+        self.footer = footer
+        self.output = IncrementalFile(filename) if incremental else None
+        self._part = []
+        self._closed = False
+
+        if self.output:
+            self.output.write(header)
+        else:
+            self._file = open(filename, 'w', encoding='utf-8')
+            self._file.write(header)
+
+    @timed('write.catalog')
+    def write(self, html):
+        if self.output:
+            self._part.append(html)
+        else:
+            self._file.write(html)
+
+    def end_part(self, key=None):
+        """Termina la parte en curso (una tarjeta o el cierre de una sección)
+
+        ``key`` es el ``record_key`` de los datos de la tarjeta (ver ``skip_part``).
+        """
+        if self.output and self._part:
+            self.output.write(''.join(self._part), key)
+            self._part = []
+
+    def skip_part(self, key):
+        """True si la próxima parte ya está escrita con los mismos datos (``key``) y no hace falta armarla"""
+        return bool(self.output) and not self._part and self.output.skip(key)
+
+    def close(self):
+        """Agrega el pie (resumen ya escrito, script de toggle) y cierra el archivo"""
+        if self._closed:
+            return
+        self._closed = True
+
+        if self.output:
+            self.end_part()
+            self.output.write(self.footer)
+            self.output.close()
+        else:
+            self._file.write(self.footer)
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,75 @@
+"""Barrido de muchas categorías en paralelo con un solo orden de salida.
+
+Antes cada categoría se recorría entera antes de pedir la siguiente, porque
+los bloques ``linea-N`` de 15 películas se iban armando en ese mismo orden.
+Aquí las páginas de categoría se descargan de a ``category_workers`` a la vez
+y las películas de todas las categorías comparten la misma ventana de
+descargas de ``map_in_order``: cuando una categoría está terminando, las
+películas de las siguientes ya se están bajando. Lo único secuencial es el
+orden en que los resultados se entregan; el ``MovieGridWriter`` que los recibe
+numera los bloques de forma global, así siguen saliendo de 15 y en orden.
+
+El orden de salida se elige con ``order`` (o ``BSZ_CATEGORY_ORDER``):
+
+- ``categoria``: todas las películas de la primera categoría, después las de
+  la segunda... (el mismo ``code.txt`` que el recorrido en serie);
+- ``intercalado``: una película de cada categoría por turno. Necesita las
+  listas de todas las categorías antes de empezar con las películas.
+"""
+import os
+
+from async_crawl import DEFAULT_MAX_IN_FLIGHT, map_in_order
+
+ORDERS = ('categoria', 'intercalado')
+DEFAULT_ORDER = os.environ.get('BSZ_CATEGORY_ORDER', 'categoria')
+
+# Páginas de categoría descargándose a la vez
+DEFAULT_CATEGORY_WORKERS = int(os.environ.get('BSZ_CATEGORY_WORKERS', 4))
+
+
+def interleave(link_lists):
+    """``(número de lista, url)`` tomando una URL de cada lista por turno"""
+    position = 0
+    remaining = [index for index, links in enumerate(link_lists) if links]
+    while remaining:
+        for index in remaining:
+            yield index, link_lists[index][position]
+        position += 1
+        remaining = [index for index in remaining if position < len(link_lists[index])]
+
+
+async def sweep_categories(category_urls, list_links, extract, order=DEFAULT_ORDER,
+                           category_workers=DEFAULT_CATEGORY_WORKERS, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                           on_category=None):
+    """Produce ``(número de categoría, url de película, resultado)`` en el orden de salida
+
+    ``list_links(category_url)`` devuelve las URLs de películas de una categoría
+    y ``extract(movie_url)`` el resultado de cada película; las dos corren en
+    hilos. ``on_category(número, category_url, movie_links)`` se llama con cada
+    lista, en el orden de las categorías, y devuelve las películas que hay que
+    procesar (para filtrar las ya vistas o mostrar el avance).
+    """
+    if order not in ORDERS:
+        raise ValueError(f"Orden de categorías desconocido: {order} (opciones: {', '.join(ORDERS)})")
+
+    async def listed():
+        index = 0
+        async for category_url, movie_links in map_in_order(list_links, category_urls, category_workers):
+            if on_category:
+                movie_links = on_category(index, category_url, movie_links)
+            yield index, movie_links
+            index += 1
+
+    async def by_category():
+        async for index, movie_links in listed():
+            for movie_url in movie_links:
+                yield index, movie_url
+
+    async def interleaved():
+        link_lists = [movie_links async for _, movie_links in listed()]
+        for item in interleave(link_lists):
+            yield item
+
+    items = by_category() if order == 'categoria' else interleaved()
+    async for (index, movie_url), result in map_in_order(lambda item: extract(item[1]), items, max_in_flight):
+        yield index, movie_url, result
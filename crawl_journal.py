@@ -0,0 +1,107 @@
+"""Journal en disco para poder reanudar corridas largas.
+
+Cada línea del archivo es un JSON ``{"kind": ..., "key": ..., "record": ...}``
+con una unidad de trabajo terminada (página de categoría, película, serie,
+episodio...) y lo que se extrajo de ella. La primera línea identifica la
+corrida (las URLs y opciones de entrada); si una corrida nueva tiene otra
+identidad, el journal anterior se descarta.
+
+Si el proceso muere a la mitad, la siguiente corrida con la misma entrada
+carga el journal, salta lo ya hecho y sigue agregando a las mismas salidas.
+Al terminar bien se llama a ``finish()`` y el archivo se borra.
+"""
+import hashlib
+import json
+import os
+import threading
+
+from records import to_json
+
+
+def journal_path(output_filename):
+    """Ruta del journal que acompaña a un archivo de salida"""
+    return f"{output_filename}.journal"
+
+
+def _run_id(run_key):
+    data = json.dumps(run_key, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+class CrawlJournal:
+    """Registro append-only de trabajo terminado, indexado por (kind, key)"""
+
+    def __init__(self, path, run_key):
+        self.path = path
+        self.run_id = _run_id(run_key)
+        self.entries = {}
+        self._lock = threading.Lock()
+
+        self.resumed = self._load()
+        if self.resumed:
+            self._file = open(path, 'a', encoding='utf-8')
+        else:
+            self.entries = {}
+            self._file = open(path, 'w', encoding='utf-8')
+            self._write({'kind': 'run', 'key': self.run_id})
+
+    def _load(self):
+        """Carga un journal previo de la misma corrida; devuelve True si hay algo para reanudar"""
+        if not os.path.exists(self.path):
+            return False
+
+        valid_size = 0
+        with open(self.path, 'rb') as file:
+            for index, line in enumerate(file):
+                # Última línea cortada por la caída: se descarta aunque el JSON esté completo,
+                # porque sin el salto de línea la siguiente entrada quedaría pegada a ella
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+
+                if index == 0:
+                    if entry.get('kind') != 'run' or entry.get('key') != self.run_id:
+                        return False
+                else:
+                    self.entries[(entry['kind'], entry['key'])] = entry.get('record')
+                valid_size += len(line)
+
+        if valid_size == 0:
+            return False
+
+        # Dejar el archivo terminado en una línea completa antes de seguir agregando
+        os.truncate(self.path, valid_size)
+        return True
+
+    def _write(self, entry):
+        self._file.write(json.dumps(entry, ensure_ascii=False, default=to_json) + '\n')
+        self._file.flush()
+
+    def done(self, kind, key):
+        return (kind, key) in self.entries
+
+    def get(self, kind, key, default=None):
+        return self.entries.get((kind, key), default)
+
+    def put(self, kind, key, record=None):
+        """Marca una unidad como terminada junto con lo que se extrajo de ella"""
+        with self._lock:
+            self.entries[(kind, key)] = record
+            self._write({'kind': kind, 'key': key, 'record': record})
+
+    def count(self, kind):
+        return sum(1 for entry_kind, _ in self.entries if entry_kind == kind)
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def finish(self):
+        """La corrida terminó bien: cerrar y borrar el journal"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
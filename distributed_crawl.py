@@ -0,0 +1,110 @@
+"""Barrido de categorías repartido entre varios procesos o máquinas.
+
+El coordinador genera las páginas de categoría (``discover_category_urls``) y
+las carga en una ``WorkQueue``. Cada worker es un proceso normal que toma
+tareas de la cola y corre las funciones de extracción de siempre:
+
+- ``category``: ``extract_links_from_category``; cada película encontrada se
+  agrega a la cola como tarea ``movie``.
+- ``movie``: ``extract_data``; el resultado queda guardado en la cola.
+
+Al terminar, el coordinador combina las películas en ``movies-grid`` en el
+orden (página de categoría, posición en la página), sin importar qué worker
+terminó primero. Una película repetida se descarga una sola vez y queda en
+su primera posición. Si una descarga falla, la tarea vuelve a la cola (detrás
+de las que todavía no se intentaron) hasta ``MAX_ATTEMPTS`` veces y después
+queda ``failed``: no se guarda como una categoría vacía ni como una película
+sin datos. Para sumar workers en otras máquinas basta con que corran
+``python bsz_cli.py worker <cola>`` contra el mismo archivo de cola.
+"""
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from ExtractorBszV4 import create_movie_block, extract_data, extract_links_from_category
+from movie_grid import MovieGridWriter
+from work_queue import WorkQueue
+
+# Espera entre consultas de un worker cuando no hay tareas pero otras siguen en curso
+IDLE_POLL = 0.5
+
+
+def category_key(index):
+    return f"{index:06d}"
+
+
+def movie_key(category_order, index):
+    return f"{category_order}.{index:06d}"
+
+
+def seed_categories(queue, category_urls):
+    """Carga las páginas de categoría en la cola, en el orden en que llegan"""
+    queue.add_many(('category', url, category_key(index)) for index, url in enumerate(category_urls))
+
+
+def run_worker(queue_path, worker_id=None):
+    """Toma tareas hasta que no quede nada pendiente ni en curso; devuelve cuántas hizo"""
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    queue = WorkQueue(queue_path)
+    done = 0
+
+    try:
+        while True:
+            task = queue.claim(worker_id)
+            if task is None:
+                if not queue.unfinished():
+                    break
+                # Otro worker todavía puede agregar películas de su categoría
+                time.sleep(IDLE_POLL)
+                continue
+
+            task_id, kind, url, order_key = task
+            try:
+                if kind == 'category':
+                    movie_links = extract_links_from_category(url, raise_errors=True)
+                    queue.add_many(
+                        ('movie', link, movie_key(order_key, index)) for index, link in enumerate(movie_links)
+                    )
+                    queue.complete(task_id, len(movie_links))
+                    print(f"[{worker_id}] {url}: {len(movie_links)} películas")
+                else:
+                    queue.complete(task_id, list(extract_data(url, raise_errors=True)))
+                done += 1
+            except Exception as e:
+                # Se reintenta hasta MAX_ATTEMPTS veces (puede tomarla otro worker)
+                print(f"[{worker_id}] Error en {url}: {e}")
+                queue.fail(task_id, e)
+    finally:
+        queue.close()
+
+    return done
+
+
+def start_workers(queue_path, count, extra_args=()):
+    """Lanza ``count`` workers locales como procesos ``bsz_cli.py worker``"""
+    cli = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bsz_cli.py')
+    return [
+        subprocess.Popen([sys.executable, cli, 'worker', queue_path, *extra_args])
+        for _ in range(count)
+    ]
+
+
+def merge_results(queue_path, output):
+    """Escribe todas las películas terminadas en ``output`` en orden determinista"""
+    queue = WorkQueue(queue_path)
+    # Solo se reescriben los bloques que cambiaron desde la última combinación
+    writer = MovieGridWriter(output, incremental=True)
+
+    try:
+        for _, (img_url, iframe_url, title) in queue.results('movie'):
+            if not (img_url and iframe_url and title):
+                continue
+            movie_block = create_movie_block({'image_url': img_url, 'iframe_url': iframe_url, 'title': title})
+            if movie_block:
+                writer.add(movie_block)
+        writer.close()
+        return writer, {**queue.counts(), 'duplicates': queue.duplicates()}
+    finally:
+        queue.close()
@@ -0,0 +1,89 @@
+"""Frontera de URLs del crawl: normalización y deduplicación global.
+
+Una misma película aparece en varias categorías, en varias páginas
+``/page/N`` y en los espejos del sitio (ww8, ww9...). ``canonical_url`` lleva
+todas esas variantes a una sola clave y ``Frontier`` recuerda las claves ya
+vistas en un ``set`` (pertenencia O(1)) durante toda la corrida. Con ``path``
+se guardan en disco las claves de las URLs terminadas (``complete``) y se
+cargan en la corrida siguiente; una URL que falló o quedó a medias por una
+interrupción solo cuenta como vista en esta corrida y se vuelve a intentar.
+"""
+import os
+import re
+import threading
+from urllib.parse import urlsplit, urlunsplit
+
+from http_cache import normalize_url
+
+# Espejos del sitio que sirven el mismo contenido (ww8.cuevana3.to, ww9.cuevana3.to, www...)
+MIRROR_PATTERN = re.compile(r'^(?:ww\d*|www)\.(cuevana3\.[a-z]+)$')
+
+
+def canonical_url(url):
+    """Clave de deduplicación: ``normalize_url`` + https + espejos colapsados en un solo host"""
+    parts = urlsplit(normalize_url(url))
+    host = MIRROR_PATTERN.sub(r'\1', parts.netloc)
+    scheme = 'https' if parts.scheme in ('http', 'https') else parts.scheme
+    return urlunsplit((scheme, host, parts.path, parts.query, ''))
+
+
+class Frontier:
+    """Conjunto de URLs ya vistas, opcionalmente persistido en ``path`` (una clave por línea)"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.seen = set()
+        self.stats = {'added': 0, 'duplicates': 0}
+        self._lock = threading.Lock()
+        self._file = None
+
+        if path:
+            if os.path.exists(path):
+                with open(path, encoding='utf-8') as file:
+                    self.seen.update(line.rstrip('\n') for line in file if line.strip())
+            folder = os.path.dirname(path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            self._file = open(path, 'a', encoding='utf-8')
+
+    def add(self, url):
+        """Registra ``url``; devuelve True si es nueva y False si ya se había visto"""
+        key = canonical_url(url)
+        with self._lock:
+            if key in self.seen:
+                self.stats['duplicates'] += 1
+                return False
+            self.seen.add(key)
+            self.stats['added'] += 1
+        return True
+
+    def complete(self, url):
+        """Marca ``url`` como terminada: con ``path`` queda vista también en las corridas siguientes"""
+        key = canonical_url(url)
+        with self._lock:
+            self.seen.add(key)
+            if self._file:
+                self._file.write(key + '\n')
+                self._file.flush()
+
+    def filter(self, urls):
+        """Las URLs nuevas de ``urls``, en el mismo orden (acepta cualquier iterable)"""
+        for url in urls:
+            if self.add(url):
+                yield url
+
+    def __contains__(self, url):
+        return canonical_url(url) in self.seen
+
+    def __len__(self):
+        return len(self.seen)
+
+    @property
+    def saved(self):
+        """Descargas evitadas por deduplicación"""
+        return self.stats['duplicates']
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
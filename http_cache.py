@@ -0,0 +1,204 @@
+"""Caché en disco de respuestas HTTP para no volver a descargar páginas sin cambios.
+
+Las páginas se guardan comprimidas con zlib en un archivo SQLite, con la URL
+normalizada como clave. Cada entrada vence a las ``ttl`` segundas y, cuando el
+tamaño total pasa de ``max_bytes``, se descartan las menos usadas (LRU).
+
+Junto al cuerpo se guardan los validadores (ETag / Last-Modified) para poder
+revalidar con un GET condicional, y el registro ya extraído de la página para
+reutilizarlo sin volver a parsear cuando el servidor responde 304.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+DEFAULT_CACHE_PATH = os.path.join('.bsz_cache', 'http_cache.sqlite')
+DEFAULT_TTL = 20 * 60 * 60
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def normalize_url(url):
+    """Normaliza una URL para usarla como clave (esquema/host en minúsculas, sin fragmento ni '/' final)"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+
+    port = parts.port
+    if port and not ((scheme == 'http' and port == 80) or (scheme == 'https' and port == 443)):
+        host = f"{host}:{port}"
+
+    path = parts.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+class ResponseCache:
+    """Caché persistente de cuerpos HTTP con vencimiento y tope de tamaño"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                encoding TEXT,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+
+        # Cachés creadas antes de guardar validadores
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(responses)")}
+        for column in ('etag', 'last_modified'):
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE responses ADD COLUMN {column} TEXT")
+
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS records (
+                key TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                record TEXT NOT NULL,
+                PRIMARY KEY (key, kind)
+            )
+        """)
+        self._db.commit()
+
+        self.total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, url):
+        """Devuelve ``(body, encoding)`` si hay una copia vigente, o None"""
+        key = normalize_url(url)
+        now = time.time()
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, encoding, fetched_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or now - row[2] > self.ttl:
+                return None
+
+            self._db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.stats['hits'] += 1
+
+        return zlib.decompress(row[0]), row[1] or None
+
+    def get_validators(self, url):
+        """Devuelve ``(etag, last_modified)`` de una copia vencida, o None si no hay con qué revalidar"""
+        key = normalize_url(url)
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None or not (row[0] or row[1]):
+            return None
+        return row[0], row[1]
+
+    def revalidate(self, url):
+        """Marca la copia guardada como vigente tras un 304 y devuelve ``(body, encoding)``"""
+        key = normalize_url(url)
+        now = time.time()
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, encoding FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._db.execute(
+                "UPDATE responses SET fetched_at = ?, last_access = ? WHERE key = ?", (now, now, key)
+            )
+            self._db.commit()
+            self.stats['revalidated'] += 1
+
+        return zlib.decompress(row[0]), row[1] or None
+
+    def put(self, url, body, encoding=None, etag=None, last_modified=None):
+        """Guarda el cuerpo de una respuesta descargada y aplica el tope de tamaño"""
+        key = normalize_url(url)
+        compressed = zlib.compress(body)
+        now = time.time()
+
+        with self._lock:
+            old = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            if old:
+                self.total_bytes -= old[0]
+
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, body, size, encoding, fetched_at, last_access, etag, last_modified) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, compressed, len(compressed), encoding, now, now, etag, last_modified)
+            )
+            # El contenido cambió: los registros extraídos antes ya no sirven
+            self._db.execute("DELETE FROM records WHERE key = ?", (key,))
+            self.total_bytes += len(compressed)
+            self.stats['misses'] += 1
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        # Borrar las entradas menos usadas hasta quedar bajo el tope
+        while self.total_bytes > self.max_bytes:
+            row = self._db.execute(
+                "SELECT key, size FROM responses ORDER BY last_access ASC LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+            self._db.execute("DELETE FROM records WHERE key = ?", (row[0],))
+            self.total_bytes -= row[1]
+            self.stats['evictions'] += 1
+
+    def get_record(self, url, kind):
+        """Registro extraído previamente de la página (ej: kind='movie'), o None"""
+        key = normalize_url(url)
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT record FROM records WHERE key = ? AND kind = ?", (key, kind)
+            ).fetchone()
+
+        return json.loads(row[0]) if row else None
+
+    def put_record(self, url, kind, record):
+        """Guarda lo extraído de una página que está en la caché"""
+        key = normalize_url(url)
+
+        with self._lock:
+            if self._db.execute("SELECT 1 FROM responses WHERE key = ?", (key,)).fetchone() is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO records (key, kind, record) VALUES (?, ?, ?)",
+                (key, kind, json.dumps(record, ensure_ascii=False))
+            )
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
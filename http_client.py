@@ -0,0 +1,280 @@
+"""Capa compartida de peticiones HTTP para todos los extractores.
+
+Todas las descargas pasan por una única ``requests.Session`` con conexiones
+keep-alive, así cada página reutiliza la conexión TCP/TLS abierta en lugar de
+pagar un handshake nuevo. Los headers, el timeout y el tamaño de los pools se
+definen aquí una sola vez. Opcionalmente las respuestas se guardan en la
+caché en disco de ``http_cache``. Cada petición real espera su turno en el
+limitador por host de ``rate_limit``.
+"""
+import threading
+import time
+from collections import Counter
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import profiling
+from http_cache import ResponseCache, DEFAULT_CACHE_PATH, DEFAULT_TTL, DEFAULT_MAX_BYTES
+from rate_limit import RateLimiter, THROTTLE_STATUSES, parse_retry_after
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+}
+DEFAULT_TIMEOUT = 15
+
+# Cantidad de hosts distintos con pool propio y conexiones abiertas por host
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 20
+
+# Reintentos de una misma URL cuando el servidor responde 429/503
+MAX_RETRIES = 3
+
+_config = {
+    'headers': dict(DEFAULT_HEADERS),
+    'timeout': DEFAULT_TIMEOUT,
+    'pool_connections': POOL_CONNECTIONS,
+    'pool_maxsize': POOL_MAXSIZE,
+    'host_pool_sizes': {},
+}
+_session = None
+_cache = None
+_limiter = RateLimiter()
+_lock = threading.Lock()
+_stats = {'requests': 0}
+_url_counts = Counter()
+# Páginas entregadas desde la caché sin ir a la red (no cuentan en _url_counts)
+_cache_counts = Counter()
+
+
+def _build_session():
+    session = requests.Session()
+    session.headers.update(_config['headers'])
+
+    adapter = HTTPAdapter(
+        pool_connections=_config['pool_connections'],
+        pool_maxsize=_config['pool_maxsize'],
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    # Pools dedicados para hosts con mucho tráfico (ej: https://ww9.cuevana3.to)
+    for host_prefix, pool_size in _config['host_pool_sizes'].items():
+        session.mount(host_prefix, HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+
+    return session
+
+
+def configure(headers=None, timeout=None, pool_connections=None, pool_maxsize=None, host_pool_sizes=None):
+    """Cambia la configuración de la sesión compartida y la recrea"""
+    global _session
+
+    with _lock:
+        if headers is not None:
+            _config['headers'] = {**DEFAULT_HEADERS, **headers}
+        if timeout is not None:
+            _config['timeout'] = timeout
+        if pool_connections is not None:
+            _config['pool_connections'] = pool_connections
+        if pool_maxsize is not None:
+            _config['pool_maxsize'] = pool_maxsize
+        if host_pool_sizes is not None:
+            _config['host_pool_sizes'] = dict(host_pool_sizes)
+
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def get_session():
+    """Devuelve la sesión compartida, creándola la primera vez"""
+    global _session
+
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def close():
+    """Cierra todas las conexiones abiertas de la sesión compartida"""
+    global _session
+
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def enable_cache(path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+    """Activa la caché en disco para todas las descargas siguientes"""
+    global _cache
+
+    with _lock:
+        if _cache is not None:
+            _cache.close()
+        _cache = ResponseCache(path, ttl=ttl, max_bytes=max_bytes)
+    return _cache
+
+
+def disable_cache():
+    global _cache
+
+    with _lock:
+        if _cache is not None:
+            _cache.close()
+        _cache = None
+
+
+def get_cache_stats():
+    """Aciertos, descargas, revalidaciones y desalojos de la caché, o None si está desactivada"""
+    if _cache is None:
+        return None
+    with _lock:
+        return dict(_cache.stats)
+
+
+def configure_rate_limit(**settings):
+    """Reemplaza el limitador por host (rate, burst, min_rate, max_rate)"""
+    global _limiter
+
+    with _lock:
+        _limiter = RateLimiter(**settings)
+    return _limiter
+
+
+def get_limiter_stats():
+    """Esperas, segundos esperados, respuestas 429/503 y tasa actual por host"""
+    return _limiter.get_stats()
+
+
+def _cached_response(url, body, encoding, cache_status):
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = body
+    response.encoding = encoding
+    response.headers['X-Cache'] = cache_status
+    response.from_cache = True
+    return response
+
+
+def is_from_cache(response):
+    """True si la respuesta salió de la caché (vigente o revalidada con 304)"""
+    return getattr(response, 'from_cache', False)
+
+
+def get_record(url, kind):
+    """Registro ya extraído de una página en caché, o None"""
+    if _cache is None:
+        return None
+    return _cache.get_record(url, kind)
+
+
+def save_record(url, kind, record):
+    """Guarda lo extraído de una página para reutilizarlo si no cambia"""
+    if _cache is not None:
+        _cache.put_record(url, kind, record)
+
+
+def fetch(url, timeout=None, headers=None, **kwargs):
+    """Descarga una URL con la sesión compartida y lanza error si el status no es 2xx"""
+    return _fetch(url, timeout, headers, True, **kwargs)
+
+
+def _fetch(url, timeout, headers, conditional, **kwargs):
+    request_headers = headers
+    cache = _cache if not kwargs.get('stream') else None
+    if cache is not None and conditional:
+        with profiling.stage('http.cache'):
+            cached = cache.get(url)
+        if cached is not None:
+            with _lock:
+                _cache_counts[url] += 1
+            return _cached_response(url, *cached, 'HIT')
+
+        # Copia vencida con validadores: pedir solo si cambió
+        validators = cache.get_validators(url)
+        if validators:
+            etag, last_modified = validators
+            headers = dict(headers or {})
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+    session = get_session()
+    for attempt in range(MAX_RETRIES + 1):
+        with profiling.stage('http.rate_limit'):
+            _limiter.acquire(url)
+        start = time.monotonic()
+        response = session.get(
+            url,
+            headers=headers,
+            timeout=timeout if timeout is not None else _config['timeout'],
+            **kwargs
+        )
+        latency = time.monotonic() - start
+        _limiter.record(
+            url,
+            response.status_code,
+            latency,
+            parse_retry_after(response.headers.get('Retry-After')),
+        )
+        if profiling.is_enabled():
+            # elapsed: conexión (DNS/TCP/TLS) hasta recibir los headers; el resto es el cuerpo
+            headers_time = response.elapsed.total_seconds()
+            profiling.record('http.connect_headers', headers_time)
+            profiling.record('http.body', max(0.0, latency - headers_time))
+
+        with _lock:
+            _stats['requests'] += 1
+            _url_counts[url] += 1
+
+        # El limitador ya frenó el host; reintentar cuando vuelva a haber turno
+        if response.status_code not in THROTTLE_STATUSES or attempt == MAX_RETRIES:
+            break
+        response.close()
+
+    if response.status_code == 304:
+        cached = cache.revalidate(url) if cache is not None and conditional else None
+        if cached is not None:
+            return _cached_response(url, *cached, 'REVALIDATED')
+        response.close()
+        if not conditional:
+            raise requests.HTTPError(f"304 sin pedido condicional para: {url}", response=response)
+        # La copia se desalojó o venció entre el pedido condicional y la respuesta: pedir la página completa
+        return _fetch(url, timeout, request_headers, False, **kwargs)
+
+    response.raise_for_status()
+
+    if cache is not None:
+        with profiling.stage('http.cache'):
+            cache.put(
+                url,
+                response.content,
+                response.encoding,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'),
+            )
+
+    return response
+
+
+def get_stats():
+    """Devuelve una copia de los contadores de peticiones"""
+    with _lock:
+        return dict(_stats)
+
+
+def get_request_count(url):
+    """Cuántas veces se pidió una URL concreta a la red durante esta ejecución"""
+    with _lock:
+        return _url_counts[url]
+
+
+def get_fetch_count(url):
+    """Cuántas veces se pidió una URL durante esta ejecución, a la red o a la caché"""
+    with _lock:
+        return _url_counts[url] + _cache_counts[url]
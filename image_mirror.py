@@ -0,0 +1,180 @@
+"""Espejo local de los pósters de películas y series para el catálogo.
+
+Las imágenes se descargan en paralelo (``map_in_order`` con un máximo de
+descargas en vuelo) por la sesión compartida de ``http_client``, en streaming
+y sin pasar por la caché HTTP. Cada archivo se guarda con el sha256 de su
+contenido como nombre, así la misma imagen servida desde varias URLs queda
+una sola vez en disco. Si Pillow está instalado se genera además una
+miniatura JPEG compacta, que es la que usa el catálogo.
+
+Cada imagen terminada se anota en un journal que nunca se borra
+(``<carpeta>/manifest.journal``): una corrida interrumpida o la siguiente
+actualización solo descargan lo que falta.
+"""
+import asyncio
+import hashlib
+import os
+import tempfile
+import threading
+from urllib.parse import urlsplit
+
+from async_crawl import map_in_order
+from crawl_journal import CrawlJournal
+from http_client import fetch
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+DEFAULT_FOLDER = 'imagenes'
+DEFAULT_WORKERS = 8
+CHUNK_SIZE = 64 * 1024
+THUMB_SIZE = (300, 450)
+THUMB_QUALITY = 80
+
+EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/webp': '.webp',
+    'image/gif': '.gif',
+    'image/avif': '.avif',
+}
+
+
+def image_extension(url, content_type):
+    extension = EXTENSIONS.get((content_type or '').split(';')[0].strip().lower())
+    if extension:
+        return extension
+    extension = os.path.splitext(urlsplit(url).path)[1].lower()
+    return extension if 1 < len(extension) <= 5 else '.img'
+
+
+class ImageMirror:
+    """Imágenes descargadas en ``folder`` (originales/ y miniaturas/), deduplicadas por sha256"""
+
+    def __init__(self, folder=DEFAULT_FOLDER, workers=DEFAULT_WORKERS, thumbnails=True, thumb_size=THUMB_SIZE):
+        self.folder = folder
+        self.workers = workers
+        self.thumbnails = thumbnails and Image is not None
+        self.thumb_size = thumb_size
+        self.stats = {'downloaded': 0, 'duplicates': 0, 'reused': 0, 'failed': 0, 'bytes': 0}
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.join(folder, 'originales'), exist_ok=True)
+        os.makedirs(os.path.join(folder, 'miniaturas'), exist_ok=True)
+        self.journal = CrawlJournal(os.path.join(folder, 'manifest.journal'), 'image_mirror')
+
+    def local_path(self, url):
+        """Ruta (relativa a ``folder``) de la miniatura o, si no hay, del original; None si falta"""
+        entry = self.journal.get('image', url)
+        if not entry:
+            return None
+        for name in (entry.get('thumb'), entry['file']):
+            if name and os.path.exists(os.path.join(self.folder, name)):
+                return name
+        return None
+
+    def links(self, urls, relative_to='.'):
+        """``{url: ruta local}`` de las URLs ya descargadas, relativas a la carpeta del HTML"""
+        links = {}
+        for url in urls:
+            name = self.local_path(url)
+            if name:
+                path = os.path.relpath(os.path.join(self.folder, name), relative_to or '.')
+                links[url] = path.replace(os.sep, '/')
+        return links
+
+    def _thumbnail(self, path, digest):
+        name = f"miniaturas/{digest}.jpg"
+        thumb_path = os.path.join(self.folder, name)
+        if not os.path.exists(thumb_path):
+            # Dos URLs con la misma imagen pueden llegar a la vez: cada una usa su propio temporal
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(thumb_path), suffix='.part')
+            try:
+                with os.fdopen(fd, 'wb') as file, Image.open(path) as image:
+                    image.thumbnail(self.thumb_size)
+                    image.convert('RGB').save(file, 'JPEG', quality=THUMB_QUALITY, optimize=True)
+                os.replace(temp_path, thumb_path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+        return name
+
+    def _download(self, url):
+        """Descarga una imagen y la guarda por su hash; devuelve la entrada del manifiesto o la excepción"""
+        temp_path = None
+        try:
+            response = fetch(url, stream=True)
+            digest = hashlib.sha256()
+            size = 0
+
+            fd, temp_path = tempfile.mkstemp(dir=self.folder, suffix='.part')
+            with os.fdopen(fd, 'wb') as file:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    digest.update(chunk)
+                    file.write(chunk)
+                    size += len(chunk)
+            response.close()
+
+            digest = digest.hexdigest()
+            name = f"originales/{digest}{image_extension(url, response.headers.get('Content-Type'))}"
+            path = os.path.join(self.folder, name)
+            with self._lock:
+                duplicate = os.path.exists(path)
+                if duplicate:
+                    os.remove(temp_path)
+                else:
+                    os.replace(temp_path, path)
+            temp_path = None
+
+            thumb = None
+            if self.thumbnails:
+                try:
+                    thumb = self._thumbnail(path, digest)
+                except Exception as e:
+                    print(f"  Sin miniatura para {url}: {e}")
+
+            return {'sha256': digest, 'file': name, 'thumb': thumb, 'bytes': size, 'duplicate': duplicate}
+
+        except Exception as e:
+            return e
+        finally:
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    async def _mirror(self, urls):
+        async for url, entry in map_in_order(self._download, urls, self.workers):
+            if isinstance(entry, Exception):
+                self.stats['failed'] += 1
+                print(f"  ✗ {url}: {entry}")
+                continue
+
+            self.stats['duplicates' if entry.pop('duplicate') else 'downloaded'] += 1
+            self.stats['bytes'] += entry['bytes']
+            self.journal.put('image', url, entry)
+
+    def mirror(self, urls):
+        """Descarga las imágenes de ``urls`` que todavía no están en el espejo"""
+        pending = []
+        for url in dict.fromkeys(urls):
+            if not (url and url.startswith(('http://', 'https://'))):
+                continue
+            if self.local_path(url):
+                self.stats['reused'] += 1
+            else:
+                pending.append(url)
+
+        if pending:
+            print(f"🖼️ Descargando {len(pending)} imágenes ({self.workers} en paralelo)...")
+            asyncio.run(self._mirror(pending))
+        return self.stats
+
+    def close(self):
+        self.journal.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
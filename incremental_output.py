@@ -0,0 +1,169 @@
+"""Regeneración incremental de archivos de salida formados por partes.
+
+``code.txt`` es una secuencia de bloques ``movies-grid`` y
+``series_catalog.html`` una secuencia de secciones y ``series-card``. Junto a
+cada archivo se guarda un manifiesto (``<archivo>.manifest``) con el hash y el
+tamaño de cada parte. Al regenerar:
+
+- una parte igual a la del manifiesto no se escribe;
+- una parte distinta del mismo tamaño se sobreescribe en su lugar;
+- recién cuando cambia un tamaño (o aparecen partes nuevas) se reescribe el
+  archivo desde ese punto.
+
+Ese último caso es el límite del esquema: las partes van una tras otra, así
+que si una tarjeta del principio crece o se achica todo lo que sigue se
+reescribe (aunque no haya cambiado), igual que una corrida completa. Rinde
+cuando los cambios son de contenido o al final del archivo.
+
+Las partes caras de armar (las tarjetas del catálogo) pueden llevar una
+``key``, el hash de los datos con que se arman (``record_key``): si en esa
+posición el manifiesto tiene la misma ``key``, ``skip`` la da por escrita sin
+armarla ni calcular su hash. Los bloques de ``code.txt`` se comparan por su
+texto: armarlos cuesta menos que calcular el hash de sus 15 películas.
+
+Si nada cambió el archivo no se toca, y agregar películas al final solo
+escribe los bloques nuevos. El manifiesto se borra apenas se modifica el
+archivo y se vuelve a guardar al cerrar, así una corrida interrumpida nunca
+deja un manifiesto que no corresponde al archivo.
+"""
+import contextlib
+import filecmp
+import hashlib
+import json
+import os
+
+from profiling import timed
+from records import to_json
+
+
+def manifest_path(filename):
+    return f"{filename}.manifest"
+
+
+def part_hash(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+def record_key(record):
+    """Hash de los datos con que se arma una parte (dicts, registros, listas y textos)"""
+    return part_hash(json.dumps(record, sort_keys=True, ensure_ascii=False, default=to_json).encode('utf-8'))
+
+
+def write_if_changed(filename, text):
+    """Escribe ``text`` en ``filename`` solo si el contenido es distinto; devuelve True si escribió"""
+    data = text.encode('utf-8')
+    try:
+        with open(filename, 'rb') as file:
+            if file.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+
+    with open(filename, 'wb') as file:
+        file.write(data)
+    return True
+
+
+def replace_if_changed(temp_path, filename):
+    """Reemplaza ``filename`` por ``temp_path`` solo si difieren; devuelve True si lo reemplazó"""
+    if os.path.exists(filename) and filecmp.cmp(temp_path, filename, shallow=False):
+        os.remove(temp_path)
+        return False
+    os.replace(temp_path, filename)
+    return True
+
+
+class IncrementalFile:
+    """Archivo escrito parte por parte, reescribiendo solo las partes que cambiaron"""
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.offset = 0
+        self.parts = []
+        self.stats = {'unchanged': 0, 'written': 0}
+        self._old = self._load_manifest()
+        self._diverged = False
+        self._file = None
+
+    def _load_manifest(self):
+        try:
+            with open(manifest_path(self.filename), encoding='utf-8') as file:
+                parts = json.load(file)['parts']
+        except (OSError, ValueError, KeyError):
+            return []
+
+        # Solo sirve si el archivo sigue siendo exactamente el que describe
+        if not os.path.exists(self.filename) or os.path.getsize(self.filename) != sum(part[1] for part in parts):
+            return []
+        return parts
+
+    def _open(self):
+        if self._file is None:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(manifest_path(self.filename))
+            self._file = open(self.filename, 'r+b' if os.path.exists(self.filename) else 'w+b')
+        return self._file
+
+    def _old_entry(self, index):
+        return self._old[index] if not self._diverged and index < len(self._old) else None
+
+    def skip(self, key):
+        """Da por escrita la parte siguiente si en el manifiesto tiene la misma ``key``; devuelve True si lo hizo"""
+        old = self._old_entry(len(self.parts))
+        if old is None or len(old) < 3 or old[2] != key:
+            return False
+        self.stats['unchanged'] += 1
+        self.parts.append(old)
+        self.offset += old[1]
+        return True
+
+    def keep(self, text):
+        """Registra una parte que ya está escrita en la posición actual (corrida reanudada)"""
+        data = text.encode('utf-8')
+        self.parts.append([part_hash(data), len(data)])
+        self.offset += len(data)
+
+    @timed('write.part')
+    def write(self, text, key=None):
+        """Agrega la siguiente parte; solo toca el disco si es distinta de la anterior en esa posición
+
+        ``key`` (ver ``skip``) queda en el manifiesto para la próxima corrida.
+        """
+        data = text.encode('utf-8')
+        entry = [part_hash(data), len(data)]
+        if key is not None:
+            entry.append(key)
+        old = self._old_entry(len(self.parts))
+
+        if old is not None and old[:2] == entry[:2]:
+            self.stats['unchanged'] += 1
+        else:
+            file = self._open()
+            if (old is None or old[1] != len(data)) and not self._diverged:
+                # Cambió el tamaño: el resto del archivo se reescribe desde aquí
+                file.truncate(self.offset)
+                self._diverged = True
+            file.seek(self.offset)
+            file.write(data)
+            # El journal de V4 registra ``offset`` como tamaño ya guardado
+            file.flush()
+            self.stats['written'] += 1
+
+        self.parts.append(entry)
+        self.offset += len(data)
+
+    def close(self):
+        """Descarta lo que sobre del archivo anterior y guarda el manifiesto nuevo"""
+        if not os.path.exists(self.filename) or os.path.getsize(self.filename) != self.offset:
+            self._open().truncate(self.offset)
+        if self._file is None and self.parts == self._old:
+            # Nada cambió: ni el archivo ni el manifiesto se tocan
+            return
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        temp_path = manifest_path(self.filename) + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({'parts': self.parts}, file)
+        os.replace(temp_path, manifest_path(self.filename))
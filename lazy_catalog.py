@@ -0,0 +1,319 @@
+"""Catálogo de series liviano para catálogos muy grandes (modo ``lazy``).
+
+En lugar de escribir cada ``series-card`` (con sus episodios y fuentes de
+video) dentro de ``series_catalog.html``, la página queda como un esqueleto
+con las secciones, los años y una grilla vacía por año. Los datos van en
+archivos por bloques dentro de ``<catalogo>_datos/``:
+
+- ``tarjetas-N.js``: lo que muestra la tarjeta de ``chunk_size`` series;
+- ``episodios-N.js``: sus temporadas y episodios, recién pedidos al tocar
+  "Mostrar Episodios".
+
+Cada archivo es JSON envuelto en una llamada ``catalogChunk(...)``: se carga
+con ``<script>`` y así funciona abriendo el HTML directamente desde el disco,
+donde el navegador no permite ``fetch`` de archivos locales. Las tarjetas se
+arman a medida que la grilla se acerca a la pantalla y los pósters usan
+``loading="lazy"``. Los bloques se escriben solo si cambiaron.
+"""
+import json
+import os
+import re
+
+from incremental_output import write_if_changed
+
+CHUNK_SIZE = 200
+
+# Tarjetas que se arman de una vez cuando una grilla se acerca a la pantalla
+RENDER_BATCH = 40
+
+# Mismos topes que el catálogo completo
+MAX_EPISODES_PER_SEASON = 3
+MAX_VIDEO_SOURCES = 3
+
+CHUNK_FILE = re.compile(r'^(tarjetas|episodios)-(\d+)\.js$')
+
+
+def data_folder(html_filename):
+    """Carpeta de los bloques de datos que acompaña al catálogo"""
+    return f"{os.path.splitext(html_filename)[0]}_datos"
+
+
+def has_video_sources(series):
+    return any('video_sources' in episode
+               for episodes in series.get('episodes', {}).values() for episode in episodes)
+
+
+def card_record(series, images=None):
+    """Datos de la tarjeta, ya recortados como los muestra el catálogo completo"""
+    image_url = series.get('image_url', '')
+    genres = series.get('genre') or []
+    card = {
+        'title': series['title'],
+        'image': (images or {}).get(image_url, image_url),
+        'year': series.get('year', 'N/A'),
+        'rating': series.get('rating', 'N/A'),
+        'genre': genres[:3],
+        'more_genres': max(0, len(genres) - 3),
+        'description': (series.get('description') or '')[:200],
+    }
+    if series.get('episodes'):
+        card['toggle'] = "🎬 Mostrar Episodios y Videos" if has_video_sources(series) else "📺 Mostrar Episodios"
+    return card
+
+
+def episodes_record(series):
+    """Temporadas con sus primeros episodios y fuentes, o None si la serie no tiene episodios"""
+    if not series.get('episodes'):
+        return None
+
+    seasons = []
+    for season_id, episodes in series['episodes'].items():
+        shown = []
+        for episode in episodes[:MAX_EPISODES_PER_SEASON]:
+            title = episode['title']
+            sources = episode.get('video_sources') or []
+            shown.append({
+                'title': title[:40] + ('...' if len(title) > 40 else ''),
+                'number': episode['episode_number'],
+                'url': episode['url'],
+                'sources': [{'service': source['service'], 'url': source['url']}
+                            for source in sources[:MAX_VIDEO_SOURCES]],
+                'more_sources': max(0, len(sources) - MAX_VIDEO_SOURCES),
+            })
+        seasons.append({
+            'season': season_id,
+            'episodes': shown,
+            'more': max(0, len(episodes) - MAX_EPISODES_PER_SEASON),
+        })
+    return seasons
+
+
+class LazyCatalogData:
+    """Bloques de tarjetas y episodios del catálogo, numerados en el orden del catálogo"""
+
+    def __init__(self, html_filename, chunk_size=CHUNK_SIZE, images=None):
+        self.folder = data_folder(html_filename)
+        self.chunk_size = chunk_size
+        self.images = images
+        self.count = 0
+        self.stats = {'unchanged': 0, 'written': 0}
+        self._cards = []
+        self._episodes = []
+        os.makedirs(self.folder, exist_ok=True)
+
+    def add(self, series_list):
+        """Agrega las series y devuelve la posición de la primera (para ``grid``)"""
+        start = self.count
+        for series in series_list:
+            self._cards.append(card_record(series, self.images))
+            self._episodes.append(episodes_record(series))
+            self.count += 1
+            if len(self._cards) == self.chunk_size:
+                self._save_chunk()
+        return start
+
+    def _write(self, kind, number, items):
+        data = json.dumps(items, ensure_ascii=False, separators=(',', ':'))
+        text = f'catalogChunk("{kind}", {number}, {data});\n'
+        changed = write_if_changed(os.path.join(self.folder, f"{kind}-{number}.js"), text)
+        self.stats['written' if changed else 'unchanged'] += 1
+
+    def _save_chunk(self):
+        number = (self.count - 1) // self.chunk_size
+        self._write('tarjetas', number, self._cards)
+        self._write('episodios', number, self._episodes)
+        self._cards = []
+        self._episodes = []
+
+    def close(self):
+        """Guarda el último bloque y borra los que sobran de un catálogo anterior más grande"""
+        if self._cards:
+            self._save_chunk()
+
+        chunk_count = -(-self.count // self.chunk_size)
+        for name in os.listdir(self.folder):
+            match = CHUNK_FILE.match(name)
+            if match and int(match.group(2)) >= chunk_count:
+                os.remove(os.path.join(self.folder, name))
+
+    def grid(self, start, count):
+        """Grilla vacía (y su marcador de scroll) que se llena con las series ``start..start+count``"""
+        return (f'<div class="series-grid" data-start="{start}" data-count="{count}"></div>\n'
+                f'<div class="lazy-sentinel"></div>\n')
+
+    def script(self):
+        """Script del esqueleto: carga de bloques y armado de tarjetas y episodios"""
+        folder = os.path.basename(self.folder)
+        return LAZY_SCRIPT.replace('__CATALOG__', json.dumps({
+            'folder': folder,
+            'chunkSize': self.chunk_size,
+            'batch': RENDER_BATCH,
+        }))
+
+
+# Se agrega al pie del catálogo, después de ``toggleEpisodes``
+LAZY_SCRIPT = r"""
+    <style>
+        .lazy-sentinel {
+            height: 1px;
+        }
+    </style>
+    <script>
+        const CATALOG = __CATALOG__;
+        const chunks = {};
+        const pendingChunks = {};
+        const PLACEHOLDER = 'https://via.placeholder.com/350x450/333/fff?text=No+Image';
+
+        function catalogChunk(kind, number, items) {
+            const key = kind + '-' + number;
+            chunks[key] = items;
+            (pendingChunks[key] || []).forEach(callbacks => callbacks[0](items));
+            delete pendingChunks[key];
+        }
+
+        function loadChunk(kind, number) {
+            const key = kind + '-' + number;
+            if (chunks[key]) {
+                return Promise.resolve(chunks[key]);
+            }
+            return new Promise((resolve, reject) => {
+                if (!pendingChunks[key]) {
+                    pendingChunks[key] = [];
+                    const script = document.createElement('script');
+                    script.src = CATALOG.folder + '/' + key + '.js';
+                    script.onerror = () => {
+                        (pendingChunks[key] || []).forEach(callbacks => callbacks[1](new Error(script.src)));
+                        delete pendingChunks[key];
+                        script.remove();
+                    };
+                    document.head.appendChild(script);
+                }
+                pendingChunks[key].push([resolve, reject]);
+            });
+        }
+
+        async function getItem(kind, index) {
+            const items = await loadChunk(kind, Math.floor(index / CATALOG.chunkSize));
+            return items[index % CATALOG.chunkSize];
+        }
+
+        function esc(text) {
+            return String(text ?? '').replace(/[&<>"']/g, c => (
+                {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c]
+            ));
+        }
+
+        function seriesCard(card, index) {
+            let html = '<div class="series-card">\n';
+            html += `<img src="${esc(card.image)}" alt="${esc(card.title)}" class="series-img" loading="lazy" onerror="this.onerror=null; this.src='${PLACEHOLDER}'">\n`;
+            html += '<div class="series-content">\n';
+            html += `<h3 class="series-title">${esc(card.title)}</h3>\n`;
+            html += `<div class="series-meta">📅 ${esc(card.year)} | ⭐ ${esc(card.rating)}</div>\n`;
+            if (card.genre.length) {
+                html += '<div class="series-genres">\n';
+                card.genre.forEach(genre => { html += `<span class="genre-tag">${esc(genre)}</span>\n`; });
+                if (card.more_genres) {
+                    html += `<span class="genre-tag">+${card.more_genres}</span>\n`;
+                }
+                html += '</div>\n';
+            }
+            if (card.description) {
+                html += `<div class="series-desc">${esc(card.description)}...</div>\n`;
+            }
+            if (card.toggle) {
+                html += `<button class="episodes-toggle" onclick="showEpisodes(this, ${index})">\n`;
+                html += `<span>${esc(card.toggle)}</span>\n<span>▼</span>\n</button>\n`;
+                html += '<div class="episodes-container"></div>\n';
+            }
+            html += '</div>\n</div>\n';
+            return html;
+        }
+
+        function episodesHtml(seasons) {
+            let html = '';
+            seasons.forEach(season => {
+                html += `<div class="season">\n<h4 class="season-title">${esc(season.season)}</h4>\n`;
+                season.episodes.forEach(episode => {
+                    html += '<div class="episode">\n<div class="episode-header">\n';
+                    html += `<h5 class="episode-title">${esc(episode.title)}</h5>\n`;
+                    html += `<span class="episode-number">${esc(episode.number)}</span>\n</div>\n`;
+                    html += `<div class="episode-url">🔗 <a href="${esc(episode.url)}" target="_blank" style="color: #90e0ef;">Ver episodio</a></div>\n`;
+                    if (episode.sources.length) {
+                        html += '<div class="video-sources">\n<h6 class="sources-title">🎬 Fuentes de video:</h6>\n';
+                        episode.sources.forEach(source => {
+                            html += '<div class="source-item">\n';
+                            html += `<span class="source-service">${esc(source.service)}</span>\n`;
+                            html += `<a href="${esc(source.url)}" class="source-url" target="_blank" title="${esc(source.url)}">Ver video</a>\n`;
+                            html += '</div>\n';
+                        });
+                        if (episode.more_sources) {
+                            html += `<div style="color: #aaa; font-size: 12px; text-align: center;">+ ${episode.more_sources} fuentes más</div>\n`;
+                        }
+                        html += '</div>\n';
+                    }
+                    html += '</div>\n';
+                });
+                if (season.more) {
+                    html += `<div style="color: #aaa; text-align: center; padding: 10px;">... y ${season.more} episodios más</div>\n`;
+                }
+                html += '</div>\n';
+            });
+            return html;
+        }
+
+        async function showEpisodes(button, index) {
+            const container = button.nextElementSibling;
+            if (!container.dataset.loaded) {
+                container.innerHTML = episodesHtml(await getItem('episodios', index) || []);
+                container.dataset.loaded = '1';
+            }
+            toggleEpisodes(button);
+        }
+
+        function nearViewport(element) {
+            return element.getBoundingClientRect().top < window.innerHeight * 2;
+        }
+
+        async function renderMore(sentinel) {
+            const grid = sentinel.previousElementSibling;
+            if (grid.dataset.busy || !nearViewport(sentinel)) {
+                return;
+            }
+            grid.dataset.busy = '1';
+
+            const start = Number(grid.dataset.start);
+            const count = Number(grid.dataset.count);
+            const rendered = Number(grid.dataset.rendered || 0);
+            const end = Math.min(count, rendered + CATALOG.batch);
+            let html = '';
+            try {
+                for (let index = start + rendered; index < start + end; index++) {
+                    html += seriesCard(await getItem('tarjetas', index), index);
+                }
+            } catch (error) {
+                console.error('No se pudo cargar el bloque del catálogo', error);
+                delete grid.dataset.busy;
+                return;
+            }
+            grid.insertAdjacentHTML('beforeend', html);
+            grid.dataset.rendered = end;
+            delete grid.dataset.busy;
+
+            if (end >= count) {
+                observer.unobserve(sentinel);
+            } else {
+                renderMore(sentinel);
+            }
+        }
+
+        const observer = new IntersectionObserver(entries => {
+            entries.forEach(entry => {
+                if (entry.isIntersecting) {
+                    renderMore(entry.target);
+                }
+            });
+        }, {rootMargin: '100% 0px'});
+
+        document.querySelectorAll('.lazy-sentinel').forEach(sentinel => observer.observe(sentinel));
+    </script>
+"""
@@ -0,0 +1,137 @@
+"""Agrupación de bloques de película en divs ``movies-grid`` de 15 en 15."""
+import os
+import re
+
+from incremental_output import IncrementalFile
+from profiling import timed
+
+MOVIES_PER_BLOCK = 15
+
+BLOCK_START = re.compile(rb'<div id="linea-(\d+)" class="movies-grid">\n')
+BLOCK_END = '\n</div>\n'
+MOVIE_MARK = '<div class="movie"'
+
+
+def last_block(filename):
+    """``(número, posición en bytes, texto)`` del último bloque de ``filename``, o None"""
+    if not os.path.exists(filename):
+        return None
+    with open(filename, 'rb') as file:
+        data = file.read()
+    match = None
+    for match in BLOCK_START.finditer(data):
+        pass
+    if match is None:
+        return None
+    return int(match.group(1)), match.start(), data[match.start():].decode('utf-8')
+
+
+@timed('write.block')
+def save_html_block(html_block, filename):
+    with open(filename, 'a', encoding='utf-8') as file:
+        file.write(html_block)
+
+
+class MovieGridWriter:
+    """Acumula bloques de película y escribe un ``<div id="linea-N">`` cada 15
+
+    ``written`` es la cantidad de películas que ya están en el archivo desde una
+    corrida anterior (múltiplo de ``per_block``): las primeras ``written``
+    llamadas a ``add`` solo avanzan la numeración. ``on_flush(writer)`` se llama
+    cada vez que se guarda un bloque completo.
+
+    Con ``append`` se sigue la numeración de los bloques que ya tiene el
+    archivo; si el último quedó incompleto se reabre y se completa hasta 15
+    (el archivo se recorta recién al guardarlo de nuevo).
+
+    Con ``incremental`` el archivo no se vacía de antemano: cada bloque se
+    compara con el manifiesto de la corrida anterior y solo se escriben los
+    que cambiaron (ver ``incremental_output``).
+    """
+
+    def __init__(self, filename, per_block=MOVIES_PER_BLOCK, written=0, on_flush=None, incremental=False,
+                 append=False):
+        self.filename = filename
+        self.per_block = per_block
+        self.written = written
+        self.on_flush = on_flush
+        self.output = IncrementalFile(filename) if incremental else None
+        self.movie_count = 0
+        self.block_number = 1
+        self.block_movies = 0
+        self.html_block = self._open_block()
+        self._truncate_at = None
+        if append:
+            self._continue_file()
+
+    def _continue_file(self):
+        last = last_block(self.filename)
+        if last is None:
+            return
+        number, offset, text = last
+        movies = text.count(MOVIE_MARK)
+        if movies >= self.per_block or not text.endswith(BLOCK_END):
+            self.block_number = number + 1
+            self.html_block = self._open_block()
+        else:
+            self.block_number = number
+            self.block_movies = movies
+            self.html_block = text[:-len(BLOCK_END)]
+            self._truncate_at = offset
+
+    def _open_block(self):
+        return f'<div id="linea-{self.block_number}" class="movies-grid">\n'
+
+    def _save_block(self):
+        self.html_block += BLOCK_END
+        if self.output:
+            self.output.write(self.html_block)
+        else:
+            if self._truncate_at is not None:
+                # El bloque incompleto reabierto se reemplaza por su versión nueva
+                os.truncate(self.filename, self._truncate_at)
+                self._truncate_at = None
+            save_html_block(self.html_block, self.filename)
+
+    @property
+    def size(self):
+        """Bytes de salida ya guardados por este writer (y los de la corrida anterior)"""
+        return self.output.offset if self.output else os.path.getsize(self.filename)
+
+    def add(self, movie_block):
+        """Agrega el HTML de una película; devuelve su número dentro de la salida"""
+        self.movie_count += 1
+        self.block_movies += 1
+
+        if self.movie_count <= self.written:
+            # Ya guardada en una corrida anterior; el manifiesto necesita igual el bloque
+            if self.output:
+                self.html_block += movie_block
+            if self.block_movies == self.per_block:
+                if self.output:
+                    self.output.keep(self.html_block + BLOCK_END)
+                self._next_block()
+            return self.movie_count
+
+        self.html_block += movie_block
+
+        if self.block_movies == self.per_block:
+            self._save_block()
+            self._next_block()
+            if self.on_flush:
+                self.on_flush(self)
+
+        return self.movie_count
+
+    def _next_block(self):
+        self.block_number += 1
+        self.block_movies = 0
+        self.html_block = self._open_block()
+
+    def close(self):
+        """Cierra y guarda el último bloque si quedó incompleto"""
+        if self.movie_count > self.written and self.block_movies:
+            self._save_block()
+            self.html_block = self._open_block()
+        if self.output:
+            self.output.close()
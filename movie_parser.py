@@ -0,0 +1,193 @@
+"""Backends de parseo para las páginas de película.
+
+De cada página solo hacen falta un ``img``, un ``iframe`` y el ``h1``, así que
+no vale la pena construir el árbol completo de BeautifulSoup:
+
+- ``full``: árbol completo con html.parser (el comportamiento original).
+- ``strainer``: html.parser con un SoupStrainer que solo conserva img/iframe/h1.
+- ``lxml``: XPath sobre lxml.html, si lxml está instalado.
+
+El backend se elige con ``set_parser_backend`` o la variable de entorno
+``BSZ_PARSER``; por defecto se usa lxml si está disponible y si no el strainer.
+"""
+import os
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:
+    lxml = None
+
+BACKENDS = ('full', 'strainer', 'lxml')
+
+_MOVIE_TAGS = SoupStrainer(['img', 'iframe', 'h1'])
+# get_text de BeautifulSoup no incluye el código de estos elementos
+_NON_TEXT_TAGS = ('script', 'style', 'template')
+_backend = os.environ.get('BSZ_PARSER', 'auto')
+
+
+def set_parser_backend(name):
+    """Elige el backend ('full', 'strainer', 'lxml' o 'auto')"""
+    global _backend
+
+    if name != 'auto' and name not in BACKENDS:
+        raise ValueError(f"Backend de parseo desconocido: {name}")
+    if name == 'lxml' and lxml is None:
+        raise ValueError("El backend 'lxml' requiere: pip install lxml")
+    _backend = name
+
+
+def get_parser_backend():
+    if _backend == 'auto':
+        return 'lxml' if lxml is not None else 'strainer'
+    return _backend
+
+
+def title_from_url(page_url):
+    return page_url.strip('/').split('/')[-1].replace('-', ' ').title()
+
+
+# ---------- BeautifulSoup (full / strainer) ----------
+
+def _make_soup(html, backend):
+    if backend == 'strainer':
+        return BeautifulSoup(html, 'html.parser', parse_only=_MOVIE_TAGS)
+    return BeautifulSoup(html, 'html.parser')
+
+
+def _soup_movie_page(soup, page_url):
+    # Buscar imagen
+    img_tag = soup.find('img', class_='lazy')
+    if not img_tag:
+        img_tag = soup.find('img', {'loading': 'lazy'})
+    if not img_tag:
+        img_tag = soup.find('img', {'data-src': True})
+
+    img_url = urljoin(page_url, img_tag.get('data-src')) if img_tag and img_tag.get('data-src') else None
+    if not img_url and img_tag:
+        img_url = urljoin(page_url, img_tag.get('src')) if img_tag.get('src') else None
+
+    # Buscar iframe
+    iframe_tag = soup.find('iframe', class_='no-you')
+    if not iframe_tag:
+        iframe_tag = soup.find('iframe', {'data-src': True})
+
+    iframe_url = iframe_tag.get('data-src') if iframe_tag and iframe_tag.get('data-src') else None
+    if not iframe_url and iframe_tag:
+        iframe_url = iframe_tag.get('src') if iframe_tag.get('src') else None
+
+    # Extraer título
+    title = None
+    title_tag = soup.find('h1')
+    if title_tag:
+        title = title_tag.get_text(strip=True)
+
+    if not title:
+        title = title_from_url(page_url)
+
+    return img_url, iframe_url, title
+
+
+def _soup_movie_page_basic(soup, page_url):
+    img_tag = soup.find('img', class_='lazy')
+    img_url = urljoin(page_url, img_tag.get('data-src')) if img_tag else None
+
+    iframe_tag = soup.find('iframe', class_='no-you')
+    iframe_url = iframe_tag.get('data-src') if iframe_tag else None
+
+    return img_url, iframe_url, title_from_url(page_url)
+
+
+# ---------- lxml ----------
+
+def _has_class(name, css_class):
+    return f"//{name}[contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')]"
+
+
+def _first(doc, xpath):
+    found = doc.xpath(xpath)
+    return found[0] if found else None
+
+
+def _lxml_text(element):
+    """Como ``get_text(strip=True)``: textos recortados, sin los de script/style"""
+    parts = [element.text.strip()] if element.text else []
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in _NON_TEXT_TAGS:
+            parts.append(_lxml_text(child))
+        if child.tail:
+            parts.append(child.tail.strip())
+    return ''.join(parts)
+
+
+def _lxml_movie_page(doc, page_url):
+    # Los elementos de lxml sin hijos son falsos: comparar siempre con None
+    img_tag = _first(doc, _has_class('img', 'lazy'))
+    if img_tag is None:
+        img_tag = _first(doc, "//img[@loading='lazy']")
+    if img_tag is None:
+        img_tag = _first(doc, '//img[@data-src]')
+
+    img_url = urljoin(page_url, img_tag.get('data-src')) if img_tag is not None and img_tag.get('data-src') else None
+    if not img_url and img_tag is not None:
+        img_url = urljoin(page_url, img_tag.get('src')) if img_tag.get('src') else None
+
+    iframe_tag = _first(doc, _has_class('iframe', 'no-you'))
+    if iframe_tag is None:
+        iframe_tag = _first(doc, '//iframe[@data-src]')
+
+    iframe_url = iframe_tag.get('data-src') if iframe_tag is not None and iframe_tag.get('data-src') else None
+    if not iframe_url and iframe_tag is not None:
+        iframe_url = iframe_tag.get('src') if iframe_tag.get('src') else None
+
+    title = None
+    title_tag = _first(doc, '//h1')
+    if title_tag is not None:
+        title = _lxml_text(title_tag)
+
+    if not title:
+        title = title_from_url(page_url)
+
+    return img_url, iframe_url, title
+
+
+def _lxml_movie_page_basic(doc, page_url):
+    img_tag = _first(doc, _has_class('img', 'lazy'))
+    img_url = urljoin(page_url, img_tag.get('data-src')) if img_tag is not None else None
+
+    iframe_tag = _first(doc, _has_class('iframe', 'no-you'))
+    iframe_url = iframe_tag.get('data-src') if iframe_tag is not None else None
+
+    return img_url, iframe_url, title_from_url(page_url)
+
+
+def _lxml_document(html):
+    try:
+        try:
+            return lxml.html.fromstring(html)
+        except ValueError:
+            # lxml no acepta texto unicode con declaración de encoding
+            return lxml.html.fromstring(html.encode('utf-8'))
+    except etree.ParserError:
+        # Cuerpo vacío o solo espacios: un documento sin nada, como en los otros backends
+        return lxml.html.fromstring('<html></html>')
+
+
+def _parse(html, page_url, backend, soup_func, lxml_func):
+    backend = backend or get_parser_backend()
+    if backend == 'lxml':
+        return lxml_func(_lxml_document(html), page_url)
+    return soup_func(_make_soup(html, backend), page_url)
+
+
+def parse_movie_page(html, page_url, backend=None):
+    """Devuelve ``(img_url, iframe_url, title)`` con las búsquedas alternativas de V4"""
+    return _parse(html, page_url, backend, _soup_movie_page, _lxml_movie_page)
+
+
+def parse_movie_page_basic(html, page_url, backend=None):
+    """Devuelve ``(img_url, iframe_url, title)`` como las versiones 1 a 3 (título desde la URL)"""
+    return _parse(html, page_url, backend, _soup_movie_page_basic, _lxml_movie_page_basic)
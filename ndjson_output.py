@@ -0,0 +1,91 @@
+"""Salida NDJSON (JSON Lines) en streaming, opcionalmente comprimida.
+
+Cada registro (película, serie con sus episodios...) se escribe como una
+línea apenas se extrae y se vacía al disco en el momento, así otro proceso
+puede ir leyendo el archivo mientras la corrida sigue (``tail -f``,
+``zcat``, ``zstdcat``). La compresión se elige por la extensión (``.gz``,
+``.zst``) o explícitamente; en ambos casos cada línea cierra un bloque
+comprimido completo, decodificable sin esperar al final.
+
+zstd requiere el paquete ``zstandard``; gzip está siempre disponible.
+"""
+import gzip
+import json
+
+from records import to_json
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIONS = ('gzip', 'zstd')
+
+EXTENSIONS = {
+    '.gz': 'gzip',
+    '.zst': 'zstd',
+}
+
+
+def compression_for(path):
+    """Compresión que corresponde a la extensión del archivo, o None"""
+    for extension, compression in EXTENSIONS.items():
+        if path and path.endswith(extension):
+            return compression
+    return None
+
+
+class NdjsonWriter:
+    """Un registro JSON por línea sobre un archivo binario, vaciado después de cada línea"""
+
+    def __init__(self, file, compression=None, close_file=True):
+        if compression not in (None, *COMPRESSIONS):
+            raise ValueError(f"Compresión desconocida: {compression}")
+        if compression == 'zstd' and zstandard is None:
+            raise ValueError("La compresión zstd requiere: pip install zstandard")
+
+        self.compression = compression
+        self.count = 0
+        self._file = file
+        self._close_file = close_file
+
+        if compression == 'gzip':
+            # Al agregar a un .gz existente se suma un miembro nuevo; gzip los lee seguidos
+            self._stream = gzip.GzipFile(fileobj=file, mode='wb')
+        elif compression == 'zstd':
+            self._stream = zstandard.ZstdCompressor().stream_writer(file, closefd=False)
+        else:
+            self._stream = file
+
+    def write_line(self, text):
+        self._stream.write(f"{text}\n".encode('utf-8'))
+        if self.compression == 'zstd':
+            self._stream.flush(zstandard.FLUSH_BLOCK)
+        else:
+            # En gzip, flush() cierra el bloque con Z_SYNC_FLUSH
+            self._stream.flush()
+        self._file.flush()
+
+    def write(self, record):
+        self.write_line(json.dumps(record, ensure_ascii=False, default=to_json))
+        self.count += 1
+
+    def close(self):
+        if self._stream is not self._file:
+            self._stream.close()
+        if self._close_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_ndjson(path, append=False, compression=None):
+    """Abre ``path`` para escribir NDJSON (agregando al final con ``append``)"""
+    compression = compression or compression_for(path)
+    return NdjsonWriter(open(path, 'ab' if append else 'wb'), compression)
@@ -0,0 +1,130 @@
+"""Descubrimiento de la cantidad real de páginas de una categoría o listado.
+
+En lugar de adivinar ``page_count`` (y pedir páginas vacías o quedarse
+corto), se descarga la primera página y:
+
+1. Si tiene la barra de paginación, el mayor ``/page/N`` enlazado es la
+   última página, salvo que la barra muestre solo una ventana: se confirma
+   pidiendo ``N+1`` y, si existe, se sigue sondeando desde ahí.
+2. Si no la tiene, se sondean páginas 2, 4, 8... hasta encontrar una vacía
+   y después se busca el límite exacto con búsqueda binaria
+   (unas ``2·log2(N)`` descargas en total).
+
+Una página que responde 4xx no existe. Los errores pasajeros (conexión,
+timeout, 5xx) se reintentan ``PAGE_ATTEMPTS`` veces; si siguen, la página se
+cuenta como inexistente con un aviso, en lugar de cortar el barrido.
+
+Las páginas sondeadas quedan en la caché HTTP, así que el barrido que viene
+después no las vuelve a descargar.
+"""
+import re
+import time
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from bs4 import BeautifulSoup
+
+from http_client import fetch
+
+# Tope de páginas al sondear, por si el sitio responde cualquier /page/N con contenido
+MAX_PAGES = 5000
+
+# Elementos que indican que la página tiene títulos (categorías de películas y listados de series)
+ITEM_SELECTOR = '.TPostMv, .TPost, .MovieList a[href]'
+
+# Intentos por página ante errores pasajeros, con una espera creciente entre ellos
+PAGE_ATTEMPTS = 3
+RETRY_DELAY = 1.0
+
+PAGE_PATTERN = re.compile(r'/page/(\d+)/?$')
+
+
+def page_url(listing_url, page):
+    """URL de la página ``page`` con el mismo formato que ``generate_category_urls``"""
+    return f"{listing_url.rstrip('/')}/page/{page}"
+
+
+def has_items(html):
+    return BeautifulSoup(html, 'html.parser').select_one(ITEM_SELECTOR) is not None
+
+
+def last_page_from_links(html, listing_url):
+    """El mayor número de página enlazado desde ``html`` para este listado, o None"""
+    base_path = urlsplit(listing_url).path.rstrip('/')
+    last_page = None
+
+    for link in BeautifulSoup(html, 'html.parser').find_all('a', href=True):
+        path = urlsplit(urljoin(listing_url, link['href'])).path
+        match = PAGE_PATTERN.search(path)
+        if match and path[:match.start()].rstrip('/') == base_path:
+            last_page = max(last_page or 0, int(match.group(1)))
+
+    return last_page
+
+
+def fetch_page(url):
+    """HTML de la página, o None si no existe (4xx) o sigue fallando después de ``PAGE_ATTEMPTS`` intentos"""
+    for attempt in range(1, PAGE_ATTEMPTS + 1):
+        try:
+            return fetch(url).text
+        except requests.exceptions.RequestException as e:
+            status = e.response.status_code if e.response is not None else None
+            if status is not None and 400 <= status < 500 and status != 429:
+                return None
+            if attempt == PAGE_ATTEMPTS:
+                print(f"⚠️ {url}: {e}; se cuenta como inexistente")
+                return None
+            time.sleep(RETRY_DELAY * attempt)
+
+
+def page_exists(listing_url, page):
+    html = fetch_page(page_url(listing_url, page))
+    return html is not None and has_items(html)
+
+
+def probe_last_page(exists, max_pages=MAX_PAGES, start=1):
+    """Última página N tal que ``exists(N)`` (se asume que la página ``start`` existe).
+
+    Primero duplica la página hasta que una no existe y después busca el límite
+    con búsqueda binaria entre la última que existió y la primera que no.
+    """
+    found, page = start, start * 2
+    while page <= max_pages and exists(page):
+        found, page = page, page * 2
+
+    missing = min(page, max_pages + 1)
+    while missing - found > 1:
+        middle = (found + missing) // 2
+        if exists(middle):
+            found = middle
+        else:
+            missing = middle
+    return found
+
+
+def discover_page_count(listing_url, max_pages=MAX_PAGES):
+    """Cantidad de páginas del listado (0 si ni la primera tiene títulos)"""
+    first_page = fetch_page(page_url(listing_url, 1))
+    if first_page is None or not has_items(first_page):
+        return 0
+
+    def exists(page):
+        return page_exists(listing_url, page)
+
+    last_page = last_page_from_links(first_page, listing_url)
+    if last_page:
+        last_page = min(last_page, max_pages)
+        # La barra puede enlazar solo las páginas cercanas: confirmar que no hay una más
+        if last_page == max_pages or not exists(last_page + 1):
+            return last_page
+        return probe_last_page(exists, max_pages, start=last_page + 1)
+
+    return probe_last_page(exists, max_pages)
+
+
+def discover_category_urls(base_url, category_name, max_pages=MAX_PAGES):
+    """Las URLs de todas las páginas de la categoría, como ``generate_category_urls``"""
+    listing_url = f"{base_url}/{category_name}"
+    page_count = discover_page_count(listing_url, max_pages)
+    print(f"📄 {listing_url}: {page_count} páginas")
+    return [page_url(listing_url, page) for page in range(1, page_count + 1)]
@@ -0,0 +1,133 @@
+"""Etapa de parseo en procesos separada de la descarga.
+
+Los hilos de descarga entregan los bytes de cada página a un
+``ProcessPoolExecutor``; los procesos ejecutan las funciones puras de
+``series_parsing`` y devuelven dicts simples. Así el trabajo de BeautifulSoup
+usa todos los núcleos en lugar de competir por el GIL del hilo principal.
+
+Con ``workers=0`` el parseo se hace en el mismo proceso (útil para depurar).
+"""
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+import profiling
+from http_client import fetch
+
+DEFAULT_WORKERS = int(os.environ.get('BSZ_PARSE_WORKERS', os.cpu_count() or 1))
+DEFAULT_FETCH_WORKERS = 8
+
+
+class ParsePool:
+    """Pool de procesos de parseo con un máximo de páginas en cola"""
+
+    def __init__(self, workers=DEFAULT_WORKERS, queue_depth=None):
+        self.workers = workers
+        self.queue_depth = queue_depth or max(1, workers) * 2
+        self._slots = threading.BoundedSemaphore(self.queue_depth)
+        self._executor = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+
+    def submit(self, func, *args):
+        """Encola ``func(*args)``; se bloquea si ya hay ``queue_depth`` páginas esperando"""
+        if self._executor is None:
+            future = Future()
+            try:
+                future.set_result(func(*args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        self._slots.acquire()
+        if not profiling.is_enabled():
+            future = self._executor.submit(func, *args)
+            future.add_done_callback(lambda _: self._slots.release())
+            return future
+
+        # Las etapas medidas dentro del proceso (ej: @timed) vuelven con el resultado
+        future = Future()
+
+        def done(profiled):
+            self._slots.release()
+            try:
+                result, samples = profiled.result()
+            except Exception as e:
+                future.set_exception(e)
+                return
+            profiling.merge(samples)
+            future.set_result(result)
+
+        self._executor.submit(profiling.collect, func, *args).add_done_callback(done)
+        return future
+
+    def parse(self, func, *args):
+        return self.submit(func, *args).result()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+_pool = None
+_pool_config = {'workers': DEFAULT_WORKERS, 'queue_depth': None}
+_pool_lock = threading.Lock()
+
+
+def configure_parse_pool(workers=None, queue_depth=None):
+    """Cambia la cantidad de procesos y la profundidad de la cola del pool compartido"""
+    global _pool
+
+    with _pool_lock:
+        if workers is not None:
+            _pool_config['workers'] = workers
+        if queue_depth is not None:
+            _pool_config['queue_depth'] = queue_depth
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = None
+
+
+def get_parse_pool():
+    """Pool compartido, creado la primera vez que se usa"""
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ParsePool(**_pool_config)
+        return _pool
+
+
+def shutdown_parse_pool():
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = None
+
+
+def fetch_and_parse(url, func, *args):
+    """Descarga ``url`` y la parsea en el pool con ``func(content, encoding, url, *args)``"""
+    response = fetch(url)
+    with profiling.stage(f'parse.{func.__name__}'):
+        return get_parse_pool().parse(func, response.content, response.encoding, url, *args)
+
+
+def fetch_and_parse_many(urls, func, *args, fetch_workers=DEFAULT_FETCH_WORKERS):
+    """``fetch_and_parse`` para varias URLs a la vez; produce ``(url, resultado o excepción)`` en orden"""
+    urls = list(urls)
+
+    def job(url):
+        try:
+            return fetch_and_parse(url, func, *args)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=fetch_workers) as executor:
+        for url, result in zip(urls, executor.map(job, urls)):
+            yield url, result
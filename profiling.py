@@ -0,0 +1,178 @@
+"""Tiempos por etapa (descarga, parseo, escritura, esperas) y reporte de la corrida.
+
+Las funciones calientes se marcan con ``@timed('etapa')`` y los tramos internos
+con ``with stage('etapa'):``. Mientras el perfilado está desactivado (lo
+normal) ``stage`` devuelve un contexto vacío compartido y ``timed`` llama a la
+función directamente, así el costo es una comparación por llamada.
+
+Se activa con ``enable()`` o con la variable de entorno ``BSZ_PROFILE=perfil.json``.
+Al terminar, ``write_report()`` muestra p50/p95/p99 de cada etapa y guarda el
+reporte JSON. Los procesos de ``parse_pool`` miden con ``collect`` y devuelven
+sus muestras junto con el resultado; el proceso principal las suma con
+``merge``. La etapa ``parse.*`` es el viaje completo (cola, envío y parseo).
+"""
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+DEFAULT_REPORT_PATH = 'perfil.json'
+PERCENTILES = (50, 95, 99)
+
+_enabled = False
+_report_path = None
+_started_at = None
+_samples = defaultdict(list)
+_lock = threading.Lock()
+_NOOP = contextlib.nullcontext()
+
+
+def enable(report_path=DEFAULT_REPORT_PATH):
+    """Empieza a medir; ``write_report`` guardará el reporte en ``report_path``"""
+    global _enabled, _report_path, _started_at
+
+    with _lock:
+        _enabled = True
+        _report_path = report_path
+        _started_at = time.time()
+        _samples.clear()
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def record(name, seconds):
+    with _lock:
+        _samples[name].append(seconds)
+
+
+def collect(func, *args):
+    """Corre ``func(*args)`` midiendo sus etapas; devuelve ``(resultado, {etapa: [segundos]})``
+
+    Es para los procesos de ``parse_pool``, que hacen una tarea a la vez: las
+    muestras de la tarea salen con el resultado y no quedan en el proceso.
+    """
+    global _enabled
+    _enabled = True
+    with _lock:
+        _samples.clear()
+    try:
+        result = func(*args)
+    finally:
+        with _lock:
+            samples = dict(_samples)
+            _samples.clear()
+    return result, samples
+
+
+def merge(samples):
+    """Suma muestras medidas en otro proceso (ver ``collect``)"""
+    with _lock:
+        for name, values in samples.items():
+            _samples[name].extend(values)
+
+
+class _Stage:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+
+
+def stage(name):
+    """Contexto que mide el tramo ``name`` (no hace nada si el perfilado está desactivado)"""
+    return _Stage(name) if _enabled else _NOOP
+
+
+def timed(name):
+    """Decorador: mide cada llamada a la función como la etapa ``name``"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def percentile(sorted_values, percent):
+    """Percentil por rango más cercano de una lista ya ordenada"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summary():
+    """``{etapa: {count, total, mean, p50, p95, p99, max}}`` en segundos, por tiempo total"""
+    with _lock:
+        samples = {name: sorted(values) for name, values in _samples.items()}
+
+    stages = {}
+    for name, values in sorted(samples.items(), key=lambda item: -sum(item[1])):
+        total = sum(values)
+        stats = {'count': len(values), 'total': total, 'mean': total / len(values)}
+        for percent in PERCENTILES:
+            stats[f'p{percent}'] = percentile(values, percent)
+        stats['max'] = values[-1]
+        stages[name] = stats
+    return stages
+
+
+def print_summary(stages):
+    print("\n⏱️ Tiempo por etapa (ms):")
+    print(f"  {'etapa':<32} {'n':>7} {'total s':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for name, stats in stages.items():
+        print(f"  {name:<32} {stats['count']:>7} {stats['total']:>9.2f} "
+              f"{stats['p50'] * 1000:>8.1f} {stats['p95'] * 1000:>8.1f} "
+              f"{stats['p99'] * 1000:>8.1f} {stats['max'] * 1000:>8.1f}")
+
+
+def write_report(**sections):
+    """Muestra el resumen y guarda el reporte JSON (con ``sections`` extra, ej: ``http=...``)
+
+    No hace nada si el perfilado no está activo. Devuelve la ruta del reporte.
+    """
+    if not _enabled:
+        return None
+
+    stages = summary()
+    print_summary(stages)
+
+    report = {
+        'started_at': _started_at,
+        'wall_seconds': time.time() - _started_at,
+        'stages': stages,
+        **sections,
+    }
+    temp_path = _report_path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    os.replace(temp_path, _report_path)
+    print(f"📈 Reporte de perfilado guardado en {_report_path}")
+    return _report_path
+
+
+if os.environ.get('BSZ_PROFILE'):
+    enable(os.environ['BSZ_PROFILE'])
@@ -0,0 +1,131 @@
+"""Limitador adaptativo por host (token bucket) para todas las descargas.
+
+Reemplaza las pausas fijas (``time.sleep``) que había entre páginas. Cada host
+tiene su propio balde de tokens:
+
+- Con respuestas rápidas y sanas la tasa sube: multiplicándose mientras el
+  host nunca se quejó y no pasó ``SLOW_START_THRESHOLD`` (arranque rápido), y
+  de a poco (+0.1 por respuesta) después, hasta ``max_rate``.
+- Con respuestas lentas la tasa baja un poco.
+- Con 429/503 la tasa se reduce a la mitad y, si llega ``Retry-After``, el
+  host queda en pausa hasta ese momento.
+
+Se lleva la cuenta del tiempo total esperando al limitador.
+"""
+import email.utils
+import threading
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_RATE = 4.0
+DEFAULT_BURST = 8
+MIN_RATE = 0.5
+# Techo por defecto (``--max-rate`` lo sube; None = sin techo)
+MAX_RATE = DEFAULT_RATE * 8
+# Factor por respuesta sana antes del primer 429/503 o respuesta lenta...
+SLOW_START_FACTOR = 1.05
+# ...y mientras la tasa no pase de este valor; por encima sube de a 0.1
+SLOW_START_THRESHOLD = DEFAULT_RATE * 4
+# Latencia por encima de la cual se considera que el servidor va cargado
+TARGET_LATENCY = 2.0
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value):
+    """Segundos a esperar según un header Retry-After (segundos o fecha HTTP)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class HostBucket:
+    """Balde de tokens de un host con tasa ajustable"""
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, min_rate=MIN_RATE, max_rate=MAX_RATE):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        # Una tasa inicial por encima del techo lo sube
+        self.max_rate = max(max_rate, rate) if max_rate is not None else None
+        self.tokens = float(burst)
+        self.blocked_until = 0.0
+        self.slow_start = True
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Toma un token y devuelve cuántos segundos hay que esperar para usarlo"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            # Los tokens pueden quedar negativos: es la cola de espera
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+
+    def record(self, status, latency, retry_after=None):
+        """Ajusta la tasa según el resultado de la petición"""
+        with self._lock:
+            if status in THROTTLE_STATUSES:
+                self.slow_start = False
+                self.rate = max(self.min_rate, self.rate / 2)
+                pause = retry_after if retry_after is not None else 1 / self.rate
+                self.blocked_until = max(self.blocked_until, time.monotonic() + pause)
+            elif latency > TARGET_LATENCY:
+                self.slow_start = False
+                self.rate = max(self.min_rate, self.rate * 0.9)
+            elif status < 400:
+                if self.slow_start and self.rate < SLOW_START_THRESHOLD:
+                    self.rate = min(SLOW_START_THRESHOLD, self.rate * SLOW_START_FACTOR)
+                else:
+                    self.rate += 0.1
+                if self.max_rate is not None:
+                    self.rate = min(self.max_rate, self.rate)
+
+
+class RateLimiter:
+    """Conjunto de baldes, uno por host"""
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, min_rate=MIN_RATE, max_rate=MAX_RATE):
+        self.settings = {'rate': rate, 'burst': burst, 'min_rate': min_rate, 'max_rate': max_rate}
+        self.buckets = {}
+        self.stats = {'waits': 0, 'wait_seconds': 0.0, 'throttled': 0}
+        self._lock = threading.Lock()
+
+    def _bucket(self, url):
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            if host not in self.buckets:
+                self.buckets[host] = HostBucket(**self.settings)
+            return self.buckets[host]
+
+    def acquire(self, url):
+        """Espera el turno del host de ``url``; devuelve los segundos esperados"""
+        wait = self._bucket(url).reserve()
+        if wait > 0:
+            time.sleep(wait)
+            with self._lock:
+                self.stats['waits'] += 1
+                self.stats['wait_seconds'] += wait
+        return wait
+
+    def record(self, url, status, latency, retry_after=None):
+        if status in THROTTLE_STATUSES:
+            with self._lock:
+                self.stats['throttled'] += 1
+        self._bucket(url).record(status, latency, retry_after)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['rates'] = {host: round(bucket.rate, 2) for host, bucket in self.buckets.items()}
+        return stats
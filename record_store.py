@@ -0,0 +1,326 @@
+"""Almacén estructurado (SQLite) de películas, series, temporadas, episodios y fuentes de video.
+
+Los extractores guardan cada registro con un upsert sobre su URL, así volver
+a extraer una página actualiza la fila en lugar de duplicarla. Las escrituras
+se acumulan y se aplican en lotes de ``batch_size`` dentro de una sola
+transacción.
+
+Además de los registros, el almacén recuerda las *listas* de cada salida: qué
+películas o series (y en qué orden) forman ``code.txt`` o
+``series_catalog.html``, agrupadas en secciones (una por URL de entrada). Con
+eso los archivos HTML y JSON se pueden volver a generar desde el almacén sin
+re-parsear nada (``bsz_cli.py render``), y el catálogo se puede consultar con
+SQL directamente.
+"""
+import json
+import os
+import sqlite3
+import time
+
+from profiling import timed
+
+DEFAULT_STORE_PATH = 'catalog.sqlite'
+BATCH_SIZE = 500
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS movies (
+        url TEXT PRIMARY KEY,
+        title TEXT,
+        image_url TEXT,
+        iframe_url TEXT,
+        updated_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS series (
+        url TEXT PRIMARY KEY,
+        title TEXT,
+        year TEXT,
+        rating TEXT,
+        description TEXT,
+        genre TEXT,
+        image_url TEXT,
+        has_episodes INTEGER NOT NULL DEFAULT 0,
+        updated_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS series_year ON series (year);
+    CREATE TABLE IF NOT EXISTS seasons (
+        series_url TEXT NOT NULL,
+        season_id TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        PRIMARY KEY (series_url, season_id)
+    );
+    CREATE TABLE IF NOT EXISTS episodes (
+        series_url TEXT NOT NULL,
+        season_id TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        url TEXT,
+        title TEXT,
+        episode_number TEXT,
+        image_url TEXT,
+        has_video_sources INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (series_url, season_id, position)
+    );
+    CREATE INDEX IF NOT EXISTS episodes_url ON episodes (url);
+    CREATE TABLE IF NOT EXISTS video_sources (
+        series_url TEXT NOT NULL,
+        season_id TEXT NOT NULL,
+        episode_position INTEGER NOT NULL,
+        position INTEGER NOT NULL,
+        service TEXT,
+        url TEXT,
+        domain TEXT,
+        PRIMARY KEY (series_url, season_id, episode_position, position)
+    );
+    CREATE INDEX IF NOT EXISTS video_sources_service ON video_sources (service);
+    CREATE TABLE IF NOT EXISTS listings (
+        name TEXT NOT NULL,
+        section INTEGER NOT NULL,
+        source_url TEXT,
+        PRIMARY KEY (name, section)
+    );
+    CREATE TABLE IF NOT EXISTS listing_items (
+        name TEXT NOT NULL,
+        section INTEGER NOT NULL,
+        position INTEGER NOT NULL,
+        kind TEXT NOT NULL,
+        url TEXT NOT NULL,
+        PRIMARY KEY (name, section, position)
+    );
+"""
+
+_UPSERT_MOVIE = """
+    INSERT INTO movies (url, title, image_url, iframe_url, updated_at) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (url) DO UPDATE SET
+        title = excluded.title, image_url = excluded.image_url,
+        iframe_url = excluded.iframe_url, updated_at = excluded.updated_at
+"""
+
+_UPSERT_SERIES = """
+    INSERT INTO series (url, title, year, rating, description, genre, image_url, has_episodes, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (url) DO UPDATE SET
+        title = excluded.title, year = excluded.year, rating = excluded.rating,
+        description = excluded.description, genre = excluded.genre, image_url = excluded.image_url,
+        has_episodes = excluded.has_episodes, updated_at = excluded.updated_at
+"""
+
+
+class RecordStore:
+    """Registros extraídos en SQLite, con escrituras por lotes y upsert por URL"""
+
+    def __init__(self, path=DEFAULT_STORE_PATH, batch_size=BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self._pending = []
+        # Próxima posición libre de cada (lista, sección)
+        self._positions = {}
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+    # ---------- Escritura ----------
+
+    def _queue(self, sql, params):
+        self._pending.append((sql, params))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    @timed('store.flush')
+    def flush(self):
+        """Aplica las escrituras pendientes en una sola transacción"""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        with self._db:
+            # Agrupar sentencias iguales consecutivas respetando el orden
+            start = 0
+            for end in range(1, len(pending) + 1):
+                if end == len(pending) or pending[end][0] != pending[start][0]:
+                    self._db.executemany(pending[start][0], [params for _, params in pending[start:end]])
+                    start = end
+
+    def put_movie(self, url, movie):
+        """Guarda (o actualiza) una película ``{'image_url', 'iframe_url', 'title'}``"""
+        self._queue(_UPSERT_MOVIE, (url, movie.get('title'), movie.get('image_url'),
+                                    movie.get('iframe_url'), time.time()))
+
+    def put_series(self, series):
+        """Guarda (o reemplaza) una serie con sus temporadas, episodios y fuentes de video"""
+        url = series['url']
+        episodes_data = series.get('episodes')
+        self._queue(_UPSERT_SERIES, (
+            url, series.get('title'), series.get('year'), series.get('rating'), series.get('description'),
+            json.dumps(series.get('genre', []), ensure_ascii=False), series.get('image_url'),
+            int('episodes' in series), time.time(),
+        ))
+
+        for table in ('video_sources', 'episodes', 'seasons'):
+            self._queue(f"DELETE FROM {table} WHERE series_url = ?", (url,))
+
+        for season_position, (season_id, episodes) in enumerate((episodes_data or {}).items()):
+            self._queue("INSERT INTO seasons (series_url, season_id, position) VALUES (?, ?, ?)",
+                        (url, season_id, season_position))
+            for position, episode in enumerate(episodes):
+                self._queue("""
+                    INSERT INTO episodes (series_url, season_id, position, url, title, episode_number,
+                                          image_url, has_video_sources)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (url, season_id, position, episode.get('url'), episode.get('title'),
+                      episode.get('episode_number'), episode.get('image_url'), int('video_sources' in episode)))
+                for source_position, source in enumerate(episode.get('video_sources', [])):
+                    self._queue("""
+                        INSERT INTO video_sources (series_url, season_id, episode_position, position,
+                                                   service, url, domain)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """, (url, season_id, position, source_position,
+                          source.get('service'), source.get('url'), source.get('domain')))
+
+    def clear_listing(self, name):
+        """Vacía la lista ``name`` (al empezar una corrida que la vuelve a generar)"""
+        self._queue("DELETE FROM listing_items WHERE name = ?", (name,))
+        self._queue("DELETE FROM listings WHERE name = ?", (name,))
+        self._positions = {key: value for key, value in self._positions.items() if key[0] != name}
+
+    def add_section(self, name, section, source_url=None):
+        """Declara la sección ``section`` de la lista (aunque termine vacía)"""
+        self._queue("INSERT OR REPLACE INTO listings (name, section, source_url) VALUES (?, ?, ?)",
+                    (name, section, source_url))
+
+    def add_to_listing(self, name, section, kind, url):
+        """Agrega ``url`` (``'movie'`` o ``'series'``) al final de la sección"""
+        key = (name, section)
+        if key not in self._positions:
+            self.flush()
+            row = self._db.execute(
+                "SELECT COALESCE(MAX(position) + 1, 0) FROM listing_items WHERE name = ? AND section = ?", key
+            ).fetchone()
+            self._positions[key] = row[0]
+        position = self._positions[key]
+        self._positions[key] += 1
+        self._queue("INSERT OR REPLACE INTO listing_items (name, section, position, kind, url) VALUES (?, ?, ?, ?, ?)",
+                    (name, section, position, kind, url))
+
+    # ---------- Lectura ----------
+
+    def sections(self, name):
+        """``[(section, source_url)]`` de la lista, en orden"""
+        self.flush()
+        return self._db.execute(
+            "SELECT section, source_url FROM listings WHERE name = ? ORDER BY section", (name,)
+        ).fetchall()
+
+    def listing_kind(self, name):
+        """Tipo de registros de la lista (``'movie'`` o ``'series'``), o None si está vacía"""
+        self.flush()
+        row = self._db.execute("SELECT kind FROM listing_items WHERE name = ? LIMIT 1", (name,)).fetchone()
+        return row[0] if row else None
+
+    def listed_movies(self, name):
+        """Películas de la lista en orden, como dicts ``{'url', 'image_url', 'iframe_url', 'title'}``"""
+        self.flush()
+        rows = self._db.execute("""
+            SELECT m.url, m.image_url, m.iframe_url, m.title
+            FROM listing_items AS l JOIN movies AS m ON m.url = l.url
+            WHERE l.name = ? AND l.kind = 'movie'
+            ORDER BY l.section, l.position
+        """, (name,))
+        for url, image_url, iframe_url, title in rows:
+            yield {'url': url, 'image_url': image_url, 'iframe_url': iframe_url, 'title': title}
+
+    def listed_series(self, name, section):
+        """Series de una sección de la lista, en orden y con la misma forma que devuelven los extractores"""
+        self.flush()
+        urls = [url for (url,) in self._db.execute("""
+            SELECT url FROM listing_items
+            WHERE name = ? AND section = ? AND kind = 'series'
+            ORDER BY position
+        """, (name, section))]
+        return [series for series in map(self.get_series, urls) if series is not None]
+
+    def listing_image_urls(self, name):
+        """URLs de los pósters de la lista, sin repetir
+
+        Las miniaturas de episodios quedan afuera: ni las tarjetas ni el
+        catálogo liviano las muestran, así que descargarlas no serviría.
+        """
+        self.flush()
+        rows = self._db.execute("""
+            SELECT m.image_url FROM listing_items AS l JOIN movies AS m ON m.url = l.url
+            WHERE l.name = ? AND l.kind = 'movie'
+            UNION
+            SELECT s.image_url FROM listing_items AS l JOIN series AS s ON s.url = l.url
+            WHERE l.name = ? AND l.kind = 'series'
+        """, (name, name))
+        return [url for (url,) in rows if url]
+
+    def get_series(self, url):
+        """La serie guardada con sus episodios, o None"""
+        self.flush()
+        row = self._db.execute("""
+            SELECT title, year, rating, description, genre, image_url, has_episodes
+            FROM series WHERE url = ?
+        """, (url,)).fetchone()
+        if row is None:
+            return None
+
+        title, year, rating, description, genre, image_url, has_episodes = row
+        series = {
+            'title': title,
+            'year': year,
+            'rating': rating,
+            'description': description,
+            'genre': json.loads(genre),
+            'image_url': image_url,
+            'url': url,
+        }
+        if has_episodes:
+            series['episodes'] = self._episodes(url)
+        return series
+
+    def _episodes(self, series_url):
+        episodes_data = {}
+        for (season_id,) in self._db.execute(
+                "SELECT season_id FROM seasons WHERE series_url = ? ORDER BY position", (series_url,)):
+            episodes_data[season_id] = []
+
+        sources = {}
+        for season_id, episode_position, service, url, domain in self._db.execute("""
+            SELECT season_id, episode_position, service, url, domain FROM video_sources
+            WHERE series_url = ? ORDER BY season_id, episode_position, position
+        """, (series_url,)):
+            sources.setdefault((season_id, episode_position), []).append(
+                {'service': service, 'url': url, 'domain': domain}
+            )
+
+        for season_id, position, url, title, episode_number, image_url, has_video_sources in self._db.execute("""
+            SELECT season_id, position, url, title, episode_number, image_url, has_video_sources
+            FROM episodes WHERE series_url = ? ORDER BY season_id, position
+        """, (series_url,)):
+            episode = {'title': title, 'episode_number': episode_number, 'url': url, 'image_url': image_url}
+            if has_video_sources:
+                episode['video_sources'] = sources.get((season_id, position), [])
+            episodes_data.setdefault(season_id, []).append(episode)
+
+        return episodes_data
+
+    def counts(self):
+        """Filas por tabla"""
+        self.flush()
+        return {
+            table: self._db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ('movies', 'series', 'seasons', 'episodes', 'video_sources')
+        }
+
+    def close(self):
+        self.flush()
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
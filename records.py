@@ -0,0 +1,126 @@
+"""Registros compactos de películas, series, episodios y fuentes de video.
+
+En un barrido completo de series con fuentes de video quedan millones de
+registros en memoria a la vez (``all_series_data``). Como dicts cada uno carga
+su propia tabla hash; estas clases guardan los campos en ``__slots__`` y
+comparten los textos que se repiten (años, ratings, géneros, números de
+episodio, servicios y dominios) con ``sys.intern``.
+
+Se leen y modifican igual que los dicts que reemplazan (``serie['title']``,
+``serie.get('year')``, ``'episodes' in serie``, ``episodio['video_sources'] = ...``).
+Un campo sin asignar es una clave ausente, así los opcionales (``episodes``,
+``video_sources``) solo aparecen en el JSON si existen. Para serializar se
+pasa ``default=to_json`` a ``json.dumps``: el JSON sale con las mismas claves
+en el mismo orden que antes.
+
+Los registros que arma el pool de parseo llegan al proceso principal por
+pickle; al despicklearlos se vuelven a construir con ``__init__`` para que sus
+textos se compartan también en ese proceso.
+"""
+import sys
+from collections.abc import MutableMapping
+
+
+def intern(value):
+    """El texto compartido equivalente a ``value`` (None queda None)"""
+    return sys.intern(str(value)) if value is not None else None
+
+
+def to_json(value):
+    """``default`` de ``json.dumps`` para los registros"""
+    if isinstance(value, Record):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class Record(MutableMapping):
+    """Registro con los campos en ``__slots__`` y la interfaz de un dict"""
+
+    __slots__ = ()
+    # Campos que no recibe ``__init__`` (se asignan después, si existen)
+    _optional = ()
+
+    def __getitem__(self, key):
+        if key in self.__slots__:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        delattr(self, key)
+
+    def __contains__(self, key):
+        return key in self.__slots__ and hasattr(self, key)
+
+    def __iter__(self):
+        return (name for name in self.__slots__ if hasattr(self, name))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self}
+
+    def __reduce__(self):
+        args = tuple(getattr(self, name, None) for name in self.__slots__ if name not in self._optional)
+        optional = {name: getattr(self, name) for name in self._optional if hasattr(self, name)}
+        return type(self), args, (None, optional) if optional else None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class Movie(Record):
+    __slots__ = ('image_url', 'iframe_url', 'title')
+
+    def __init__(self, image_url, iframe_url, title):
+        self.image_url = image_url
+        self.iframe_url = iframe_url
+        self.title = title
+
+
+class Series(Record):
+    """Serie; ``episodes`` (``{temporada: [Episode]}``) solo existe si se extrajeron"""
+
+    __slots__ = ('title', 'year', 'rating', 'description', 'genre', 'image_url', 'url', 'episodes')
+    _optional = ('episodes',)
+
+    def __init__(self, title, year, rating, description, genre, image_url, url):
+        self.title = title
+        self.year = intern(year)
+        self.rating = intern(rating)
+        self.description = description
+        self.genre = [intern(name) for name in genre]
+        self.image_url = image_url
+        self.url = url
+
+
+class Episode(Record):
+    """Episodio; ``video_sources`` solo existe si se encontraron fuentes"""
+
+    __slots__ = ('title', 'episode_number', 'url', 'image_url', 'video_sources')
+    _optional = ('video_sources',)
+
+    def __init__(self, title, episode_number, url, image_url):
+        self.title = title
+        self.episode_number = intern(episode_number)
+        self.url = url
+        self.image_url = image_url
+
+
+class VideoSource(Record):
+    __slots__ = ('service', 'url', 'domain')
+
+    def __init__(self, service, url, domain):
+        self.service = intern(service)
+        self.url = url
+        self.domain = intern(domain)
@@ -1,135 +1,154 @@
-import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
-import json
 import os
-import time
 import re
-
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog_writer import CatalogWriter
+from frontier import Frontier
+from http_client import fetch, enable_cache, get_cache_stats, get_fetch_count, get_limiter_stats, get_stats
+from profiling import timed, write_report
+from records import Episode, Series
+from year_index import YearIndex
+
+def parse_series_data(soup, series_url):
+    """Extrae información básica de una serie desde su página ya parseada"""
+    # Extraer imagen principal
+    img_tag = soup.find('img', class_='lazy')
+    img_url = urljoin(series_url, img_tag.get('data-src')) if img_tag else None
+
+    # Extraer título
+    title_tag = soup.find('h1', class_='Title') or soup.find('h1')
+    title = title_tag.text.strip() if title_tag else series_url.split('/')[-1].replace('-', ' ').title()
+
+    # Extraer año
+    year_tag = soup.find('span', class_='Date')
+    year = year_tag.text.strip() if year_tag else ""
+
+    # Extraer rating
+    rating_tag = soup.find('span', class_='Vote')
+    rating = rating_tag.text.strip() if rating_tag else ""
+
+    # Extraer descripción
+    desc_tag = soup.find('div', class_='Description')
+    description = ""
+    if desc_tag:
+        p_tags = desc_tag.find_all('p')
+        for p in p_tags:
+            if p.text and not p.find('span'):
+                description = p.text.strip()
+                break
+
+    # Extraer género
+    genre_tag = soup.find('p', class_='Genre')
+    genre = []
+    if genre_tag:
+        genre_text = genre_tag.text.replace('Género:', '').replace('Genre:', '').strip()
+        if genre_text:
+            genre = [g.strip() for g in genre_text.split(',')]
+
+    return Series(title, year, rating, description, genre, img_url, series_url)
+
+@timed('extract_series_data')
 def extract_series_data(series_url):
     """Extrae información básica de una serie"""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(series_url, headers=headers, timeout=15)
-        response.raise_for_status()
-
+        response = fetch(series_url)
         soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Extraer imagen principal
-        img_tag = soup.find('img', class_='lazy')
-        img_url = urljoin(series_url, img_tag.get('data-src')) if img_tag else None
-
-        # Extraer título
-        title_tag = soup.find('h1', class_='Title') or soup.find('h1')
-        title = title_tag.text.strip() if title_tag else series_url.split('/')[-1].replace('-', ' ').title()
-
-        # Extraer año
-        year_tag = soup.find('span', class_='Date')
-        year = year_tag.text.strip() if year_tag else ""
-
-        # Extraer rating
-        rating_tag = soup.find('span', class_='Vote')
-        rating = rating_tag.text.strip() if rating_tag else ""
-
-        # Extraer descripción
-        desc_tag = soup.find('div', class_='Description')
-        description = ""
-        if desc_tag:
-            p_tags = desc_tag.find_all('p')
-            for p in p_tags:
-                if p.text and not p.find('span'):
-                    description = p.text.strip()
-                    break
-
-        # Extraer género
-        genre_tag = soup.find('p', class_='Genre')
-        genre = []
-        if genre_tag:
-            genre_text = genre_tag.text.replace('Género:', '').replace('Genre:', '').strip()
-            if genre_text:
-                genre = [g.strip() for g in genre_text.split(',')]
-
-        return {
-            'title': title,
-            'year': year,
-            'rating': rating,
-            'description': description,
-            'genre': genre,
-            'image_url': img_url,
-            'url': series_url
-        }
+        return parse_series_data(soup, series_url)
 
     except Exception as e:
         print(f"Error extrayendo datos de {series_url}: {e}")
         return None
 
-def extract_episodes_from_series(series_url):
-    """Extrae episodios de una serie específica"""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(series_url, headers=headers, timeout=15)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        episodes_data = {}
+def parse_episodes_from_series(soup, series_url):
+    """Extrae episodios de una serie desde su página ya parseada"""
+    episodes_data = {}
 
-        # Buscar selector de temporadas
-        season_select = soup.find('select', id='select-season')
+    # Buscar selector de temporadas
+    season_select = soup.find('select', id='select-season')
 
-        if season_select:
-            # Extraer todas las temporadas
-            season_options = season_select.find_all('option')
-            print(f"  ⏳ Encontradas {len(season_options)} temporadas")
+    if season_select:
+        # Extraer todas las temporadas
+        season_options = season_select.find_all('option')
+        print(f"  ⏳ Encontradas {len(season_options)} temporadas")
 
-            for option in season_options:
-                season_value = option.get('value', '').strip()
-                if season_value:
-                    season_id = f"season-{season_value}"
+        for option in season_options:
+            season_value = option.get('value', '').strip()
+            if season_value:
+                season_id = f"season-{season_value}"
 
-                    # Buscar la lista de episodios para esta temporada
-                    episodes_list = soup.find('ul', id=season_id, class_='all-episodes')
+                # Buscar la lista de episodios para esta temporada
+                episodes_list = soup.find('ul', id=season_id, class_='all-episodes')
 
-                    if episodes_list:
-                        episodes = extract_episodes_from_ul(episodes_list, series_url)
-                        if episodes:
-                            episodes_data[season_id] = episodes
-                            print(f"    ✅ Temporada {season_value}: {len(episodes)} episodios")
-                    else:
-                        # Intentar buscar cualquier lista con episodios
-                        all_lists = soup.find_all('ul', class_='all-episodes')
-                        if all_lists:
-                            season_num = int(season_value) if season_value.isdigit() else 1
-                            if len(all_lists) >= season_num:
-                                episodes = extract_episodes_from_ul(all_lists[season_num-1], series_url)
-                                if episodes:
-                                    episodes_data[season_id] = episodes
-                                    print(f"    ✅ Temporada {season_value}: {len(episodes)} episodios (por índice)")
+                if episodes_list:
+                    episodes = extract_episodes_from_ul(episodes_list, series_url)
+                    if episodes:
+                        episodes_data[season_id] = episodes
+                        print(f"    ✅ Temporada {season_value}: {len(episodes)} episodios")
+                else:
+                    # Intentar buscar cualquier lista con episodios
+                    all_lists = soup.find_all('ul', class_='all-episodes')
+                    if all_lists:
+                        season_num = int(season_value) if season_value.isdigit() else 1
+                        if len(all_lists) >= season_num:
+                            episodes = extract_episodes_from_ul(all_lists[season_num-1], series_url)
+                            if episodes:
+                                episodes_data[season_id] = episodes
+                                print(f"    ✅ Temporada {season_value}: {len(episodes)} episodios (por índice)")
+    else:
+        # Si no hay selector, buscar episodios directamente
+        episodes_list = soup.find('ul', class_='all-episodes')
+        if not episodes_list:
+            # Intentar con otra clase
+            episodes_list = soup.find('ul', class_='episodes')
+
+        if episodes_list:
+            episodes = extract_episodes_from_ul(episodes_list, series_url)
+            if episodes:
+                episodes_data['season-1'] = episodes
+                print(f"  ✅ Encontrados {len(episodes)} episodios")
         else:
-            # Si no hay selector, buscar episodios directamente
-            episodes_list = soup.find('ul', class_='all-episodes')
-            if not episodes_list:
-                # Intentar con otra clase
-                episodes_list = soup.find('ul', class_='episodes')
-
-            if episodes_list:
-                episodes = extract_episodes_from_ul(episodes_list, series_url)
-                if episodes:
-                    episodes_data['season-1'] = episodes
-                    print(f"  ✅ Encontrados {len(episodes)} episodios")
-            else:
-                print(f"  ⚠️ No se encontró lista de episodios")
+            print(f"  ⚠️ No se encontró lista de episodios")
 
-        return episodes_data
+    return episodes_data
+
+def extract_episodes_from_series(series_url):
+    """Extrae episodios de una serie específica"""
+    try:
+        response = fetch(series_url)
+        soup = BeautifulSoup(response.text, 'html.parser')
+        return parse_episodes_from_series(soup, series_url)
 
     except Exception as e:
         print(f"  ❌ Error extrayendo episodios: {e}")
         return {}
 
+def extract_series_with_episodes(series_url):
+    """Descarga y parsea la página de la serie una sola vez para obtener datos y episodios"""
+    try:
+        response = fetch(series_url)
+        soup = BeautifulSoup(response.text, 'html.parser')
+        series_data = parse_series_data(soup, series_url)
+
+    except Exception as e:
+        print(f"Error extrayendo datos de {series_url}: {e}")
+        return None
+
+    try:
+        episodes = parse_episodes_from_series(soup, series_url)
+    except Exception as e:
+        print(f"  ❌ Error extrayendo episodios: {e}")
+        episodes = {}
+
+    if episodes:
+        series_data['episodes'] = episodes
+
+    return series_data
+
+@timed('extract_episodes_from_ul')
 def extract_episodes_from_ul(episodes_list, base_url):
     """Extrae episodios de una lista UL"""
     episodes = []
@@ -183,36 +202,25 @@ def extract_episodes_from_ul(episodes_list, base_url):
                 if img_src:
                     episode_img = urljoin(base_url, img_src)
 
-            episodes.append({
-                'title': episode_title,
-                'episode_number': episode_num,
-                'url': episode_url,
-                'image_url': episode_img
-            })
+            episodes.append(Episode(episode_title, episode_num, episode_url, episode_img))
 
         except Exception as e:
             continue
 
     return episodes
 
-def save_to_json(data, filename):
-    """Guarda datos en formato JSON"""
-    with open(filename, 'w', encoding='utf-8') as file:
-        json.dump(data, file, ensure_ascii=False, indent=4)
-
-def extract_series_from_listing_page(page_url, extract_episodes=False):
+def extract_series_from_listing_page(page_url, extract_episodes=False, frontier=None):
     """Extrae todas las series de una página de listado"""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(page_url, headers=headers, timeout=15)
-        response.raise_for_status()
+        response = fetch(page_url)
 
         soup = BeautifulSoup(response.text, 'html.parser')
 
         series_list = []
         series_links = []
+        if frontier is None:
+            # Sin frontera de la corrida: deduplicar al menos dentro de esta página
+            frontier = Frontier()
 
         # Buscar en contenedores TPost (que contienen series)
         series_containers = soup.find_all('div', class_='TPost')
@@ -222,9 +230,10 @@ def extract_series_from_listing_page(page_url, extract_episodes=False):
                 link_tag = container.find('a')
                 if link_tag and link_tag.get('href'):
                     href = link_tag['href']
-                    if '/serie/' in href and href not in series_links:
+                    if '/serie/' in href:
                         series_url = urljoin(page_url, href)
-                        series_links.append(series_url)
+                        if frontier.add(series_url):
+                            series_links.append(series_url)
             except:
                 continue
 
@@ -236,14 +245,16 @@ def extract_series_from_listing_page(page_url, extract_episodes=False):
 
             try:
                 # Extraer datos básicos
-                series_data = extract_series_data(series_url)
+                if extract_episodes:
+                    # Una sola descarga de la página para datos y episodios
+                    series_data = extract_series_with_episodes(series_url)
+                else:
+                    series_data = extract_series_data(series_url)
                 if series_data:
                     # Extraer episodios si se solicita
                     if extract_episodes:
-                        print(f"      ⏳ Extrayendo episodios...")
-                        episodes = extract_episodes_from_series(series_url)
+                        episodes = series_data.get('episodes')
                         if episodes:
-                            series_data['episodes'] = episodes
                             print(f"      ✅ {sum(len(eps) for eps in episodes.values())} episodios extraídos")
                         else:
                             print(f"      ⚠️ No se encontraron episodios")
@@ -257,88 +268,14 @@ def extract_series_from_listing_page(page_url, extract_episodes=False):
                 print(f"      ❌ Error procesando serie: {e}")
                 continue
 
-            # Pausa para no sobrecargar
-            time.sleep(1)
-
         return series_list
 
     except Exception as e:
         print(f"  ❌ Error extrayendo series de {page_url}: {e}")
         return []
 
-def organize_by_year(series_list):
-    """Organiza series por año"""
-    organized = {}
-
-    for series in series_list:
-        year = series.get('year', 'Sin año')
-        if year not in organized:
-            organized[year] = []
-        organized[year].append(series)
-
-    # Ordenar años
-    sorted_years = sorted(
-        organized.keys(), 
-        reverse=True, 
-        key=lambda x: (0, int(x)) if x.isdigit() else (1, x)
-    )
-
-    return {year: organized[year] for year in sorted_years}
-
-# ============ PROGRAMA PRINCIPAL ============
-print("=" * 60)
-print("EXTRACTOR DE SERIES CUEVANA")
-print("=" * 60)
-
-# Preguntar qué extraer
-print("\n¿Qué deseas extraer?")
-print("1. Series de páginas de listado (ej: /serie/, /serie/page/2)")
-print("2. Series específicas con episodios")
-print("3. Solo información básica de series")
-
-option = input("\nSelecciona una opción (1-3): ").strip()
-
-# Preguntar si extraer episodios para opción 1
-extract_episodes_option = False
-if option == '2':
-    extract_episodes_option = True
-elif option == '1':
-    print("\n📺 ¿Deseas extraer también los episodios de cada serie?")
-    print("   Esto tomará MUCHO más tiempo (1-2 segundos por serie)")
-    print("   pero obtendrás la información completa de temporadas y episodios.")
-
-    episodes_choice = input("   ¿Extraer episodios? (s/n): ").strip().lower()
-    if episodes_choice == 's':
-        extract_episodes_option = True
-        print("   ⚠️  ADVERTENCIA: Esto puede tomar varios minutos dependiendo de la cantidad de series.")
-        print("   Se recomienda procesar pocas series a la vez (máximo 10).")
-        confirm = input("   ¿Continuar? (s/n): ").strip().lower()
-        if confirm != 's':
-            extract_episodes_option = False
-            print("   ✅ Solo se extraerá información básica de series.")
-
-# Solicitar URLs
-if option == '1':
-    print("\n📥 Introduce URLs de páginas de listado (separadas por comas):")
-    print("   Ejemplo: https://ww9.cuevana3.to/serie/")
-    print("            https://ww9.cuevana3.to/serie/page/2")
-
-    if extract_episodes_option:
-        print("\n   💡 CONSEJO: Procesa solo 1-2 páginas para no sobrecargar el servidor.")
-else:
-    print("\n📥 Introduce URLs de series específicas (separadas por comas):")
-    print("   Ejemplo: https://ww9.cuevana3.to/serie/playing-gracie-darling")
-    print("            https://ww9.cuevana3.to/serie/wonder-man")
-
-urls_input = input("\n🔗 URLs: ").strip()
-
-# Configurar archivos de salida
-html_filename = 'series_catalog.html'
-all_series_data = []
-individual_files = []
-
-# Iniciar HTML
-html_content = """<!DOCTYPE html>
+# Plantilla del catálogo HTML (cabecera con estilos y cierre con el script de episodios)
+HTML_HEADER = """<!DOCTYPE html>
 <html lang="es">
 <head>
     <meta charset="UTF-8">
@@ -517,173 +454,7 @@ html_content = """<!DOCTYPE html>
         <h1>🎬 Catálogo de Series - Cuevana</h1>
 """
 
-# Procesar cada URL individualmente
-urls_list = [url.strip() for url in urls_input.split(',') if url.strip()]
-total_series_count = 0
-total_episodes_count = 0
-
-for url_index, url in enumerate(urls_list, 1):
-    print(f"\n{'='*60}")
-    print(f"📁 PROCESANDO URL {url_index}/{len(urls_list)}")
-    print(f"🔗 {url}")
-    print('='*60)
-
-    url_series_data = []
-
-    if option == '1':
-        # Extraer series de página de listado
-        print(f"⏳ Extrayendo series de la página de listado...")
-        series_from_page = extract_series_from_listing_page(url, extract_episodes_option)
-
-        if series_from_page:
-            url_series_data.extend(series_from_page)
-
-            # Contar episodios si se extrajeron
-            episodes_count = 0
-            for series in series_from_page:
-                if 'episodes' in series:
-                    for season_episodes in series['episodes'].values():
-                        episodes_count += len(season_episodes)
-
-            if extract_episodes_option and episodes_count > 0:
-                print(f"✅ {len(series_from_page)} series con {episodes_count} episodios extraídos")
-            else:
-                print(f"✅ {len(series_from_page)} series extraídas (sin episodios)")
-    else:
-        # Extraer serie específica
-        print(f"⏳ Extrayendo serie específica...")
-        series_data = extract_series_data(url)
-        if series_data:
-            if extract_episodes_option:
-                print(f"⏳ Extrayendo episodios...")
-                episodes = extract_episodes_from_series(url)
-                if episodes:
-                    series_data['episodes'] = episodes
-                    episodes_count = sum(len(eps) for eps in episodes.values())
-                    total_episodes_count += episodes_count
-                    print(f"✅ Serie con {episodes_count} episodios extraída")
-                else:
-                    print(f"⚠️ Serie sin episodios encontrados")
-
-            url_series_data.append(series_data)
-            print(f"✅ Serie '{series_data['title']}' extraída")
-
-    # Si se extrajeron series de esta URL, guardar archivo individual
-    if url_series_data:
-        # Organizar por año para esta URL específica
-        url_series_by_year = organize_by_year(url_series_data)
-
-        # Guardar archivo JSON individual
-        json_filename = f"{url_index}.json"
-        save_to_json(url_series_by_year, json_filename)
-        individual_files.append(json_filename)
-
-        print(f"💾 Datos guardados en: {json_filename}")
-
-        # Agregar al total combinado
-        all_series_data.extend(url_series_data)
-        total_series_count += len(url_series_data)
-
-        # Agregar al HTML
-        html_content += f'<div class="url-section">\n'
-        html_content += f'<div class="url-header">\n'
-        html_content += f'<h2 class="url-title">📦 Fuente {url_index}: {url[:50]}...</h2>\n'
-        html_content += f'<a href="{json_filename}" class="json-link" target="_blank">📥 Descargar JSON</a>\n'
-        html_content += f'</div>\n'
-
-        # Estadísticas de esta URL
-        total_url_series = len(url_series_data)
-        total_url_years = len(url_series_by_year)
-
-        # Contar episodios para esta URL
-        url_episodes_count = 0
-        for series in url_series_data:
-            if 'episodes' in series:
-                for season_episodes in series['episodes'].values():
-                    url_episodes_count += len(season_episodes)
-
-        html_content += f'<div class="stats">\n'
-        html_content += f'<div class="stat"><span class="number">{total_url_series}</span><span class="label">Series</span></div>\n'
-        html_content += f'<div class="stat"><span class="number">{total_url_years}</span><span class="label">Años</span></div>\n'
-        if url_episodes_count > 0:
-            html_content += f'<div class="stat"><span class="number">{url_episodes_count}</span><span class="label">Episodios</span></div>\n'
-        html_content += f'</div>\n'
-
-        # Mostrar series
-        html_content += f'<div class="series-grid">\n'
-
-        for series in url_series_data:
-            has_episodes = 'episodes' in series and series['episodes']
-
-            html_content += f'<div class="series-card">\n'
-            html_content += f'<img src="{series.get("image_url", "")}" alt="{series["title"]}" class="series-img" onerror="this.src=\'https://via.placeholder.com/300x400/333/fff?text=No+Image\'">\n'
-            html_content += f'<div class="series-info">\n'
-            html_content += f'<h3 class="series-title">{series["title"]}</h3>\n'
-            html_content += f'<div class="series-meta">Año: {series.get("year", "N/A")} | Rating: {series.get("rating", "N/A")}</div>\n'
-
-            if series.get('description'):
-                html_content += f'<div class="series-desc">{series["description"][:150]}...</div>\n'
-
-            if has_episodes:
-                episodes_html = ""
-                for season_id, episodes in series['episodes'].items():
-                    episodes_html += f'<h4 class="season-title">{season_id}</h4>\n'
-                    episodes_html += f'<ul class="episode-list">\n'
-                    for episode in episodes[:5]:  # Mostrar solo 5 episodios
-                        ep_title = episode["title"][:40] + "..." if len(episode["title"]) > 40 else episode["title"]
-                        episodes_html += f'<li class="episode-item"><a href="{episode["url"]}" class="episode-link" target="_blank">{episode["episode_number"]} - {ep_title}</a></li>\n'
-
-                    if len(episodes) > 5:
-                        episodes_html += f'<li class="episode-item">... y {len(episodes) - 5} episodios más</li>\n'
-
-                    episodes_html += f'</ul>\n'
-
-                html_content += f'<button class="toggle-episodes" onclick="toggleEpisodes(this)">📺 Mostrar Episodios</button>\n'
-                html_content += f'<div class="episodes-section">\n'
-                html_content += episodes_html
-                html_content += f'</div>\n'
-
-            html_content += f'</div>\n'
-            html_content += f'</div>\n'
-
-        html_content += f'</div>\n'  # Cerrar series-grid
-        html_content += f'</div>\n'  # Cerrar url-section
-
-    else:
-        print(f"❌ No se encontraron series en esta URL")
-        html_content += f'<div class="url-section">\n'
-        html_content += f'<h2 class="url-title">📦 Fuente {url_index} - Sin datos</h2>\n'
-        html_content += f'<p style="color: #ff6b6b;">⚠️ No se encontraron series en esta URL</p>\n'
-        html_content += f'</div>\n'
-
-    # Pausa entre URLs
-    if url_index < len(urls_list):
-        print(f"⏳ Esperando 3 segundos...")
-        time.sleep(3)
-
-# Guardar archivo JSON combinado si hay múltiples URLs
-if len(individual_files) > 1 and all_series_data:
-    combined_series_by_year = organize_by_year(all_series_data)
-    save_to_json(combined_series_by_year, 'todas_las_series.json')
-    print(f"\n✅ Archivo combinado guardado en: todas_las_series.json")
-
-    # Agregar resumen al HTML
-    html_content += f'<div class="summary">\n'
-    html_content += f'<h2 class="summary-title">📊 RESUMEN TOTAL</h2>\n'
-    html_content += f'<div class="stats" style="justify-content: center;">\n'
-    html_content += f'<div class="stat"><span class="number">{total_series_count}</span><span class="label">Series totales</span></div>\n'
-    html_content += f'<div class="stat"><span class="number">{len(organize_by_year(all_series_data))}</span><span class="label">Años distintos</span></div>\n'
-    html_content += f'<div class="stat"><span class="number">{len(urls_list)}</span><span class="label">URLs procesadas</span></div>\n'
-    if total_episodes_count > 0:
-        html_content += f'<div class="stat"><span class="number">{total_episodes_count}</span><span class="label">Episodios totales</span></div>\n'
-    html_content += f'</div>\n'
-    html_content += f'<p style="margin-top: 20px;">\n'
-    html_content += f'<a href="todas_las_series.json" class="json-link" target="_blank">📦 Descargar JSON completo (todas_las_series.json)</a>\n'
-    html_content += f'</p>\n'
-    html_content += f'</div>\n'
-
-# Cerrar HTML
-html_content += """
+HTML_FOOTER = """
     </div>
     <script>
         function toggleEpisodes(button) {
@@ -701,33 +472,275 @@ html_content += """
 </html>
 """
 
-# Guardar HTML
-with open(html_filename, 'w', encoding='utf-8') as f:
-    f.write(html_content)
+# ============ PROGRAMA PRINCIPAL ============
+def main():
+    enable_cache()
+
+    print("=" * 60)
+    print("EXTRACTOR DE SERIES CUEVANA")
+    print("=" * 60)
+
+    # Preguntar qué extraer
+    print("\n¿Qué deseas extraer?")
+    print("1. Series de páginas de listado (ej: /serie/, /serie/page/2)")
+    print("2. Series específicas con episodios")
+    print("3. Solo información básica de series")
 
-print(f"\n✅ Catálogo HTML guardado en: {html_filename}")
+    option = input("\nSelecciona una opción (1-3): ").strip()
+
+    # Preguntar si extraer episodios para opción 1
+    extract_episodes_option = False
+    if option == '2':
+        extract_episodes_option = True
+    elif option == '1':
+        print("\n📺 ¿Deseas extraer también los episodios de cada serie?")
+        print("   Esto tomará MUCHO más tiempo (1-2 segundos por serie)")
+        print("   pero obtendrás la información completa de temporadas y episodios.")
+
+        episodes_choice = input("   ¿Extraer episodios? (s/n): ").strip().lower()
+        if episodes_choice == 's':
+            extract_episodes_option = True
+            print("   ⚠️  ADVERTENCIA: Esto puede tomar varios minutos dependiendo de la cantidad de series.")
+            print("   Se recomienda procesar pocas series a la vez (máximo 10).")
+            confirm = input("   ¿Continuar? (s/n): ").strip().lower()
+            if confirm != 's':
+                extract_episodes_option = False
+                print("   ✅ Solo se extraerá información básica de series.")
+
+    # Solicitar URLs
+    if option == '1':
+        print("\n📥 Introduce URLs de páginas de listado (separadas por comas):")
+        print("   Ejemplo: https://ww9.cuevana3.to/serie/")
+        print("            https://ww9.cuevana3.to/serie/page/2")
+
+        if extract_episodes_option:
+            print("\n   💡 CONSEJO: Procesa solo 1-2 páginas para no sobrecargar el servidor.")
+    else:
+        print("\n📥 Introduce URLs de series específicas (separadas por comas):")
+        print("   Ejemplo: https://ww9.cuevana3.to/serie/playing-gracie-darling")
+        print("            https://ww9.cuevana3.to/serie/wonder-man")
+
+    urls_input = input("\n🔗 URLs: ").strip()
+
+    # Configurar archivos de salida
+    html_filename = 'series_catalog.html'
+    individual_files = []
+    # Cada serie entra una vez al índice por año; los JSON y el resumen se leen de ahí
+    years = YearIndex()
+
+    # Iniciar HTML
+    catalog = CatalogWriter(html_filename, HTML_HEADER, HTML_FOOTER)
+
+    # Procesar cada URL individualmente
+    urls_list = [url.strip() for url in urls_input.split(',') if url.strip()]
+    total_series_count = 0
+    total_episodes_count = 0
+    # Máximo de peticiones que necesitó una serie, actualizado URL por URL
+    requests_per_series = 0
+
+    # Series ya vistas en esta corrida: cada una se descarga una sola vez aunque aparezca en varios listados
+    frontier = Frontier()
+
+    for url_index, url in enumerate(urls_list, 1):
+        print(f"\n{'='*60}")
+        print(f"📁 PROCESANDO URL {url_index}/{len(urls_list)}")
+        print(f"🔗 {url}")
+        print('='*60)
+
+        url_series_data = []
+
+        if option == '1':
+            # Extraer series de página de listado
+            print(f"⏳ Extrayendo series de la página de listado...")
+            series_from_page = extract_series_from_listing_page(url, extract_episodes_option, frontier)
+
+            if series_from_page:
+                url_series_data.extend(series_from_page)
+
+                # Contar episodios si se extrajeron
+                episodes_count = 0
+                for series in series_from_page:
+                    if 'episodes' in series:
+                        for season_episodes in series['episodes'].values():
+                            episodes_count += len(season_episodes)
+
+                if extract_episodes_option and episodes_count > 0:
+                    print(f"✅ {len(series_from_page)} series con {episodes_count} episodios extraídos")
+                else:
+                    print(f"✅ {len(series_from_page)} series extraídas (sin episodios)")
+        else:
+            # Extraer serie específica
+            print(f"⏳ Extrayendo serie específica...")
+            if extract_episodes_option:
+                series_data = extract_series_with_episodes(url)
+            else:
+                series_data = extract_series_data(url)
+            if series_data:
+                if extract_episodes_option:
+                    episodes = series_data.get('episodes')
+                    if episodes:
+                        episodes_count = sum(len(eps) for eps in episodes.values())
+                        total_episodes_count += episodes_count
+                        print(f"✅ Serie con {episodes_count} episodios extraída")
+                    else:
+                        print(f"⚠️ Serie sin episodios encontrados")
+
+                url_series_data.append(series_data)
+                print(f"✅ Serie '{series_data['title']}' extraída")
+
+        # Si se extrajeron series de esta URL, guardar archivo individual
+        if url_series_data:
+            # Organizar por año para esta URL específica
+            years.extend(url_series_data, url_index)
+            url_series_by_year = years.by_year(url_index)
+
+            # Guardar archivo JSON individual
+            json_filename = f"{url_index}.json"
+            years.write_json(json_filename, url_index)
+            individual_files.append(json_filename)
+
+            print(f"💾 Datos guardados en: {json_filename}")
+
+            # Agregar al total combinado
+            requests_per_series = max(requests_per_series,
+                                      max(get_fetch_count(series['url']) for series in url_series_data))
+            total_series_count += len(url_series_data)
+
+            # Agregar al HTML
+            catalog.write(f'<div class="url-section">\n')
+            catalog.write(f'<div class="url-header">\n')
+            catalog.write(f'<h2 class="url-title">📦 Fuente {url_index}: {url[:50]}...</h2>\n')
+            catalog.write(f'<a href="{json_filename}" class="json-link" target="_blank">📥 Descargar JSON</a>\n')
+            catalog.write(f'</div>\n')
+
+            # Estadísticas de esta URL
+            total_url_series = len(url_series_data)
+            total_url_years = len(url_series_by_year)
+
+            # Contar episodios para esta URL
+            url_episodes_count = 0
+            for series in url_series_data:
+                if 'episodes' in series:
+                    for season_episodes in series['episodes'].values():
+                        url_episodes_count += len(season_episodes)
+
+            catalog.write(f'<div class="stats">\n')
+            catalog.write(f'<div class="stat"><span class="number">{total_url_series}</span><span class="label">Series</span></div>\n')
+            catalog.write(f'<div class="stat"><span class="number">{total_url_years}</span><span class="label">Años</span></div>\n')
+            if url_episodes_count > 0:
+                catalog.write(f'<div class="stat"><span class="number">{url_episodes_count}</span><span class="label">Episodios</span></div>\n')
+            catalog.write(f'</div>\n')
+
+            # Mostrar series
+            catalog.write(f'<div class="series-grid">\n')
+
+            for series in url_series_data:
+                has_episodes = 'episodes' in series and series['episodes']
+
+                catalog.write(f'<div class="series-card">\n')
+                catalog.write(f'<img src="{series.get("image_url", "")}" alt="{series["title"]}" class="series-img" onerror="this.src=\'https://via.placeholder.com/300x400/333/fff?text=No+Image\'">\n')
+                catalog.write(f'<div class="series-info">\n')
+                catalog.write(f'<h3 class="series-title">{series["title"]}</h3>\n')
+                catalog.write(f'<div class="series-meta">Año: {series.get("year", "N/A")} | Rating: {series.get("rating", "N/A")}</div>\n')
+
+                if series.get('description'):
+                    catalog.write(f'<div class="series-desc">{series["description"][:150]}...</div>\n')
+
+                if has_episodes:
+                    episodes_html = ""
+                    for season_id, episodes in series['episodes'].items():
+                        episodes_html += f'<h4 class="season-title">{season_id}</h4>\n'
+                        episodes_html += f'<ul class="episode-list">\n'
+                        for episode in episodes[:5]:  # Mostrar solo 5 episodios
+                            ep_title = episode["title"][:40] + "..." if len(episode["title"]) > 40 else episode["title"]
+                            episodes_html += f'<li class="episode-item"><a href="{episode["url"]}" class="episode-link" target="_blank">{episode["episode_number"]} - {ep_title}</a></li>\n'
+
+                        if len(episodes) > 5:
+                            episodes_html += f'<li class="episode-item">... y {len(episodes) - 5} episodios más</li>\n'
+
+                        episodes_html += f'</ul>\n'
+
+                    catalog.write(f'<button class="toggle-episodes" onclick="toggleEpisodes(this)">📺 Mostrar Episodios</button>\n')
+                    catalog.write(f'<div class="episodes-section">\n')
+                    catalog.write(episodes_html)
+                    catalog.write(f'</div>\n')
+
+                catalog.write(f'</div>\n')
+                catalog.write(f'</div>\n')
+
+            catalog.write(f'</div>\n')  # Cerrar series-grid
+            catalog.write(f'</div>\n')  # Cerrar url-section
+
+        else:
+            print(f"❌ No se encontraron series en esta URL")
+            catalog.write(f'<div class="url-section">\n')
+            catalog.write(f'<h2 class="url-title">📦 Fuente {url_index} - Sin datos</h2>\n')
+            catalog.write(f'<p style="color: #ff6b6b;">⚠️ No se encontraron series en esta URL</p>\n')
+            catalog.write(f'</div>\n')
+
+    # Guardar archivo JSON combinado si hay múltiples URLs
+    if len(individual_files) > 1 and total_series_count:
+        years.write_json('todas_las_series.json')
+        print(f"\n✅ Archivo combinado guardado en: todas_las_series.json")
+
+        # Agregar resumen al HTML
+        catalog.write(f'<div class="summary">\n')
+        catalog.write(f'<h2 class="summary-title">📊 RESUMEN TOTAL</h2>\n')
+        catalog.write(f'<div class="stats" style="justify-content: center;">\n')
+        catalog.write(f'<div class="stat"><span class="number">{total_series_count}</span><span class="label">Series totales</span></div>\n')
+        catalog.write(f'<div class="stat"><span class="number">{years.year_count()}</span><span class="label">Años distintos</span></div>\n')
+        catalog.write(f'<div class="stat"><span class="number">{len(urls_list)}</span><span class="label">URLs procesadas</span></div>\n')
+        if total_episodes_count > 0:
+            catalog.write(f'<div class="stat"><span class="number">{total_episodes_count}</span><span class="label">Episodios totales</span></div>\n')
+        catalog.write(f'</div>\n')
+        catalog.write(f'<p style="margin-top: 20px;">\n')
+        catalog.write(f'<a href="todas_las_series.json" class="json-link" target="_blank">📦 Descargar JSON completo (todas_las_series.json)</a>\n')
+        catalog.write(f'</p>\n')
+        catalog.write(f'</div>\n')
+
+    # Cerrar HTML
+    catalog.close()
+
+    print(f"\n✅ Catálogo HTML guardado en: {html_filename}")
+
+    # Resumen final
+    print("\n" + "="*60)
+    print("📋 RESUMEN FINAL")
+    print("="*60)
+    print(f"🌐 URLs procesadas: {len(urls_list)}")
+    print(f"🎬 Series extraídas: {total_series_count}")
+    if total_series_count:
+        # Cuenta también las páginas servidas por la caché: con caché las peticiones de red pueden ser 0
+        print(f"🔁 Peticiones por serie (red + caché): {requests_per_series}")
+
+    cache_stats = get_cache_stats()
+    if cache_stats:
+        print(f"💽 Caché: {cache_stats['hits']} aciertos, {cache_stats['evictions']} desalojos")
+        print(f"🔄 Páginas revalidadas (304): {cache_stats['revalidated']} | descargadas de nuevo: {cache_stats['misses']}")
+
+    limiter_stats = get_limiter_stats()
+    print(f"⏱️ Espera del limitador: {limiter_stats['wait_seconds']:.1f}s | respuestas 429/503: {limiter_stats['throttled']}")
+    print(f"🧹 Descargas ahorradas por deduplicación: {frontier.saved}")
+
+    if total_episodes_count > 0:
+        print(f"📺 Episodios encontrados: {total_episodes_count}")
 
-# Resumen final
-print("\n" + "="*60)
-print("📋 RESUMEN FINAL")
-print("="*60)
-print(f"🌐 URLs procesadas: {len(urls_list)}")
-print(f"🎬 Series extraídas: {total_series_count}")
+    if individual_files:
+        print("\n📄 Archivos JSON generados:")
+        for json_file in individual_files:
+            print(f"  • {json_file}")
 
-if total_episodes_count > 0:
-    print(f"📺 Episodios encontrados: {total_episodes_count}")
+        if len(individual_files) > 1:
+            print(f"  • todas_las_series.json (combinado)")
 
-if individual_files:
-    print("\n📄 Archivos JSON generados:")
-    for json_file in individual_files:
-        print(f"  • {json_file}")
+    print(f"\n🖥️  Visualización:")
+    print(f"  • {html_filename} (abrir en navegador)")
 
-    if len(individual_files) > 1:
-        print(f"  • todas_las_series.json (combinado)")
+    write_report(http=get_stats(), cache=cache_stats, rate_limit=limiter_stats)
 
-print(f"\n🖥️  Visualización:")
-print(f"  • {html_filename} (abrir en navegador)")
+    print("\n" + "="*60)
+    print("✅ ¡Extracción completada exitosamente!")
+    print("="*60)
 
-print("\n" + "="*60)
-print("✅ ¡Extracción completada exitosamente!")
-print("="*60)
+if __name__ == "__main__":
+    main()
@@ -1,300 +1,155 @@
-import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
-import json
 import os
-import time
-import re
-
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog_writer import CatalogWriter
+from incremental_output import record_key
+from crawl_journal import CrawlJournal, journal_path
+from frontier import Frontier
+from lazy_catalog import LazyCatalogData, data_folder
+from ndjson_output import open_ndjson
+from http_client import fetch, enable_cache, get_cache_stats, get_fetch_count, get_limiter_stats, get_stats
+from profiling import timed, write_report
+from record_store import RecordStore
+from year_index import YearIndex
+from parse_pool import DEFAULT_WORKERS, configure_parse_pool, fetch_and_parse, fetch_and_parse_many, shutdown_parse_pool
+from series_parsing import parse_series_page, parse_episodes_page, parse_video_page
+
+# Procesos de parseo, páginas esperando parseo y descargas simultáneas
+PARSE_WORKERS = DEFAULT_WORKERS
+PARSE_QUEUE_DEPTH = PARSE_WORKERS * 2
+FETCH_WORKERS = 8
+
+# Páginas de episodio descargándose a la vez al buscar fuentes de video
+VIDEO_FETCH_WORKERS = 16
+
+# Desde esta cantidad de series el catálogo se genera en modo liviano (ver lazy_catalog)
+LAZY_CATALOG_MIN_SERIES = 2000
+
+# Con BSZ_NDJSON=series.jsonl(.gz/.zst) cada serie terminada se agrega también a ese archivo
+NDJSON_PATH = os.environ.get('BSZ_NDJSON')
+
+@timed('extract_series_data')
 def extract_series_data(series_url):
     """Extrae información básica de una serie"""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(series_url, headers=headers, timeout=15)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Extraer imagen principal
-        img_tag = soup.find('img', class_='lazy')
-        img_url = urljoin(series_url, img_tag.get('data-src')) if img_tag else None
-
-        # Extraer título
-        title_tag = soup.find('h1', class_='Title') or soup.find('h1')
-        title = title_tag.text.strip() if title_tag else series_url.split('/')[-1].replace('-', ' ').title()
-
-        # Extraer año
-        year_tag = soup.find('span', class_='Date')
-        year = year_tag.text.strip() if year_tag else ""
-
-        # Extraer rating
-        rating_tag = soup.find('span', class_='Vote')
-        rating = rating_tag.text.strip() if rating_tag else ""
-
-        # Extraer descripción
-        desc_tag = soup.find('div', class_='Description')
-        description = ""
-        if desc_tag:
-            p_tags = desc_tag.find_all('p')
-            for p in p_tags:
-                if p.text and not p.find('span'):
-                    description = p.text.strip()
-                    break
-
-        # Extraer género
-        genre_tag = soup.find('p', class_='Genre')
-        genre = []
-        if genre_tag:
-            genre_text = genre_tag.text.replace('Género:', '').replace('Genre:', '').strip()
-            if genre_text:
-                genre = [g.strip() for g in genre_text.split(',')]
-
-        return {
-            'title': title,
-            'year': year,
-            'rating': rating,
-            'description': description,
-            'genre': genre,
-            'image_url': img_url,
-            'url': series_url
-        }
+        return fetch_and_parse(series_url, parse_series_page)
 
     except Exception as e:
         print(f"Error extrayendo datos de {series_url}: {e}")
         return None
 
+@timed('extract_video_sources')
 def extract_video_sources(episode_url):
     """Extrae las fuentes de video de un episodio"""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(episode_url, headers=headers, timeout=15)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        video_sources = []
-
-        # Buscar todos los iframes con clase 'no-you'
-        iframes = soup.find_all('iframe', class_='no-you')
-
-        for iframe in iframes:
-            data_src = iframe.get('data-src', '')
-            src = iframe.get('src', '')
-
-            # Preferir data-src, sino src
-            video_url = data_src if data_src else src
-
-            if video_url and video_url.startswith('http'):
-                # Extraer el dominio para identificar el servicio
-                domain_match = re.search(r'https?://([^/]+)', video_url)
-                domain = domain_match.group(1) if domain_match else 'unknown'
-
-                # Limpiar el dominio para nombre más legible
-                clean_domain = domain.replace('www.', '').replace('.com', '').replace('.to', '').replace('.sx', '').replace('.net', '')
-
-                video_sources.append({
-                    'service': clean_domain,
-                    'url': video_url,
-                    'domain': domain
-                })
-
-        # Si no hay iframes, buscar otros reproductores
-        if not video_sources:
-            # Buscar divs de reproductor
-            player_divs = soup.find_all('div', class_='TPlayerTb')
-            for player in player_divs:
-                iframe = player.find('iframe')
-                if iframe:
-                    data_src = iframe.get('data-src', '')
-                    src = iframe.get('src', '')
-                    video_url = data_src if data_src else src
-
-                    if video_url and video_url.startswith('http'):
-                        domain_match = re.search(r'https?://([^/]+)', video_url)
-                        domain = domain_match.group(1) if domain_match else 'unknown'
-                        clean_domain = domain.replace('www.', '').replace('.com', '').replace('.to', '').replace('.sx', '').replace('.net', '')
-
-                        video_sources.append({
-                            'service': clean_domain,
-                            'url': video_url,
-                            'domain': domain
-                        })
-
-        return video_sources
+        return fetch_and_parse(episode_url, parse_video_page)
 
     except Exception as e:
         print(f"  ❌ Error extrayendo fuentes de video: {e}")
         return []
 
-def extract_episodes_from_series(series_url, extract_videos=False):
-    """Extrae episodios de una serie específica"""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(series_url, headers=headers, timeout=15)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        episodes_data = {}
+def resolve_video_sources(episodes, journal=None, on_episode=None):
+    """Extrae las fuentes de video de una lista de episodios (de una o varias series) en paralelo
+
+    Hasta ``VIDEO_FETCH_WORKERS`` páginas de episodio se descargan a la vez; los
+    resultados se agregan al dict de cada episodio en el orden de la lista.
+    ``on_episode(posición)`` se llama apenas queda listo cada episodio.
+    """
+    pending = []
+    for position, episode_data in enumerate(episodes):
+        video_sources = journal.get('episode', episode_data['url']) if journal else None
+        if video_sources is None:
+            pending.append((position, episode_data))
+            continue
+        if video_sources:
+            episode_data['video_sources'] = video_sources
+        if on_episode:
+            on_episode(position)
+
+    if not pending:
+        return
+
+    print(f"      🎬 Extrayendo fuentes de video de {len(pending)} episodios ({VIDEO_FETCH_WORKERS} en paralelo)...")
+    results = fetch_and_parse_many([episode_data['url'] for _, episode_data in pending], parse_video_page,
+                                   fetch_workers=VIDEO_FETCH_WORKERS)
+    for idx, ((position, episode_data), (_, video_sources)) in enumerate(zip(pending, results), 1):
+        if isinstance(video_sources, Exception):
+            print(f"      ❌ [{idx}/{len(pending)}] Error extrayendo fuentes de video: {video_sources}")
+            video_sources = []
+        if journal:
+            journal.put('episode', episode_data['url'], video_sources)
+        if video_sources:
+            episode_data['video_sources'] = video_sources
+            print(f"      ✅ [{idx}/{len(pending)}] {len(video_sources)} fuentes encontradas")
+        else:
+            print(f"      ⚠️ [{idx}/{len(pending)}] Sin fuentes de video")
+        if on_episode:
+            on_episode(position)
 
-        # Buscar selector de temporadas
-        season_select = soup.find('select', id='select-season')
+def all_episodes(episodes_data):
+    """Los episodios de todas las temporadas, en orden"""
+    return [episode for episodes in (episodes_data or {}).values() for episode in episodes]
 
-        if season_select:
-            # Extraer todas las temporadas
-            season_options = season_select.find_all('option')
-            print(f"  ⏳ Encontradas {len(season_options)} temporadas")
+def add_video_sources(episodes_data, journal=None):
+    """Extrae las fuentes de video de cada episodio y las agrega a su dict"""
+    resolve_video_sources(all_episodes(episodes_data), journal)
 
-            for option in season_options:
-                season_value = option.get('value', '').strip()
-                if season_value:
-                    season_id = f"season-{season_value}"
+def finish_episodes(episodes_data, extract_videos=False, journal=None):
+    """Muestra las temporadas encontradas y, si se pide, busca sus fuentes de video"""
+    if not episodes_data:
+        print(f"  ⚠️ No se encontró lista de episodios")
+        return
 
-                    # Buscar la lista de episodios para esta temporada
-                    episodes_list = soup.find('ul', id=season_id, class_='all-episodes')
+    for season_id, episodes in episodes_data.items():
+        print(f"    ✅ Temporada {season_id.replace('season-', '')}: {len(episodes)} episodios")
 
-                    if episodes_list:
-                        episodes = extract_episodes_from_ul(episodes_list, series_url, extract_videos)
-                        if episodes:
-                            episodes_data[season_id] = episodes
-                            print(f"    ✅ Temporada {season_value}: {len(episodes)} episodios")
-                    else:
-                        # Intentar buscar cualquier lista con episodios
-                        all_lists = soup.find_all('ul', class_='all-episodes')
-                        if all_lists:
-                            season_num = int(season_value) if season_value.isdigit() else 1
-                            if len(all_lists) >= season_num:
-                                episodes = extract_episodes_from_ul(all_lists[season_num-1], series_url, extract_videos)
-                                if episodes:
-                                    episodes_data[season_id] = episodes
-                                    print(f"    ✅ Temporada {season_value}: {len(episodes)} episodios")
-        else:
-            # Si no hay selector, buscar episodios directamente
-            episodes_list = soup.find('ul', class_='all-episodes')
-            if not episodes_list:
-                # Intentar con otra clase
-                episodes_list = soup.find('ul', class_='episodes')
-
-            if episodes_list:
-                episodes = extract_episodes_from_ul(episodes_list, series_url, extract_videos)
-                if episodes:
-                    episodes_data['season-1'] = episodes
-                    print(f"  ✅ Encontrados {len(episodes)} episodios")
-            else:
-                print(f"  ⚠️ No se encontró lista de episodios")
+    if extract_videos:
+        add_video_sources(episodes_data, journal)
 
-        return episodes_data
+def extract_episodes_from_series(series_url, extract_videos=False, journal=None):
+    """Extrae episodios de una serie específica"""
+    try:
+        episodes_data = fetch_and_parse(series_url, parse_episodes_page)
 
     except Exception as e:
         print(f"  ❌ Error extrayendo episodios: {e}")
         return {}
 
-def extract_episodes_from_ul(episodes_list, base_url, extract_videos=False):
-    """Extrae episodios de una lista UL"""
-    episodes = []
-
-    # Buscar todos los items de episodio
-    episode_items = episodes_list.find_all('li', class_=lambda x: x and 'TPost' in x)
-
-    if not episode_items:
-        # Intentar con cualquier li
-        episode_items = episodes_list.find_all('li')
-
-    print(f"    Encontrados {len(episode_items)} items de episodio")
-
-    for idx, item in enumerate(episode_items, 1):
-        try:
-            # Extraer enlace del episodio
-            link_tag = item.find('a')
-            if not link_tag:
-                continue
-
-            episode_path = link_tag.get('href', '')
-            if not episode_path:
-                continue
+    finish_episodes(episodes_data, extract_videos, journal)
+    return episodes_data
 
-            # Completar la URL si es relativa
-            episode_url = urljoin(base_url, episode_path)
-
-            # Extraer título
-            title_tag = item.find('h2', class_='Title')
-            if not title_tag:
-                title_tag = item.find('h2')
-
-            episode_title = title_tag.text.strip() if title_tag else ""
-
-            # Extraer número de episodio
-            episode_num_tag = item.find('span', class_='Year')
-            episode_num = episode_num_tag.text.strip() if episode_num_tag else ""
-
-            # Si no hay número, intentar extraer del título
-            if not episode_num and episode_title:
-                # Buscar patrones como 1x1, 1x2, etc.
-                match = re.search(r'(\d+x\d+)', episode_title)
-                if match:
-                    episode_num = match.group(1)
-
-            # Extraer imagen del episodio
-            img_tag = item.find('img', class_='lazy')
-            episode_img = ""
-            if img_tag:
-                img_src = img_tag.get('data-src') or img_tag.get('src')
-                if img_src:
-                    episode_img = urljoin(base_url, img_src)
-
-            # Estructura básica del episodio
-            episode_data = {
-                'title': episode_title,
-                'episode_number': episode_num,
-                'url': episode_url,
-                'image_url': episode_img
-            }
-
-            # Extraer fuentes de video si se solicita
-            if extract_videos:
-                print(f"      [{idx}/{len(episode_items)}] Extrayendo fuentes de video...")
-                video_sources = extract_video_sources(episode_url)
-                if video_sources:
-                    episode_data['video_sources'] = video_sources
-                    print(f"      ✅ {len(video_sources)} fuentes encontradas")
-                else:
-                    print(f"      ⚠️ Sin fuentes de video")
-
-                # Pequeña pausa entre episodios
-                time.sleep(0.5)
-
-            episodes.append(episode_data)
+def extract_series_with_episodes(series_url, extract_videos=False, journal=None):
+    """Descarga y parsea la página de la serie una sola vez para obtener datos y episodios"""
+    try:
+        series_data = fetch_and_parse(series_url, parse_series_page, True)
 
-        except Exception as e:
-            print(f"      ❌ Error procesando episodio: {e}")
-            continue
+    except Exception as e:
+        print(f"Error extrayendo datos de {series_url}: {e}")
+        return None
 
-    return episodes
+    finish_episodes(series_data.get('episodes', {}), extract_videos, journal)
+    return series_data
 
-def save_to_json(data, filename):
-    """Guarda datos en formato JSON"""
-    with open(filename, 'w', encoding='utf-8') as file:
-        json.dump(data, file, ensure_ascii=False, indent=4)
+def extract_series_from_listing_page(page_url, extract_episodes=False, extract_videos=False, journal=None, frontier=None,
+                                     ndjson=None):
+    """Extrae todas las series de una página de listado
 
-def extract_series_from_listing_page(page_url, extract_episodes=False, extract_videos=False):
-    """Extrae todas las series de una página de listado"""
+    Con ``ndjson`` cada serie nueva se escribe en ese archivo apenas está completa.
+    """
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(page_url, headers=headers, timeout=15)
-        response.raise_for_status()
+        response = fetch(page_url)
 
         soup = BeautifulSoup(response.text, 'html.parser')
 
         series_list = []
         series_links = []
+        if frontier is None:
+            # Sin frontera de la corrida: deduplicar al menos dentro de esta página
+            frontier = Frontier()
 
         # Buscar en contenedores TPost (que contienen series)
         series_containers = soup.find_all('div', class_='TPost')
@@ -304,45 +159,90 @@ def extract_series_from_listing_page(page_url, extract_episodes=False, extract_v
                 link_tag = container.find('a')
                 if link_tag and link_tag.get('href'):
                     href = link_tag['href']
-                    if '/serie/' in href and href not in series_links:
+                    if '/serie/' in href:
                         series_url = urljoin(page_url, href)
-                        series_links.append(series_url)
+                        if frontier.add(series_url):
+                            series_links.append(series_url)
             except:
                 continue
 
         print(f"  📄 Encontrados {len(series_links)} enlaces de series")
 
-        # Procesar cada serie
+        # Las series ya terminadas en una corrida anterior salen del journal
+        done_links = {link for link in series_links if journal and journal.done('series', link)}
+        pending_links = [link for link in series_links if link not in done_links]
+        if done_links:
+            print(f"  ♻️ {len(done_links)} series ya procesadas en la corrida anterior")
+
+        # Descargar las series en paralelo y parsearlas en el pool de procesos
+        results = fetch_and_parse_many(pending_links, parse_series_page, extract_episodes, fetch_workers=FETCH_WORKERS)
+        # Series que esperan sus fuentes de video antes de ir al NDJSON y al journal
+        resolve_videos = extract_episodes and extract_videos
+        new_series = []
+
+        def save_series(series_url, series_data):
+            if ndjson:
+                ndjson.write(series_data)
+            if journal:
+                journal.put('series', series_url, series_data)
+
         for idx, series_url in enumerate(series_links, 1):
             print(f"\n    [{idx}/{len(series_links)}] Procesando serie...")
 
-            try:
-                # Extraer datos básicos
-                series_data = extract_series_data(series_url)
-                if series_data:
-                    print(f"      ✅ '{series_data['title'][:30]}...' encontrada")
-
-                    # Extraer episodios si se solicita
-                    if extract_episodes:
-                        print(f"      ⏳ Extrayendo episodios...")
-                        episodes = extract_episodes_from_series(series_url, extract_videos)
-                        if episodes:
-                            series_data['episodes'] = episodes
-                            total_episodes = sum(len(eps) for eps in episodes.values())
-                            print(f"      ✅ {total_episodes} episodios extraídos")
-                        else:
-                            print(f"      ⚠️ No se encontraron episodios")
-
-                    series_list.append(series_data)
-                else:
-                    print(f"      ❌ Error extrayendo datos de la serie")
+            if series_url in done_links:
+                series_data = journal.get('series', series_url)
+                print(f"      ✅ '{series_data['title'][:30]}...' reanudada")
+                series_list.append(series_data)
+                continue
 
-            except Exception as e:
-                print(f"      ❌ Error procesando serie: {e}")
+            _, series_data = next(results)
+            if isinstance(series_data, Exception):
+                print(f"      ❌ Error procesando serie: {series_data}")
                 continue
 
-            # Pausa para no sobrecargar
-            time.sleep(1)
+            print(f"      ✅ '{series_data['title'][:30]}...' encontrada")
+
+            # Completar episodios si se solicitan
+            if extract_episodes:
+                episodes = series_data.get('episodes')
+                # Sin episodios, finish_episodes ya lo avisa
+                finish_episodes(episodes)
+                if episodes:
+                    total_episodes = sum(len(eps) for eps in episodes.values())
+                    print(f"      ✅ {total_episodes} episodios extraídos")
+
+            if resolve_videos:
+                new_series.append((series_url, series_data))
+            else:
+                save_series(series_url, series_data)
+            series_list.append(series_data)
+
+        # Fuentes de video de todos los episodios de la página en una sola etapa concurrente;
+        # cada serie se guarda (en orden) apenas terminan todos sus episodios
+        if resolve_videos and new_series:
+            print(f"\n    🎬 Fuentes de video de {len(new_series)} series")
+            episodes = []
+            owners = []
+            remaining = []
+            for number, (_, series_data) in enumerate(new_series):
+                series_episodes = all_episodes(series_data.get('episodes'))
+                episodes.extend(series_episodes)
+                owners.extend([number] * len(series_episodes))
+                remaining.append(len(series_episodes))
+            saved = 0
+
+            def save_finished():
+                nonlocal saved
+                while saved < len(new_series) and remaining[saved] == 0:
+                    save_series(*new_series[saved])
+                    saved += 1
+
+            def on_episode(position):
+                remaining[owners[position]] -= 1
+                save_finished()
+
+            save_finished()
+            resolve_video_sources(episodes, journal, on_episode)
 
         return series_list
 
@@ -350,100 +250,8 @@ def extract_series_from_listing_page(page_url, extract_episodes=False, extract_v
         print(f"  ❌ Error extrayendo series de {page_url}: {e}")
         return []
 
-def organize_by_year(series_list):
-    """Organiza series por año"""
-    organized = {}
-
-    for series in series_list:
-        year = series.get('year', 'Sin año')
-        if year not in organized:
-            organized[year] = []
-        organized[year].append(series)
-
-    # Ordenar años
-    sorted_years = sorted(
-        organized.keys(), 
-        reverse=True, 
-        key=lambda x: (0, int(x)) if x.isdigit() else (1, x)
-    )
-
-    return {year: organized[year] for year in sorted_years}
-
-# ============ PROGRAMA PRINCIPAL ============
-print("=" * 60)
-print("EXTRACTOR COMPLETO DE SERIES CUEVANA")
-print("=" * 60)
-
-# Preguntar qué extraer
-print("\n¿Qué deseas extraer?")
-print("1. Series de páginas de listado (ej: /serie/, /serie/page/2)")
-print("2. Series específicas")
-print("3. Solo información básica de series")
-
-option = input("\nSelecciona una opción (1-3): ").strip()
-
-# Configurar opciones de extracción
-extract_episodes_option = False
-extract_videos_option = False
-
-if option == '1':
-    print("\n📺 ¿Deseas extraer también los episodios de cada serie?")
-    episodes_choice = input("   ¿Extraer episodios? (s/n): ").strip().lower()
-
-    if episodes_choice == 's':
-        extract_episodes_option = True
-
-        print("\n🎬 ¿Deseas extraer también las fuentes de video de cada episodio?")
-        print("   Esto tomará MUCHO más tiempo pero obtendrás los enlaces directos a los videos.")
-        videos_choice = input("   ¿Extraer fuentes de video? (s/n): ").strip().lower()
-
-        if videos_choice == 's':
-            extract_videos_option = True
-            print("\n   ⚠️  ADVERTENCIA: Extraer fuentes de video puede tomar MUCHO tiempo.")
-            print("   Se recomienda procesar solo 1 página con pocas series.")
-            confirm = input("   ¿Continuar? (s/n): ").strip().lower()
-            if confirm != 's':
-                extract_videos_option = False
-                print("   ✅ Solo se extraerán episodios sin fuentes de video.")
-        else:
-            print("   ✅ Solo se extraerán episodios sin fuentes de video.")
-
-    else:
-        print("   ✅ Solo se extraerá información básica de series.")
-
-elif option == '2':
-    extract_episodes_option = True
-
-    print("\n🎬 ¿Deseas extraer también las fuentes de video de cada episodio?")
-    videos_choice = input("   ¿Extraer fuentes de video? (s/n): ").strip().lower()
-
-    if videos_choice == 's':
-        extract_videos_option = True
-        print("   ⚠️  Se extraerán fuentes de video de cada episodio.")
-
-# Solicitar URLs
-if option == '1':
-    print("\n📥 Introduce URLs de páginas de listado (separadas por comas):")
-    print("   Ejemplo: https://ww9.cuevana3.to/serie/")
-    print("            https://ww9.cuevana3.to/serie/page/2")
-
-    if extract_videos_option:
-        print("\n   💡 CONSEJO EXTREMO: Con fuentes de video, procesa solo 1 página.")
-    elif extract_episodes_option:
-        print("\n   💡 CONSEJO: Procesa solo 1-2 páginas para no sobrecargar.")
-else:
-    print("\n📥 Introduce URLs de series específicas (separadas por comas):")
-    print("   Ejemplo: https://ww9.cuevana3.to/serie/belleza-perfecta")
-
-urls_input = input("\n🔗 URLs: ").strip()
-
-# Configurar archivos de salida
-html_filename = 'series_catalog.html'
-all_series_data = []
-individual_files = []
-
-# Iniciar HTML
-html_content = """<!DOCTYPE html>
+# Plantilla del catálogo HTML (cabecera con estilos y cierre con el script de episodios)
+HTML_HEADER = """<!DOCTYPE html>
 <html lang="es">
 <head>
     <meta charset="UTF-8">
@@ -713,246 +521,7 @@ html_content = """<!DOCTYPE html>
         <div class="subtitle">Extraído de Cuevana • Incluye episodios y fuentes de video</div>
 """
 
-# Procesar cada URL individualmente
-urls_list = [url.strip() for url in urls_input.split(',') if url.strip()]
-total_series_count = 0
-total_episodes_count = 0
-total_video_sources = 0
-
-for url_index, url in enumerate(urls_list, 1):
-    print(f"\n{'='*60}")
-    print(f"📁 PROCESANDO URL {url_index}/{len(urls_list)}")
-    print(f"🔗 {url}")
-    print('='*60)
-
-    url_series_data = []
-    url_episodes_count = 0
-    url_video_sources = 0
-
-    if option == '1':
-        # Extraer series de página de listado
-        print(f"⏳ Extrayendo series de la página de listado...")
-        series_from_page = extract_series_from_listing_page(
-            url, 
-            extract_episodes_option, 
-            extract_videos_option
-        )
-
-        if series_from_page:
-            url_series_data.extend(series_from_page)
-
-            # Contar estadísticas
-            for series in series_from_page:
-                if 'episodes' in series:
-                    for season_episodes in series['episodes'].values():
-                        url_episodes_count += len(season_episodes)
-                        for episode in season_episodes:
-                            if 'video_sources' in episode:
-                                url_video_sources += len(episode['video_sources'])
-
-            stats_msg = f"✅ {len(series_from_page)} series extraídas"
-            if url_episodes_count > 0:
-                stats_msg += f", {url_episodes_count} episodios"
-            if url_video_sources > 0:
-                stats_msg += f", {url_video_sources} fuentes de video"
-
-            print(stats_msg)
-    else:
-        # Extraer serie específica
-        print(f"⏳ Extrayendo serie específica...")
-        series_data = extract_series_data(url)
-        if series_data:
-            if extract_episodes_option:
-                print(f"⏳ Extrayendo episodios...")
-                episodes = extract_episodes_from_series(url, extract_videos_option)
-                if episodes:
-                    series_data['episodes'] = episodes
-                    url_episodes_count = sum(len(eps) for eps in episodes.values())
-
-                    # Contar fuentes de video
-                    for season_episodes in episodes.values():
-                        for episode in season_episodes:
-                            if 'video_sources' in episode:
-                                url_video_sources += len(episode['video_sources'])
-
-                    stats_msg = f"✅ Serie con {url_episodes_count} episodios"
-                    if url_video_sources > 0:
-                        stats_msg += f" y {url_video_sources} fuentes de video"
-                    print(stats_msg)
-                else:
-                    print(f"⚠️ Serie sin episodios encontrados")
-
-            url_series_data.append(series_data)
-
-    # Si se extrajeron series de esta URL, guardar archivo individual
-    if url_series_data:
-        # Organizar por año para esta URL específica
-        url_series_by_year = organize_by_year(url_series_data)
-
-        # Guardar archivo JSON individual
-        json_filename = f"{url_index}.json"
-        save_to_json(url_series_by_year, json_filename)
-        individual_files.append(json_filename)
-
-        print(f"💾 Datos guardados en: {json_filename}")
-
-        # Agregar al total combinado
-        all_series_data.extend(url_series_data)
-        total_series_count += len(url_series_data)
-        total_episodes_count += url_episodes_count
-        total_video_sources += url_video_sources
-
-        # Agregar al HTML
-        html_content += f'<div class="url-section">\n'
-        html_content += f'<div class="url-header">\n'
-        html_content += f'<h2 class="url-title">📦 Fuente {url_index}</h2>\n'
-        html_content += f'<a href="{json_filename}" class="json-link" target="_blank">📥 Descargar JSON</a>\n'
-        html_content += f'</div>\n'
-        html_content += f'<p style="color: #90e0ef; margin-bottom: 10px;">URL: {url}</p>\n'
-
-        # Estadísticas de esta URL
-        total_url_series = len(url_series_data)
-        total_url_years = len(url_series_by_year)
-
-        html_content += f'<div class="stats">\n'
-        html_content += f'<div class="stat"><span class="number">{total_url_series}</span><span class="label">Series</span></div>\n'
-        html_content += f'<div class="stat"><span class="number">{total_url_years}</span><span class="label">Años</span></div>\n'
-        if url_episodes_count > 0:
-            html_content += f'<div class="stat"><span class="number">{url_episodes_count}</span><span class="label">Episodios</span></div>\n'
-        if url_video_sources > 0:
-            html_content += f'<div class="stat"><span class="number">{url_video_sources}</span><span class="label">Fuentes Video</span></div>\n'
-        html_content += f'</div>\n'
-
-        # Mostrar series organizadas por año
-        for year, year_series in url_series_by_year.items():
-            html_content += f'<h3 style="color: #00b4d8; margin: 25px 0 15px 0; border-bottom: 2px solid #00b4d8; padding-bottom: 10px;">🎬 Año {year} ({len(year_series)} series)</h3>\n'
-            html_content += f'<div class="series-grid">\n'
-
-            for series in year_series:
-                has_episodes = 'episodes' in series and series['episodes']
-                has_video_sources = False
-
-                if has_episodes:
-                    for season_episodes in series['episodes'].values():
-                        for episode in season_episodes:
-                            if 'video_sources' in episode:
-                                has_video_sources = True
-                                break
-                        if has_video_sources:
-                            break
-
-                html_content += f'<div class="series-card">\n'
-                html_content += f'<img src="{series.get("image_url", "")}" alt="{series["title"]}" class="series-img" onerror="this.src=\'https://via.placeholder.com/350x450/333/fff?text=No+Image\'">\n'
-                html_content += f'<div class="series-content">\n'
-                html_content += f'<h3 class="series-title">{series["title"]}</h3>\n'
-                html_content += f'<div class="series-meta">📅 {series.get("year", "N/A")} | ⭐ {series.get("rating", "N/A")}</div>\n'
-
-                if series.get('genre'):
-                    html_content += f'<div class="series-genres">\n'
-                    for genre in series['genre'][:3]:
-                        html_content += f'<span class="genre-tag">{genre}</span>\n'
-                    if len(series['genre']) > 3:
-                        html_content += f'<span class="genre-tag">+{len(series["genre"])-3}</span>\n'
-                    html_content += f'</div>\n'
-
-                if series.get('description'):
-                    html_content += f'<div class="series-desc">{series["description"][:200]}...</div>\n'
-
-                # Mostrar episodios si existen
-                if has_episodes:
-                    episodes_html = ""
-                    for season_id, episodes in series['episodes'].items():
-                        episodes_html += f'<div class="season">\n'
-                        episodes_html += f'<h4 class="season-title">{season_id}</h4>\n'
-
-                        for episode in episodes[:3]:  # Mostrar máximo 3 episodios por temporada
-                            episodes_html += f'<div class="episode">\n'
-                            episodes_html += f'<div class="episode-header">\n'
-                            episodes_html += f'<h5 class="episode-title">{episode["title"][:40]}{"..." if len(episode["title"]) > 40 else ""}</h5>\n'
-                            episodes_html += f'<span class="episode-number">{episode["episode_number"]}</span>\n'
-                            episodes_html += f'</div>\n'
-                            episodes_html += f'<div class="episode-url">🔗 <a href="{episode["url"]}" target="_blank" style="color: #90e0ef;">Ver episodio</a></div>\n'
-
-                            # Mostrar fuentes de video si existen
-                            if 'video_sources' in episode and episode['video_sources']:
-                                episodes_html += f'<div class="video-sources">\n'
-                                episodes_html += f'<h6 class="sources-title">🎬 Fuentes de video:</h6>\n'
-                                for source in episode['video_sources'][:3]:  # Máximo 3 fuentes
-                                    episodes_html += f'<div class="source-item">\n'
-                                    episodes_html += f'<span class="source-service">{source["service"]}</span>\n'
-                                    episodes_html += f'<a href="{source["url"]}" class="source-url" target="_blank" title="{source["url"]}">Ver video</a>\n'
-                                    episodes_html += f'</div>\n'
-                                if len(episode['video_sources']) > 3:
-                                    episodes_html += f'<div style="color: #aaa; font-size: 12px; text-align: center;">+ {len(episode["video_sources"]) - 3} fuentes más</div>\n'
-                                episodes_html += f'</div>\n'
-
-                            episodes_html += f'</div>\n'
-
-                        if len(episodes) > 3:
-                            episodes_html += f'<div style="color: #aaa; text-align: center; padding: 10px;">... y {len(episodes) - 3} episodios más</div>\n'
-
-                        episodes_html += f'</div>\n'
-
-                    # Botón toggle para episodios
-                    toggle_text = "📺 Mostrar Episodios"
-                    if has_video_sources:
-                        toggle_text = "🎬 Mostrar Episodios y Videos"
-
-                    html_content += f'<button class="episodes-toggle" onclick="toggleEpisodes(this)">\n'
-                    html_content += f'<span>{toggle_text}</span>\n'
-                    html_content += f'<span>▼</span>\n'
-                    html_content += f'</button>\n'
-                    html_content += f'<div class="episodes-container">\n'
-                    html_content += episodes_html
-                    html_content += f'</div>\n'
-
-                html_content += f'</div>\n'  # Cerrar series-content
-                html_content += f'</div>\n'  # Cerrar series-card
-
-            html_content += f'</div>\n'  # Cerrar series-grid
-
-        html_content += f'</div>\n'  # Cerrar url-section
-
-    else:
-        print(f"❌ No se encontraron series en esta URL")
-        html_content += f'<div class="url-section">\n'
-        html_content += f'<h2 class="url-title">📦 Fuente {url_index} - Sin datos</h2>\n'
-        html_content += f'<p style="color: #ff6b6b;">⚠️ No se encontraron series en esta URL</p>\n'
-        html_content += f'</div>\n'
-
-    # Pausa entre URLs
-    if url_index < len(urls_list):
-        print(f"⏳ Esperando 3 segundos...")
-        time.sleep(3)
-
-# Guardar archivo JSON combinado si hay múltiples URLs
-if len(individual_files) > 1 and all_series_data:
-    combined_series_by_year = organize_by_year(all_series_data)
-    save_to_json(combined_series_by_year, 'todas_las_series.json')
-    print(f"\n✅ Archivo combinado guardado en: todas_las_series.json")
-
-# Agregar resumen final al HTML
-html_content += f'<div class="summary">\n'
-html_content += f'<h2 class="summary-title">📊 RESUMEN TOTAL DE EXTRACCIÓN</h2>\n'
-html_content += f'<div class="stats" style="justify-content: center;">\n'
-html_content += f'<div class="stat"><span class="number">{total_series_count}</span><span class="label">Series Totales</span></div>\n'
-html_content += f'<div class="stat"><span class="number">{len(organize_by_year(all_series_data))}</span><span class="label">Años Distintos</span></div>\n'
-html_content += f'<div class="stat"><span class="number">{len(urls_list)}</span><span class="label">URLs Procesadas</span></div>\n'
-if total_episodes_count > 0:
-    html_content += f'<div class="stat"><span class="number">{total_episodes_count}</span><span class="label">Episodios Totales</span></div>\n'
-if total_video_sources > 0:
-    html_content += f'<div class="stat"><span class="number">{total_video_sources}</span><span class="label">Fuentes de Video</span></div>\n'
-html_content += f'</div>\n'
-
-if len(individual_files) > 1:
-    html_content += f'<p style="margin-top: 20px;">\n'
-    html_content += f'<a href="todas_las_series.json" class="json-link" target="_blank" style="font-size: 1.1rem; padding: 15px 30px;">📦 Descargar JSON Completo (todas_las_series.json)</a>\n'
-    html_content += f'</p>\n'
-
-html_content += f'</div>\n'
-
-# Cerrar HTML
-html_content += """
+HTML_FOOTER = """
     </div>
     <script>
         function toggleEpisodes(button) {
@@ -976,32 +545,497 @@ html_content += """
 </html>
 """
 
-# Guardar HTML
-with open(html_filename, 'w', encoding='utf-8') as f:
-    f.write(html_content)
+# ============ PROGRAMA PRINCIPAL ============
+def count_episodes(series_list):
+    """Cantidad de episodios y de fuentes de video de una lista de series"""
+    episodes_count = 0
+    video_sources = 0
+    for series in series_list:
+        for season_episodes in series.get('episodes', {}).values():
+            episodes_count += len(season_episodes)
+            for episode in season_episodes:
+                video_sources += len(episode.get('video_sources', []))
+    return episodes_count, video_sources
+
+@timed('html.series_section')
+def write_series_section(catalog, url_index, url, url_series_data, url_series_by_year, json_filename, images=None,
+                         lazy_data=None):
+    """Escribe en el catálogo la sección de una URL de entrada
+
+    ``images`` reemplaza URLs de pósters por sus copias locales. Con
+    ``lazy_data`` cada año queda como una grilla vacía y las tarjetas van a
+    los bloques de datos del catálogo liviano.
+    """
+    images = images or {}
+    url_episodes_count, url_video_sources = count_episodes(url_series_data)
+
+    catalog.write(f'<div class="url-section">\n')
+    catalog.write(f'<div class="url-header">\n')
+    catalog.write(f'<h2 class="url-title">📦 Fuente {url_index}</h2>\n')
+    catalog.write(f'<a href="{json_filename}" class="json-link" target="_blank">📥 Descargar JSON</a>\n')
+    catalog.write(f'</div>\n')
+    catalog.write(f'<p style="color: #90e0ef; margin-bottom: 10px;">URL: {url}</p>\n')
+
+    # Estadísticas de esta URL
+    total_url_series = len(url_series_data)
+    total_url_years = len(url_series_by_year)
+
+    catalog.write(f'<div class="stats">\n')
+    catalog.write(f'<div class="stat"><span class="number">{total_url_series}</span><span class="label">Series</span></div>\n')
+    catalog.write(f'<div class="stat"><span class="number">{total_url_years}</span><span class="label">Años</span></div>\n')
+    if url_episodes_count > 0:
+        catalog.write(f'<div class="stat"><span class="number">{url_episodes_count}</span><span class="label">Episodios</span></div>\n')
+    if url_video_sources > 0:
+        catalog.write(f'<div class="stat"><span class="number">{url_video_sources}</span><span class="label">Fuentes Video</span></div>\n')
+    catalog.write(f'</div>\n')
+
+    # Mostrar series organizadas por año
+    for year, year_series in url_series_by_year.items():
+        catalog.write(f'<h3 style="color: #00b4d8; margin: 25px 0 15px 0; border-bottom: 2px solid #00b4d8; padding-bottom: 10px;">🎬 Año {year} ({len(year_series)} series)</h3>\n')
+        if lazy_data:
+            catalog.write(lazy_data.grid(lazy_data.add(year_series), len(year_series)))
+            continue
+        catalog.write(f'<div class="series-grid">\n')
+
+        for series in year_series:
+            # La tarjeta depende solo de la serie y de su póster local: si no cambiaron, no se arma
+            image_url = series.get("image_url", "")
+            card_key = record_key([series, images.get(image_url, image_url)])
+            catalog.end_part()
+            if catalog.skip_part(card_key):
+                continue
+
+            has_episodes = 'episodes' in series and series['episodes']
+            has_video_sources = False
 
-print(f"\n✅ Catálogo HTML guardado en: {html_filename}")
+            if has_episodes:
+                for season_episodes in series['episodes'].values():
+                    for episode in season_episodes:
+                        if 'video_sources' in episode:
+                            has_video_sources = True
+                            break
+                    if has_video_sources:
+                        break
+
+            catalog.write(f'<div class="series-card">\n')
+            catalog.write(f'<img src="{images.get(image_url, image_url)}" alt="{series["title"]}" class="series-img" onerror="this.src=\'https://via.placeholder.com/350x450/333/fff?text=No+Image\'">\n')
+            catalog.write(f'<div class="series-content">\n')
+            catalog.write(f'<h3 class="series-title">{series["title"]}</h3>\n')
+            catalog.write(f'<div class="series-meta">📅 {series.get("year", "N/A")} | ⭐ {series.get("rating", "N/A")}</div>\n')
+
+            if series.get('genre'):
+                catalog.write(f'<div class="series-genres">\n')
+                for genre in series['genre'][:3]:
+                    catalog.write(f'<span class="genre-tag">{genre}</span>\n')
+                if len(series['genre']) > 3:
+                    catalog.write(f'<span class="genre-tag">+{len(series["genre"])-3}</span>\n')
+                catalog.write(f'</div>\n')
+
+            if series.get('description'):
+                catalog.write(f'<div class="series-desc">{series["description"][:200]}...</div>\n')
+
+            # Mostrar episodios si existen
+            if has_episodes:
+                episodes_html = ""
+                for season_id, episodes in series['episodes'].items():
+                    episodes_html += f'<div class="season">\n'
+                    episodes_html += f'<h4 class="season-title">{season_id}</h4>\n'
+
+                    for episode in episodes[:3]:  # Mostrar máximo 3 episodios por temporada
+                        episodes_html += f'<div class="episode">\n'
+                        episodes_html += f'<div class="episode-header">\n'
+                        episodes_html += f'<h5 class="episode-title">{episode["title"][:40]}{"..." if len(episode["title"]) > 40 else ""}</h5>\n'
+                        episodes_html += f'<span class="episode-number">{episode["episode_number"]}</span>\n'
+                        episodes_html += f'</div>\n'
+                        episodes_html += f'<div class="episode-url">🔗 <a href="{episode["url"]}" target="_blank" style="color: #90e0ef;">Ver episodio</a></div>\n'
+
+                        # Mostrar fuentes de video si existen
+                        if 'video_sources' in episode and episode['video_sources']:
+                            episodes_html += f'<div class="video-sources">\n'
+                            episodes_html += f'<h6 class="sources-title">🎬 Fuentes de video:</h6>\n'
+                            for source in episode['video_sources'][:3]:  # Máximo 3 fuentes
+                                episodes_html += f'<div class="source-item">\n'
+                                episodes_html += f'<span class="source-service">{source["service"]}</span>\n'
+                                episodes_html += f'<a href="{source["url"]}" class="source-url" target="_blank" title="{source["url"]}">Ver video</a>\n'
+                                episodes_html += f'</div>\n'
+                            if len(episode['video_sources']) > 3:
+                                episodes_html += f'<div style="color: #aaa; font-size: 12px; text-align: center;">+ {len(episode["video_sources"]) - 3} fuentes más</div>\n'
+                            episodes_html += f'</div>\n'
 
-# Resumen final
-print("\n" + "="*60)
-print("📋 RESUMEN FINAL DE EXTRACCIÓN")
-print("="*60)
-print(f"🌐 URLs procesadas: {len(urls_list)}")
-print(f"🎬 Series extraídas: {total_series_count}")
-print(f"📺 Episodios encontrados: {total_episodes_count}")
-print(f"🎬 Fuentes de video extraídas: {total_video_sources}")
+                        episodes_html += f'</div>\n'
 
-if individual_files:
-    print("\n📄 Archivos JSON generados:")
-    for json_file in individual_files:
-        print(f"  • {json_file}")
+                    if len(episodes) > 3:
+                        episodes_html += f'<div style="color: #aaa; text-align: center; padding: 10px;">... y {len(episodes) - 3} episodios más</div>\n'
+
+                    episodes_html += f'</div>\n'
+
+                # Botón toggle para episodios
+                toggle_text = "📺 Mostrar Episodios"
+                if has_video_sources:
+                    toggle_text = "🎬 Mostrar Episodios y Videos"
+
+                catalog.write(f'<button class="episodes-toggle" onclick="toggleEpisodes(this)">\n')
+                catalog.write(f'<span>{toggle_text}</span>\n')
+                catalog.write(f'<span>▼</span>\n')
+                catalog.write(f'</button>\n')
+                catalog.write(f'<div class="episodes-container">\n')
+                catalog.write(episodes_html)
+                catalog.write(f'</div>\n')
+
+            catalog.write(f'</div>\n')  # Cerrar series-content
+            catalog.write(f'</div>\n')  # Cerrar series-card
+            catalog.end_part(card_key)
+
+        catalog.write(f'</div>\n')  # Cerrar series-grid
+
+    catalog.write(f'</div>\n')  # Cerrar url-section
+
+def render_series_catalog(store, html_filename, listing=None, incremental=True, images=None, lazy=False):
+    """Genera el catálogo HTML y los JSON (N.json y todas_las_series.json) desde el almacén
+
+    En modo incremental solo se reescriben las tarjetas del catálogo que
+    cambiaron; los JSON se escriben únicamente si su contenido es distinto.
+    Con ``images`` el HTML usa las copias locales de los pósters (los JSON
+    conservan las URLs originales). Con ``lazy`` el HTML es solo el esqueleto
+    y las tarjetas y episodios se cargan por bloques al navegar (ver
+    ``lazy_catalog``). Devuelve los nombres de los JSON por URL y la cantidad
+    de series.
+    """
+    listing = listing or html_filename
+    folder = os.path.dirname(html_filename)
+    lazy_data = LazyCatalogData(html_filename, images=images) if lazy else None
+    footer = HTML_FOOTER.replace('</body>', lazy_data.script() + '</body>') if lazy else HTML_FOOTER
+    catalog = CatalogWriter(html_filename, HTML_HEADER, footer, incremental)
+    sections = store.sections(listing)
+    individual_files = []
+    total_episodes_count = 0
+    total_video_sources = 0
+    # Cada serie entra una vez al índice por año; los JSON y el resumen se leen de ahí
+    years = YearIndex()
+
+    for url_index, url in sections:
+        url_series_data = store.listed_series(listing, url_index)
+
+        if url_series_data:
+            # Organizar por año y guardar el JSON de esta URL
+            years.extend(url_series_data, url_index)
+            url_series_by_year = years.by_year(url_index)
+            json_filename = f"{url_index}.json"
+            if years.write_json(os.path.join(folder, json_filename), url_index):
+                print(f"💾 Datos guardados en: {json_filename}")
+            else:
+                print(f"💾 Sin cambios: {json_filename}")
+            individual_files.append(json_filename)
+
+            url_episodes_count, url_video_sources = count_episodes(url_series_data)
+            total_episodes_count += url_episodes_count
+            total_video_sources += url_video_sources
+            write_series_section(catalog, url_index, url, url_series_data, url_series_by_year, json_filename, images,
+                                 lazy_data)
+            catalog.end_part()
+        else:
+            catalog.write(f'<div class="url-section">\n')
+            catalog.write(f'<h2 class="url-title">📦 Fuente {url_index} - Sin datos</h2>\n')
+            catalog.write(f'<p style="color: #ff6b6b;">⚠️ No se encontraron series en esta URL</p>\n')
+            catalog.write(f'</div>\n')
+            catalog.end_part()
+
+    total_series_count = years.count
+
+    # Guardar archivo JSON combinado si hay múltiples URLs
+    if len(individual_files) > 1 and total_series_count:
+        if years.write_json(os.path.join(folder, 'todas_las_series.json')):
+            print(f"\n✅ Archivo combinado guardado en: todas_las_series.json")
+        else:
+            print(f"\n✅ Archivo combinado sin cambios: todas_las_series.json")
+
+    # Agregar resumen final al HTML
+    catalog.write(f'<div class="summary">\n')
+    catalog.write(f'<h2 class="summary-title">📊 RESUMEN TOTAL DE EXTRACCIÓN</h2>\n')
+    catalog.write(f'<div class="stats" style="justify-content: center;">\n')
+    catalog.write(f'<div class="stat"><span class="number">{total_series_count}</span><span class="label">Series Totales</span></div>\n')
+    catalog.write(f'<div class="stat"><span class="number">{years.year_count()}</span><span class="label">Años Distintos</span></div>\n')
+    catalog.write(f'<div class="stat"><span class="number">{len(sections)}</span><span class="label">URLs Procesadas</span></div>\n')
+    if total_episodes_count > 0:
+        catalog.write(f'<div class="stat"><span class="number">{total_episodes_count}</span><span class="label">Episodios Totales</span></div>\n')
+    if total_video_sources > 0:
+        catalog.write(f'<div class="stat"><span class="number">{total_video_sources}</span><span class="label">Fuentes de Video</span></div>\n')
+    catalog.write(f'</div>\n')
 
     if len(individual_files) > 1:
-        print(f"  • todas_las_series.json (combinado)")
+        catalog.write(f'<p style="margin-top: 20px;">\n')
+        catalog.write(f'<a href="todas_las_series.json" class="json-link" target="_blank" style="font-size: 1.1rem; padding: 15px 30px;">📦 Descargar JSON Completo (todas_las_series.json)</a>\n')
+        catalog.write(f'</p>\n')
+
+    catalog.write(f'</div>\n')
+
+    # Cerrar HTML
+    catalog.close()
+
+    print(f"\n✅ Catálogo HTML guardado en: {html_filename}")
+    if lazy_data:
+        lazy_data.close()
+        print(f"🗂️ Datos del catálogo en {data_folder(html_filename)}/: "
+              f"{lazy_data.stats['written']} bloques escritos, {lazy_data.stats['unchanged']} sin cambios")
+    if catalog.output:
+        stats = catalog.output.stats
+        print(f"🧩 Partes del catálogo sin cambios: {stats['unchanged']} | reescritas: {stats['written']}")
+    return individual_files, total_series_count
+
+def main():
+    enable_cache()
+    configure_parse_pool(PARSE_WORKERS, PARSE_QUEUE_DEPTH)
+
+    print("=" * 60)
+    print("EXTRACTOR COMPLETO DE SERIES CUEVANA")
+    print("=" * 60)
+
+    # Preguntar qué extraer
+    print("\n¿Qué deseas extraer?")
+    print("1. Series de páginas de listado (ej: /serie/, /serie/page/2)")
+    print("2. Series específicas")
+    print("3. Solo información básica de series")
+
+    option = input("\nSelecciona una opción (1-3): ").strip()
+
+    # Configurar opciones de extracción
+    extract_episodes_option = False
+    extract_videos_option = False
+
+    if option == '1':
+        print("\n📺 ¿Deseas extraer también los episodios de cada serie?")
+        episodes_choice = input("   ¿Extraer episodios? (s/n): ").strip().lower()
+
+        if episodes_choice == 's':
+            extract_episodes_option = True
+
+            print("\n🎬 ¿Deseas extraer también las fuentes de video de cada episodio?")
+            print("   Esto tomará MUCHO más tiempo pero obtendrás los enlaces directos a los videos.")
+            videos_choice = input("   ¿Extraer fuentes de video? (s/n): ").strip().lower()
+
+            if videos_choice == 's':
+                extract_videos_option = True
+                print("\n   ⚠️  ADVERTENCIA: Extraer fuentes de video puede tomar MUCHO tiempo.")
+                print("   Se recomienda procesar solo 1 página con pocas series.")
+                confirm = input("   ¿Continuar? (s/n): ").strip().lower()
+                if confirm != 's':
+                    extract_videos_option = False
+                    print("   ✅ Solo se extraerán episodios sin fuentes de video.")
+            else:
+                print("   ✅ Solo se extraerán episodios sin fuentes de video.")
+
+        else:
+            print("   ✅ Solo se extraerá información básica de series.")
+
+    elif option == '2':
+        extract_episodes_option = True
 
-print(f"\n🖥️  Visualización completa:")
-print(f"  • {html_filename} (abrir en navegador)")
+        print("\n🎬 ¿Deseas extraer también las fuentes de video de cada episodio?")
+        videos_choice = input("   ¿Extraer fuentes de video? (s/n): ").strip().lower()
+
+        if videos_choice == 's':
+            extract_videos_option = True
+            print("   ⚠️  Se extraerán fuentes de video de cada episodio.")
 
-print("\n" + "="*60)
-print("✅ ¡Extracción COMPLETA finalizada exitosamente!")
-print("="*60)
+    # Solicitar URLs
+    if option == '1':
+        print("\n📥 Introduce URLs de páginas de listado (separadas por comas):")
+        print("   Ejemplo: https://ww9.cuevana3.to/serie/")
+        print("            https://ww9.cuevana3.to/serie/page/2")
+
+        if extract_videos_option:
+            print("\n   💡 CONSEJO EXTREMO: Con fuentes de video, procesa solo 1 página.")
+        elif extract_episodes_option:
+            print("\n   💡 CONSEJO: Procesa solo 1-2 páginas para no sobrecargar.")
+    else:
+        print("\n📥 Introduce URLs de series específicas (separadas por comas):")
+        print("   Ejemplo: https://ww9.cuevana3.to/serie/belleza-perfecta")
+
+    urls_input = input("\n🔗 URLs: ").strip()
+
+    # Configurar archivos de salida
+    html_filename = 'series_catalog.html'
+
+    # Almacén de registros: la corrida (o su reanudación) vuelve a llenar la lista del catálogo
+    store = RecordStore()
+    store.clear_listing(html_filename)
+
+    # Procesar cada URL individualmente
+    urls_list = [url.strip() for url in urls_input.split(',') if url.strip()]
+    total_series_count = 0
+    total_episodes_count = 0
+    total_video_sources = 0
+    # Máximo de peticiones que necesitó una serie, actualizado URL por URL
+    requests_per_series = 0
+
+    # Series ya vistas en esta corrida: cada una se descarga una sola vez aunque aparezca en varios listados
+    frontier = Frontier()
+
+    # Reanudar una corrida interrumpida con la misma entrada o empezar de cero
+    journal = CrawlJournal(journal_path(html_filename), {
+        'option': option,
+        'episodes': extract_episodes_option,
+        'videos': extract_videos_option,
+        'urls': urls_list,
+    })
+    if journal.resumed:
+        print(f"\n♻️ Reanudando corrida anterior: {journal.count('url')} URLs, "
+              f"{journal.count('series')} series y {journal.count('episode')} episodios ya procesados")
+
+    # Las series de la corrida anterior ya están en el NDJSON: al reanudar se agrega al final
+    ndjson = open_ndjson(NDJSON_PATH, journal.resumed) if NDJSON_PATH else None
+
+    for url_index, url in enumerate(urls_list, 1):
+        print(f"\n{'='*60}")
+        print(f"📁 PROCESANDO URL {url_index}/{len(urls_list)}")
+        print(f"🔗 {url}")
+        print('='*60)
+
+        url_series_data = []
+        url_episodes_count = 0
+        url_video_sources = 0
+
+        if option == '1':
+            # Extraer series de página de listado
+            series_from_page = journal.get('url', url)
+            if series_from_page is not None:
+                print(f"♻️ URL ya procesada en la corrida anterior")
+                for series in series_from_page:
+                    frontier.add(series['url'])
+            else:
+                print(f"⏳ Extrayendo series de la página de listado...")
+                series_from_page = extract_series_from_listing_page(
+                    url, 
+                    extract_episodes_option, 
+                    extract_videos_option,
+                    journal,
+                    frontier,
+                    ndjson
+                )
+                if series_from_page:
+                    journal.put('url', url, series_from_page)
+
+            if series_from_page:
+                url_series_data.extend(series_from_page)
+
+                # Contar estadísticas
+                for series in series_from_page:
+                    if 'episodes' in series:
+                        for season_episodes in series['episodes'].values():
+                            url_episodes_count += len(season_episodes)
+                            for episode in season_episodes:
+                                if 'video_sources' in episode:
+                                    url_video_sources += len(episode['video_sources'])
+
+                stats_msg = f"✅ {len(series_from_page)} series extraídas"
+                if url_episodes_count > 0:
+                    stats_msg += f", {url_episodes_count} episodios"
+                if url_video_sources > 0:
+                    stats_msg += f", {url_video_sources} fuentes de video"
+
+                print(stats_msg)
+        else:
+            # Extraer serie específica
+            series_data = journal.get('url', url)
+            if series_data is not None:
+                print(f"♻️ Serie ya procesada en la corrida anterior")
+            else:
+                print(f"⏳ Extrayendo serie específica...")
+                if extract_episodes_option:
+                    series_data = extract_series_with_episodes(url, extract_videos_option, journal)
+                else:
+                    series_data = extract_series_data(url)
+                if series_data:
+                    if ndjson:
+                        ndjson.write(series_data)
+                    journal.put('url', url, series_data)
+            if series_data:
+                if extract_episodes_option:
+                    episodes = series_data.get('episodes')
+                    if episodes:
+                        url_episodes_count = sum(len(eps) for eps in episodes.values())
+
+                        # Contar fuentes de video
+                        for season_episodes in episodes.values():
+                            for episode in season_episodes:
+                                if 'video_sources' in episode:
+                                    url_video_sources += len(episode['video_sources'])
+
+                        stats_msg = f"✅ Serie con {url_episodes_count} episodios"
+                        if url_video_sources > 0:
+                            stats_msg += f" y {url_video_sources} fuentes de video"
+                        print(stats_msg)
+                    else:
+                        print(f"⚠️ Serie sin episodios encontrados")
+
+                url_series_data.append(series_data)
+
+        # Guardar las series de esta URL en el almacén; el catálogo y los JSON se generan desde ahí
+        store.add_section(html_filename, url_index, url)
+        for series in url_series_data:
+            store.put_series(series)
+            store.add_to_listing(html_filename, url_index, 'series', series['url'])
+
+        if url_series_data:
+            requests_per_series = max(requests_per_series,
+                                      max(get_fetch_count(series['url']) for series in url_series_data))
+            total_series_count += len(url_series_data)
+            total_episodes_count += url_episodes_count
+            total_video_sources += url_video_sources
+        else:
+            print(f"❌ No se encontraron series en esta URL")
+
+    lazy = total_series_count >= LAZY_CATALOG_MIN_SERIES
+    if lazy:
+        print(f"\n🗂️ {total_series_count} series: el catálogo se genera en modo liviano (carga por bloques)")
+    individual_files, _ = render_series_catalog(store, html_filename, lazy=lazy)
+    store.close()
+    if ndjson:
+        ndjson.close()
+        print(f"📝 {ndjson.count} series agregadas a {NDJSON_PATH}")
+
+    # Todas las salidas están escritas: el journal ya no hace falta
+    journal.finish()
+
+    # Resumen final
+    print("\n" + "="*60)
+    print("📋 RESUMEN FINAL DE EXTRACCIÓN")
+    print("="*60)
+    print(f"🌐 URLs procesadas: {len(urls_list)}")
+    print(f"🎬 Series extraídas: {total_series_count}")
+    if total_series_count:
+        # Cuenta también las páginas servidas por la caché: con caché las peticiones de red pueden ser 0
+        print(f"🔁 Peticiones por serie (red + caché): {requests_per_series}")
+
+    cache_stats = get_cache_stats()
+    if cache_stats:
+        print(f"💽 Caché: {cache_stats['hits']} aciertos, {cache_stats['evictions']} desalojos")
+        print(f"🔄 Páginas revalidadas (304): {cache_stats['revalidated']} | descargadas de nuevo: {cache_stats['misses']}")
+
+    limiter_stats = get_limiter_stats()
+    print(f"⏱️ Espera del limitador: {limiter_stats['wait_seconds']:.1f}s | respuestas 429/503: {limiter_stats['throttled']}")
+    print(f"🧹 Descargas ahorradas por deduplicación: {frontier.saved}")
+    print(f"📺 Episodios encontrados: {total_episodes_count}")
+    print(f"🎬 Fuentes de video extraídas: {total_video_sources}")
+
+    if individual_files:
+        print("\n📄 Archivos JSON generados:")
+        for json_file in individual_files:
+            print(f"  • {json_file}")
+
+        if len(individual_files) > 1:
+            print(f"  • todas_las_series.json (combinado)")
+
+    print(f"\n🖥️  Visualización completa:")
+    print(f"  • {html_filename} (abrir en navegador)")
+
+    write_report(http=get_stats(), cache=cache_stats, rate_limit=limiter_stats)
+
+    print("\n" + "="*60)
+    print("✅ ¡Extracción COMPLETA finalizada exitosamente!")
+    print("="*60)
+
+    shutdown_parse_pool()
+
+if __name__ == "__main__":
+    main()
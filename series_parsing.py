@@ -0,0 +1,226 @@
+"""Parseo puro de páginas de series, episodios y fuentes de video.
+
+Estas funciones no hacen peticiones ni imprimen: reciben el HTML y devuelven
+dicts y listas simples, así pueden correr en los procesos de ``parse_pool``.
+"""
+import re
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from profiling import timed
+from records import Episode, Series, VideoSource
+
+
+def make_soup(content, encoding=None):
+    """Construye el árbol a partir de los bytes descargados"""
+    if isinstance(content, bytes) and encoding:
+        content = content.decode(encoding, errors='replace')
+    return BeautifulSoup(content, 'html.parser')
+
+
+def parse_series_data(soup, series_url):
+    """Extrae información básica de una serie desde su página ya parseada"""
+    # Extraer imagen principal
+    img_tag = soup.find('img', class_='lazy')
+    img_url = urljoin(series_url, img_tag.get('data-src')) if img_tag else None
+
+    # Extraer título
+    title_tag = soup.find('h1', class_='Title') or soup.find('h1')
+    title = title_tag.text.strip() if title_tag else series_url.split('/')[-1].replace('-', ' ').title()
+
+    # Extraer año
+    year_tag = soup.find('span', class_='Date')
+    year = year_tag.text.strip() if year_tag else ""
+
+    # Extraer rating
+    rating_tag = soup.find('span', class_='Vote')
+    rating = rating_tag.text.strip() if rating_tag else ""
+
+    # Extraer descripción
+    desc_tag = soup.find('div', class_='Description')
+    description = ""
+    if desc_tag:
+        p_tags = desc_tag.find_all('p')
+        for p in p_tags:
+            if p.text and not p.find('span'):
+                description = p.text.strip()
+                break
+
+    # Extraer género
+    genre_tag = soup.find('p', class_='Genre')
+    genre = []
+    if genre_tag:
+        genre_text = genre_tag.text.replace('Género:', '').replace('Genre:', '').strip()
+        if genre_text:
+            genre = [g.strip() for g in genre_text.split(',')]
+
+    return Series(title, year, rating, description, genre, img_url, series_url)
+
+
+@timed('extract_episodes_from_ul')
+def extract_episodes_from_ul(episodes_list, base_url):
+    """Extrae episodios de una lista UL"""
+    episodes = []
+
+    # Buscar todos los items de episodio
+    episode_items = episodes_list.find_all('li', class_=lambda x: x and 'TPost' in x)
+
+    if not episode_items:
+        # Intentar con cualquier li
+        episode_items = episodes_list.find_all('li')
+
+    for item in episode_items:
+        try:
+            # Extraer enlace del episodio
+            link_tag = item.find('a')
+            if not link_tag:
+                continue
+
+            episode_path = link_tag.get('href', '')
+            if not episode_path:
+                continue
+
+            # Completar la URL si es relativa
+            episode_url = urljoin(base_url, episode_path)
+
+            # Extraer título
+            title_tag = item.find('h2', class_='Title')
+            if not title_tag:
+                title_tag = item.find('h2')
+
+            episode_title = title_tag.text.strip() if title_tag else ""
+
+            # Extraer número de episodio
+            episode_num_tag = item.find('span', class_='Year')
+            episode_num = episode_num_tag.text.strip() if episode_num_tag else ""
+
+            # Si no hay número, intentar extraer del título
+            if not episode_num and episode_title:
+                # Buscar patrones como 1x1, 1x2, etc.
+                match = re.search(r'(\d+x\d+)', episode_title)
+                if match:
+                    episode_num = match.group(1)
+
+            # Extraer imagen del episodio
+            img_tag = item.find('img', class_='lazy')
+            episode_img = ""
+            if img_tag:
+                img_src = img_tag.get('data-src') or img_tag.get('src')
+                if img_src:
+                    episode_img = urljoin(base_url, img_src)
+
+            episodes.append(Episode(episode_title, episode_num, episode_url, episode_img))
+
+        except Exception:
+            continue
+
+    return episodes
+
+
+def parse_episodes_from_series(soup, series_url):
+    """Extrae los episodios por temporada desde la página ya parseada de la serie"""
+    episodes_data = {}
+
+    # Buscar selector de temporadas
+    season_select = soup.find('select', id='select-season')
+
+    if season_select:
+        for option in season_select.find_all('option'):
+            season_value = option.get('value', '').strip()
+            if season_value:
+                season_id = f"season-{season_value}"
+
+                # Buscar la lista de episodios para esta temporada
+                episodes_list = soup.find('ul', id=season_id, class_='all-episodes')
+
+                if episodes_list:
+                    episodes = extract_episodes_from_ul(episodes_list, series_url)
+                    if episodes:
+                        episodes_data[season_id] = episodes
+                else:
+                    # Intentar buscar cualquier lista con episodios
+                    all_lists = soup.find_all('ul', class_='all-episodes')
+                    if all_lists:
+                        season_num = int(season_value) if season_value.isdigit() else 1
+                        if len(all_lists) >= season_num:
+                            episodes = extract_episodes_from_ul(all_lists[season_num-1], series_url)
+                            if episodes:
+                                episodes_data[season_id] = episodes
+    else:
+        # Si no hay selector, buscar episodios directamente
+        episodes_list = soup.find('ul', class_='all-episodes')
+        if not episodes_list:
+            # Intentar con otra clase
+            episodes_list = soup.find('ul', class_='episodes')
+
+        if episodes_list:
+            episodes = extract_episodes_from_ul(episodes_list, series_url)
+            if episodes:
+                episodes_data['season-1'] = episodes
+
+    return episodes_data
+
+
+def _video_source(iframe):
+    # Preferir data-src, sino src
+    video_url = iframe.get('data-src', '') or iframe.get('src', '')
+
+    if not (video_url and video_url.startswith('http')):
+        return None
+
+    # Extraer el dominio para identificar el servicio
+    domain_match = re.search(r'https?://([^/]+)', video_url)
+    domain = domain_match.group(1) if domain_match else 'unknown'
+
+    # Limpiar el dominio para nombre más legible
+    clean_domain = domain.replace('www.', '').replace('.com', '').replace('.to', '').replace('.sx', '').replace('.net', '')
+
+    return VideoSource(clean_domain, video_url, domain)
+
+
+def parse_video_sources(soup):
+    """Extrae las fuentes de video de la página ya parseada de un episodio"""
+    video_sources = []
+
+    # Buscar todos los iframes con clase 'no-you'
+    for iframe in soup.find_all('iframe', class_='no-you'):
+        source = _video_source(iframe)
+        if source:
+            video_sources.append(source)
+
+    # Si no hay iframes, buscar otros reproductores
+    if not video_sources:
+        for player in soup.find_all('div', class_='TPlayerTb'):
+            iframe = player.find('iframe')
+            if iframe:
+                source = _video_source(iframe)
+                if source:
+                    video_sources.append(source)
+
+    return video_sources
+
+
+# ---------- Puntos de entrada para los procesos de parseo ----------
+
+def parse_series_page(content, encoding, series_url, include_episodes=False):
+    """Datos de la serie (y sus episodios si se piden) a partir del HTML descargado"""
+    soup = make_soup(content, encoding)
+    series_data = parse_series_data(soup, series_url)
+
+    if include_episodes:
+        episodes = parse_episodes_from_series(soup, series_url)
+        if episodes:
+            series_data['episodes'] = episodes
+
+    return series_data
+
+
+def parse_episodes_page(content, encoding, series_url):
+    """Solo los episodios por temporada a partir del HTML de la serie"""
+    return parse_episodes_from_series(make_soup(content, encoding), series_url)
+
+
+def parse_video_page(content, encoding, episode_url):
+    """Fuentes de video a partir del HTML descargado de un episodio"""
+    return parse_video_sources(make_soup(content, encoding))
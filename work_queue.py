@@ -0,0 +1,153 @@
+"""Cola de trabajo en SQLite compartida por el coordinador y los workers.
+
+Cada tarea tiene un tipo (``category`` o ``movie``), una URL y una clave de
+orden (``order_key``) que decide su lugar en la salida final, así el
+resultado combinado no depende de qué worker terminó primero.
+
+Una misma película puede llegar desde varias categorías o espejos del sitio:
+las tareas se identifican por su URL canónica (``frontier.canonical_url``),
+así cada una se descarga una sola vez y queda en la primera posición en que
+apareció (la menor ``order_key``), sin importar el orden de llegada.
+
+Los workers toman tareas con ``claim``; si un worker muere, su tarea vuelve a
+quedar disponible cuando vence el ``lease``.
+"""
+import json
+import os
+import sqlite3
+import time
+
+from frontier import canonical_url
+
+DEFAULT_LEASE = 300
+MAX_ATTEMPTS = 3
+
+
+class WorkQueue:
+    """Tareas pendientes, tomadas y terminadas en un archivo SQLite"""
+
+    def __init__(self, path, lease=DEFAULT_LEASE):
+        self.path = path
+        self.lease = lease
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        # Sin transacción implícita: claim usa BEGIN IMMEDIATE para tomar la tarea de forma atómica
+        self._db = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                url TEXT NOT NULL,
+                url_key TEXT NOT NULL,
+                order_key TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                worker TEXT,
+                claimed_at REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                duplicates INTEGER NOT NULL DEFAULT 0,
+                UNIQUE (kind, url_key)
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, id)")
+
+    # Si la URL ya está en la cola se conserva la menor clave de orden; volver a
+    # agregar la misma (URL, clave) no cuenta como duplicado (reintentos, reanudación)
+    _INSERT = """
+        INSERT INTO tasks (kind, url, url_key, order_key) VALUES (?, ?, ?, ?)
+        ON CONFLICT (kind, url_key) DO UPDATE SET
+            order_key = MIN(order_key, excluded.order_key),
+            duplicates = duplicates + (order_key != excluded.order_key)
+    """
+
+    def add(self, kind, url, order_key):
+        """Agrega una tarea; si la URL ya está en la cola no se descarga de nuevo"""
+        self._db.execute(self._INSERT, (kind, url, canonical_url(url), order_key))
+
+    def add_many(self, tasks):
+        """Agrega varias tareas ``(kind, url, order_key)`` en una sola transacción"""
+        with self._transaction():
+            self._db.executemany(
+                self._INSERT,
+                [(kind, url, canonical_url(url), order_key) for kind, url, order_key in tasks]
+            )
+
+    def claim(self, worker):
+        """Toma la siguiente tarea pendiente (o con lease vencido); devuelve (id, kind, url, order_key) o None
+
+        Las que ya fallaron van después de las que todavía no se intentaron,
+        así un error pasajero no se reintenta enseguida.
+        """
+        now = time.time()
+        with self._transaction():
+            row = self._db.execute("""
+                SELECT id, kind, url, order_key FROM tasks
+                WHERE status = 'pending' OR (status = 'claimed' AND claimed_at < ?)
+                ORDER BY attempts, id LIMIT 1
+            """, (now - self.lease,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE tasks SET status = 'claimed', worker = ?, claimed_at = ?, attempts = attempts + 1 WHERE id = ?",
+                (worker, now, row[0])
+            )
+        return row
+
+    def complete(self, task_id, result=None):
+        self._db.execute(
+            "UPDATE tasks SET status = 'done', result = ? WHERE id = ?",
+            (json.dumps(result, ensure_ascii=False), task_id)
+        )
+
+    def fail(self, task_id, error):
+        """Devuelve la tarea a la cola, o la marca fallida si ya agotó los intentos"""
+        self._db.execute("""
+            UPDATE tasks
+            SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                result = ?
+            WHERE id = ?
+        """, (MAX_ATTEMPTS, json.dumps(str(error), ensure_ascii=False), task_id))
+
+    def counts(self):
+        """Cantidad de tareas por estado"""
+        return dict(self._db.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+
+    def duplicates(self):
+        """Descargas evitadas porque la URL ya estaba en la cola"""
+        return self._db.execute("SELECT COALESCE(SUM(duplicates), 0) FROM tasks").fetchone()[0]
+
+    def unfinished(self):
+        """Tareas pendientes o tomadas (todavía puede aparecer trabajo nuevo)"""
+        return self._db.execute(
+            "SELECT COUNT(*) FROM tasks WHERE status IN ('pending', 'claimed')"
+        ).fetchone()[0]
+
+    def results(self, kind):
+        """``(url, resultado)`` de las tareas terminadas de un tipo, en orden de salida"""
+        rows = self._db.execute(
+            "SELECT url, result FROM tasks WHERE kind = ? AND status = 'done' ORDER BY order_key",
+            (kind,)
+        )
+        for url, result in rows:
+            yield url, json.loads(result)
+
+    def _transaction(self):
+        return _Transaction(self._db)
+
+    def close(self):
+        self._db.close()
+
+
+class _Transaction:
+    def __init__(self, db):
+        self._db = db
+
+    def __enter__(self):
+        self._db.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, *exc):
+        self._db.execute("ROLLBACK" if exc_type else "COMMIT")
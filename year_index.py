@@ -0,0 +1,84 @@
+"""Índice incremental de series por año.
+
+Reemplaza a ``organize_by_year``, que volvía a recorrer la lista completa de
+series para cada URL, otra vez para el JSON combinado y otra más solo para
+contar los años del resumen. Aquí cada serie se agrega una sola vez, a la
+agrupación de su fuente y a la combinada; los agrupamientos y los conteos
+se leen sin volver a recorrer nada.
+
+``write_json`` escribe los años ordenados serie por serie, con el mismo
+texto que ``json.dumps(..., indent=4)`` del dict completo, sin armarlo en
+memoria.
+"""
+import json
+
+from incremental_output import replace_if_changed
+from records import to_json
+
+NO_YEAR = 'Sin año'
+INDENT = 4
+
+
+def year_sort_key(year):
+    return (0, int(year)) if year.isdigit() else (1, year)
+
+
+def sorted_years(years):
+    """Años de más nuevo a más viejo; los que no son números van primero (como antes)"""
+    return sorted(years, reverse=True, key=year_sort_key)
+
+
+class YearIndex:
+    """Series agrupadas por año, por fuente y en total, en el orden en que se agregaron"""
+
+    def __init__(self):
+        self.count = 0
+        self._sources = {}
+        self._combined = {}
+
+    def add(self, series, source=None):
+        """Agrega una serie a la agrupación de ``source`` y a la combinada"""
+        year = series.get('year', NO_YEAR)
+        self._sources.setdefault(source, {}).setdefault(year, []).append(series)
+        self._combined.setdefault(year, []).append(series)
+        self.count += 1
+
+    def extend(self, series_list, source=None):
+        for series in series_list:
+            self.add(series, source)
+
+    def _groups(self, source):
+        return self._combined if source is None else self._sources.get(source, {})
+
+    def by_year(self, source=None):
+        """``{año: [series]}`` ordenado por año, de una fuente o de todas (``source=None``)"""
+        groups = self._groups(source)
+        return {year: groups[year] for year in sorted_years(groups)}
+
+    def year_count(self, source=None):
+        return len(self._groups(source))
+
+    def iter_json(self, source=None):
+        """Fragmentos del JSON de ``by_year`` (idéntico a ``json.dumps(..., indent=4)``)"""
+        groups = self.by_year(source)
+        if not groups:
+            yield '{}'
+            return
+
+        padding = ' ' * INDENT
+        yield '{'
+        for year_number, (year, year_series) in enumerate(groups.items()):
+            yield (',' if year_number else '') + f'\n{padding}{json.dumps(year, ensure_ascii=False)}: ['
+            for series_number, series in enumerate(year_series):
+                text = json.dumps(series, ensure_ascii=False, indent=INDENT, default=to_json)
+                yield (',' if series_number else '') + '\n' + padding * 2 + text.replace('\n', '\n' + padding * 2)
+            yield f'\n{padding}]'
+        yield '\n}'
+
+    def write_json(self, filename, source=None):
+        """Escribe el JSON por año en ``filename``; devuelve True si el contenido cambió"""
+        temp_path = f"{filename}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            for chunk in self.iter_json(source):
+                file.write(chunk)
+        return replace_if_changed(temp_path, filename)